@@ -0,0 +1,50 @@
+"""
+Shows that a jitted step over Layout-carrying bins is traced once, even though a new (but
+equal) Layout object is built every step.
+
+    python benchmarks/jax_layout.py --steps 200 --regions 64
+"""
+import argparse
+import time
+
+import jax
+import jax.numpy as jnp
+
+from tensor_mosaic import Mosaic
+
+def build(n):
+    m = Mosaic(dim=1, backend="jax", autocompile=False)
+    for i in range(n):
+        m.add(f"R{i}", shape=8 + i % 5)
+    m.compile()
+    return m
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--regions", type=int, default=64)
+    args = parser.parse_args()
+
+    traces = []
+
+    @jax.jit
+    def step(b):
+        traces.append(1)
+        parts = b.unpack()
+        return b.layout.pack({k: v * 0.5 + 1.0 for k, v in parts.items()})
+
+    lay = build(args.regions).layout()
+    x = jnp.zeros(lay.shape)
+    step(lay.bind(x)).block_until_ready()
+    t0 = time.perf_counter()
+    for _ in range(args.steps):
+        lay = build(args.regions).layout()
+        x = step(lay.bind(x))
+    x.block_until_ready()
+    elapsed = time.perf_counter() - t0
+    print(f"layout steps: {args.steps}, traces: {len(traces)}, {1e6 * elapsed / args.steps:.1f} us/step "
+          f"(includes rebuilding the Mosaic each step)")
+    assert len(traces) == 1, "layout-carrying step retraced"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+CPU benchmark suite for packers, compile and access paths.
+
+Every case reports the best and median wall time over --repeat runs, the peak traced Python/NumPy
+memory of one run (tracemalloc; torch's allocator is not traced) and, where a layout is
+involved, the bin utilization (requested elements / bin size).
+
+    python benchmarks/suite.py                                  # everything, 10 .. 1e6 regions
+    python benchmarks/suite.py --only packers --sizes 10 1000
+    python benchmarks/suite.py --backends numpy --json results.json
+    python benchmarks/suite.py --only cache --sizes 5000          # SpaceCache dict vs arena mode
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from tensor_mosaic import Mosaic
+from tensor_mosaic import packers
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+BACKENDS = ["numpy", "torch", "jax"]
+
+# Largest request count each packer is run at; the dict gap packers are O(n * regions).
+PACKERS = {
+    "greedy_packer":           (packers.greedy_packer, 1_000_000),
+    "greedy_gap_packer":       (packers.greedy_gap_packer, 10_000),
+    "best_fit_gap_packer":     (packers.best_fit_gap_packer, 10_000),
+    "worst_fit_gap_packer":    (packers.worst_fit_gap_packer, 10_000),
+    "best_of_packer":          (packers.best_of_packer, 1_000),
+    "branch_and_bound_packer": (packers.branch_and_bound_packer, 1_000),
+    "array_greedy_packer":     (packers.array_greedy_packer, 1_000_000),
+    "array_gap_packer":        (packers.array_gap_packer, 1_000_000),
+}
+
+# ---- Synthetic request distributions ----
+
+def sizes_for(dist, n, rng):
+    if dist == "uniform":
+        return rng.integers(1, 64, n)
+    if dist == "lognormal":
+        return np.maximum(1, rng.lognormal(3.0, 1.0, n).astype(np.int64))
+    if dist == "bimodal":
+        return np.where(rng.random(n) < 0.9, rng.integers(1, 8, n), rng.integers(256, 1024, n))
+    raise ValueError(dist)
+
+def static_for(n, rng):
+    # one static region per ~100 requests, spaced so that gaps exist
+    count = max(1, n // 100)
+    starts = np.cumsum(rng.integers(32, 512, count))
+    widths = rng.integers(1, 16, count)
+    return {f"static{i}": (slice(int(s), int(s + w)),) for i, (s, w) in enumerate(zip(starts, widths))}
+
+# ---- Measurement ----
+
+def measure(fn, repeat):
+    """Times fn, then runs it once more under tracemalloc; returns (row, that run's result)."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_s": min(times), "median_s": statistics.median(times), "peak_bytes": peak}, result
+
+def utilization(requested, bin_size):
+    return requested / bin_size if bin_size else 1.0
+
+# ---- Cases ----
+
+def bench_packers(sizes, repeat, backends):
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        for dist in ("uniform", "lognormal", "bimodal"):
+            sz = sizes_for(dist, n, rng)
+            static = static_for(n, rng)
+            requests = {f"r{i}": (int(s),) for i, s in enumerate(sz)}
+            s_starts = np.array([v[0].start for v in static.values()])
+            s_stops = np.array([v[0].stop for v in static.values()])
+            requested = int(sz.sum()) + int((s_stops - s_starts).sum())
+            for name, (packer, limit) in PACKERS.items():
+                if n > limit:
+                    continue
+                if getattr(packer, "array_native", False):
+                    row, (_, bin_size) = measure(lambda packer=packer, sz=sz, s_starts=s_starts, s_stops=s_stops: packer(sz, s_starts, s_stops), repeat)
+                else:
+                    row, (_, (bin_size,)) = measure(lambda packer=packer, requests=requests, static=static: packer(requests, static), repeat)
+                row["utilization"] = utilization(requested, bin_size)
+                yield {"case": "packer", "name": name, "n": n, "dist": dist, **row}
+
+def make_mosaic(backend, n, cache, strategy="greedy_array"):
+    m = Mosaic(dim=1, backend=backend, cache=cache, autocompile=False, strategy=strategy)
+    m.add_many([f"r{i}" for i in range(n)], np.random.default_rng(n).integers(1, 64, n))
+    return m
+
+def bench_compile(sizes, repeat, backends):
+    for backend in backends:
+        for n in sizes:
+            for cache in (False, True):
+                m = make_mosaic(backend, n, cache)
+                row, _ = measure(m.compile, repeat)
+                requested = sum(v[0] for v in m.bin_manager.requests.values())
+                row["utilization"] = utilization(requested, m.shape[0])
+                yield {"case": "compile", "name": f"cache={cache}", "backend": backend, "n": n, **row}
+
+def bench_access(sizes, repeat, backends):
+    for backend in backends:
+        for n in sizes:
+            m = make_mosaic(backend, n, cache=True)
+            m.compile()
+            names = [f"r{i}" for i in range(0, n, max(1, n // 1000))]
+            x = m.bin_tensor()
+
+            # loop variables are bound as defaults, so each closure sees this iteration's layout
+            def attr(m=m, names=names):
+                for k in names:
+                    getattr(m, k)
+
+            def view(m=m, names=names, x=x):
+                for k in names:
+                    m.slice_view(x, k)
+
+            def index(m=m, names=names):
+                # rebinding drops memoized tensors, so every run builds them cold
+                m.indices.bind(m.bin_manager.slices, m.shape)
+                for k in names:
+                    m.indices[k]
+
+            per = len(names)
+            for label, fn in (("getattr", attr), ("slice_view", view), ("indices", index)):
+                row, _ = measure(fn, repeat)
+                row["per_call_s"] = row["best_s"] / per
+                yield {"case": "access", "name": label, "backend": backend, "n": n, **row}
+            row, _ = measure(m.bin_tensor, repeat)
+            row["bytes"] = int(x.nbytes)
+            yield {"case": "access", "name": "bin_tensor", "backend": backend, "n": n, **row}
+
+            with tempfile.TemporaryDirectory() as d:
+                path = os.path.join(d, "bin")
+                save, _ = measure(lambda m=m, x=x, path=path: m.save_bin(x, path), repeat)
+                load, _ = measure(lambda m=m, path=path: m.load_bin(path), repeat)
+            for label, row in (("save_bin", save), ("load_bin", load)):
+                row["throughput_MBps"] = x.nbytes / row["best_s"] / 1e6
+                yield {"case": "access", "name": label, "backend": backend, "n": n, **row}
+
+def bench_cache(sizes, repeat, backends):
+    # SpaceCache is torch-only; dict mode pays one call per entry, arena mode one per dtype
+    if "torch" not in backends:
+        return
+    import torch
+    from tensor_mosaic.cache import SpaceCache
+    for n in sizes:
+        n = min(n, 100_000)
+        for arena in (False, True):
+            sc = SpaceCache(arena=arena)
+            for i in range(n):
+                sc[f"x{i}"] = torch.full((16,), float(i))
+            with tempfile.TemporaryDirectory() as d:
+                path = os.path.join(d, "cache.pt")
+                cases = (("to", lambda sc=sc: sc.to("cpu")), ("clone", sc.clone),
+                         ("save", lambda sc=sc, path=path: sc.save(path)), ("load", lambda path=path: SpaceCache.load(path)))
+                for label, fn in cases:
+                    row, _ = measure(fn, repeat)
+                    yield {"case": "cache", "name": f"{label} arena={arena}", "backend": "torch", "n": n, **row}
+
+CASES = {"packers": bench_packers, "compile": bench_compile, "access": bench_access, "cache": bench_cache}
+
+# ---- Reporting ----
+
+def fmt(row):
+    extra = []
+    if "utilization" in row:
+        extra.append(f"util={row['utilization']:.3f}")
+    if "per_call_s" in row:
+        extra.append(f"per_call={row['per_call_s'] * 1e6:.2f}us")
+    if "throughput_MBps" in row:
+        extra.append(f"{row['throughput_MBps']:.0f}MB/s")
+    where = row.get("backend") or row.get("dist", "")
+    return (f"{row['case']:8} {row['name']:24} {where:9} n={row['n']:<8} "
+            f"best={row['best_s'] * 1e3:10.3f}ms median={row['median_s'] * 1e3:10.3f}ms "
+            f"peak={row['peak_bytes'] / 1e6:9.2f}MB {' '.join(extra)}")
+
+def available(backends):
+    out = []
+    for b in backends:
+        try:
+            __import__(b)
+            out.append(b)
+        except ImportError:
+            print(f"skipping backend {b}: not installed", file=sys.stderr)
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--backends", nargs="+", default=BACKENDS)
+    parser.add_argument("--only", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="also write all rows to this file")
+    args = parser.parse_args(argv)
+
+    backends = available(args.backends)
+    rows = []
+    for case in args.only:
+        for row in CASES[case](args.sizes, args.repeat, backends):
+            print(fmt(row), flush=True)
+            rows.append(row)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=1)
+    return rows
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,26 @@
   A very stupid example module, mainly for showing all capabilities of PyPiTemplate.
 """
 __version__ = "0.0.1"
-from .plot import plot_slices
+import importlib
 from . import packers
-from .cache import SpaceCache
 from .mosaic import Mosaic
 from .slicemanager import BinManager
+from .collate import pack_sequences
+
+# Names backed by heavy dependencies (matplotlib, torch) are imported on first access,
+# so `from tensor_mosaic import Mosaic` stays cheap for numpy-only users.
+_LAZY = {
+    "plot_slices": ("plot", "plot_slices"),
+    "SpaceCache": ("cache", "SpaceCache"),
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        module, attr = _LAZY[name]
+        value = getattr(importlib.import_module(f".{module}", __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
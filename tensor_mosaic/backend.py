@@ -5,7 +5,10 @@ class Backend:
     """Abstracts tensor ops for torch, numpy, jax."""
     def __init__(self, device=None):
         self.device = device
-    def arange(self, start, stop):
+    def arange(self, start, stop, step=1, dtype=None):
+        raise NotImplementedError
+    def index_dtype(self, bound):
+        """Narrowest integer dtype that can index positions below bound."""
         raise NotImplementedError
     def meshgrid(self, arrays):
         raise NotImplementedError
@@ -21,6 +24,57 @@ class Backend:
         raise NotImplementedError
     def load(self, path, map_location=None):
         raise NotImplementedError
+    def from_dlpack(self, x):
+        """Imports an array from any backend, sharing memory when DLPack allows it."""
+        raise NotImplementedError
+    # Batched primitives. Writers return the result: torch and numpy update x in place,
+    # jax returns a new array.
+    def empty(self, shape, dtype=None):
+        """Allocates without initializing (jax zero-fills)."""
+        raise NotImplementedError
+    def concatenate(self, arrays, axis=0):
+        raise NotImplementedError
+    def take(self, x, indices, axis=0):
+        """Gathers x at integer indices along axis."""
+        raise NotImplementedError
+    def scatter(self, x, indices, values, axis=0):
+        """Writes values into x at integer indices along axis."""
+        raise NotImplementedError
+    def index_put(self, x, index, values, accumulate=False):
+        """x[index] = values (or += when accumulate, summing duplicate indices)."""
+        raise NotImplementedError
+    def reshape_view(self, x, shape):
+        """Reshapes without copying; raises if x's strides do not allow a view."""
+        raise NotImplementedError
+    def permute(self, x, axes):
+        """Reorders the axes of x (a view on torch and numpy)."""
+        raise NotImplementedError
+    def segment_sum(self, data, segment_ids, num_segments):
+        """Sums rows of data that share a segment id into num_segments rows."""
+        raise NotImplementedError
+
+_INT_DTYPES = ("int8", "int16", "int32", "int64")
+
+def _int_dtype_name(bound, narrowest="int8"):
+    import numpy as np
+    for name in _INT_DTYPES[_INT_DTYPES.index(narrowest):]:
+        if bound - 1 <= np.iinfo(name).max:
+            return name
+    raise OverflowError(f"No integer dtype can index {bound} positions")
+
+# errors raised when an array cannot be exported zero-copy (grad, dtype, device, strides)
+_DLPACK_ERRORS = (BufferError, RuntimeError, TypeError, ValueError, AttributeError)
+
+def _host_copy(x):
+    import numpy as np
+    if hasattr(x, "detach"):
+        x = x.detach().cpu()
+        try:
+            return x.numpy()
+        except TypeError:
+            # dtypes numpy lacks (e.g. bfloat16) are widened to float32
+            return x.float().numpy()
+    return np.asarray(x)
 
 # --- PyTorch Backend ---
 
@@ -29,8 +83,11 @@ class TorchBackend(Backend):
         import torch
         super().__init__(device)
         self.torch = torch
-    def arange(self, start, stop):
-        return self.torch.arange(start, stop, device=self.device)
+    def arange(self, start, stop, step=1, dtype=None):
+        return self.torch.arange(start, stop, step, dtype=dtype, device=self.device)
+    def index_dtype(self, bound):
+        # torch only accepts int32/int64 tensors as indices
+        return getattr(self.torch, _int_dtype_name(bound, narrowest="int32"))
     def meshgrid(self, arrays):
         return self.torch.meshgrid(*arrays, indexing="ij")
     def stack(self, arrays, axis=-1):
@@ -46,6 +103,38 @@ class TorchBackend(Backend):
         self.torch.save(x, path)
     def load(self, path, map_location=None):
         return self.torch.load(path, map_location=map_location or self.device)
+    def from_dlpack(self, x):
+        if isinstance(x, self.torch.Tensor):
+            return x.to(self.device)
+        try:
+            t = self.torch.from_dlpack(x)
+        except _DLPACK_ERRORS:
+            t = self.torch.as_tensor(_host_copy(x))
+        return t.to(self.device)
+    def empty(self, shape, dtype=None):
+        dtype = dtype or self.torch.float
+        return self.torch.empty(shape, dtype=dtype, device=self.device)
+    def concatenate(self, arrays, axis=0):
+        return self.torch.cat(arrays, dim=axis)
+    def take(self, x, indices, axis=0):
+        return self.torch.index_select(x, axis, indices)
+    def scatter(self, x, indices, values, axis=0):
+        return x.index_copy_(axis, indices.long(), values)  # index_copy_ wants int64; the index cache may be int32
+    def index_put(self, x, index, values, accumulate=False):
+        if not accumulate:
+            x[index] = values
+        elif isinstance(index, self.torch.Tensor):
+            x.index_put_((index,), self.torch.as_tensor(values, dtype=x.dtype), accumulate=True)
+        else:
+            x[index] += values
+        return x
+    def reshape_view(self, x, shape):
+        return x.view(shape)
+    def permute(self, x, axes):
+        return x.permute(*axes)
+    def segment_sum(self, data, segment_ids, num_segments):
+        out = self.torch.zeros((num_segments,) + tuple(data.shape[1:]), dtype=data.dtype, device=data.device)
+        return out.index_add_(0, segment_ids, data)
 
 # --- NumPy Backend ---
 
@@ -54,8 +143,10 @@ class NumpyBackend(Backend):
         import numpy as np
         super().__init__(None)
         self.np = np
-    def arange(self, start, stop):
-        return self.np.arange(start, stop)
+    def arange(self, start, stop, step=1, dtype=None):
+        return self.np.arange(start, stop, step, dtype=dtype)
+    def index_dtype(self, bound):
+        return self.np.dtype(_int_dtype_name(bound))
     def meshgrid(self, arrays):
         return self.np.meshgrid(*arrays, indexing="ij")
     def stack(self, arrays, axis=-1):
@@ -71,6 +162,43 @@ class NumpyBackend(Backend):
         self.np.save(path, x)
     def load(self, path, map_location=None):
         return self.np.load(path + ".npy")
+    def from_dlpack(self, x):
+        if isinstance(x, self.np.ndarray):
+            return x
+        try:
+            return self.np.from_dlpack(x)
+        except _DLPACK_ERRORS:
+            return _host_copy(x)
+    def empty(self, shape, dtype=None):
+        dtype = dtype or self.np.float32
+        return self.np.empty(shape, dtype=dtype)
+    def concatenate(self, arrays, axis=0):
+        return self.np.concatenate(arrays, axis=axis)
+    def take(self, x, indices, axis=0):
+        return self.np.take(x, indices, axis=axis)
+    def scatter(self, x, indices, values, axis=0):
+        x[(slice(None),) * (axis % x.ndim) + (indices,)] = values
+        return x
+    def index_put(self, x, index, values, accumulate=False):
+        if accumulate:
+            self.np.add.at(x, index, values)
+        else:
+            x[index] = values
+        return x
+    def reshape_view(self, x, shape):
+        try:
+            return self.np.reshape(x, shape, copy=False)
+        except TypeError:
+            # numpy < 2.1 has no copy argument; setting .shape also refuses to copy
+            view = x.view()
+            view.shape = shape
+            return view
+    def permute(self, x, axes):
+        return self.np.transpose(x, axes)
+    def segment_sum(self, data, segment_ids, num_segments):
+        out = self.np.zeros((num_segments,) + data.shape[1:], dtype=data.dtype)
+        self.np.add.at(out, segment_ids, data)
+        return out
 
 # --- JAX Backend ---
 
@@ -78,10 +206,18 @@ class JaxBackend(Backend):
     def __init__(self, device=None):
         import jax
         import jax.numpy as jnp
+        from .layout import register_pytrees
         super().__init__(device)
         self.jnp = jnp
-    def arange(self, start, stop):
-        return self.jnp.arange(start, stop)
+        register_pytrees()
+    def arange(self, start, stop, step=1, dtype=None):
+        return self.jnp.arange(start, stop, step, dtype=dtype)
+    def index_dtype(self, bound):
+        import jax
+        name = _int_dtype_name(bound)
+        if name == "int64" and not jax.config.jax_enable_x64:
+            raise OverflowError(f"Indexing {bound} positions needs int64; enable jax_enable_x64")
+        return self.jnp.dtype(name)
     def meshgrid(self, arrays):
         return self.jnp.meshgrid(*arrays, indexing="ij")
     def stack(self, arrays, axis=-1):
@@ -99,4 +235,39 @@ class JaxBackend(Backend):
     def load(self, path, map_location=None):
         import numpy as np
         return self.jnp.asarray(np.load(path + ".npy"))
+    def from_dlpack(self, x):
+        try:
+            return self.jnp.from_dlpack(x)
+        except _DLPACK_ERRORS:
+            return self.jnp.asarray(_host_copy(x))
+    def empty(self, shape, dtype=None):
+        dtype = dtype or self.jnp.float32
+        return self.jnp.empty(shape, dtype=dtype)
+    def concatenate(self, arrays, axis=0):
+        return self.jnp.concatenate(arrays, axis=axis)
+    def take(self, x, indices, axis=0):
+        return self.jnp.take(x, indices, axis=axis)
+    def scatter(self, x, indices, values, axis=0):
+        return x.at[(slice(None),) * (axis % x.ndim) + (indices,)].set(values)
+    def index_put(self, x, index, values, accumulate=False):
+        return x.at[index].add(values) if accumulate else x.at[index].set(values)
+    def reshape_view(self, x, shape):
+        return self.jnp.reshape(x, shape)
+    def permute(self, x, axes):
+        return self.jnp.transpose(x, axes)
+    def segment_sum(self, data, segment_ids, num_segments):
+        import jax
+        return jax.ops.segment_sum(data, segment_ids, num_segments=num_segments)
+
+
+BACKEND_MAP = {
+    "torch": TorchBackend,
+    "numpy": NumpyBackend,
+    "jax":   JaxBackend,
+}
 
+def get_backend(name: str, device=None) -> Backend:
+    """Instantiates the backend registered under name."""
+    if name not in BACKEND_MAP:
+        raise ValueError(f"Unknown backend: {name}")
+    return BACKEND_MAP[name](device) if name != "numpy" else BACKEND_MAP[name]()
@@ -1,10 +1,169 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
 import torch
-from typing import Any, Union
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+
+def _torch_dtype(name: str) -> torch.dtype:
+    return getattr(torch, name.rsplit(".", 1)[-1])
+
+
+class Arena:
+    """
+    All cached tensors of one dtype as views into a single flat buffer.
+    A 1d Mosaic holds the layout: new entries are placed at the end of the bin, removed ones
+    leave holes, and compact() repacks the live entries and moves them with one gather.
+    The buffer grows geometrically; views handed out before a growth or compaction keep
+    pointing at the old storage.
+    """
+    def __init__(self, dtype: torch.dtype, device: torch.device, capacity: int = 1024):
+        self.dtype = dtype
+        self.device = device
+        self.layout = self._new_layout()
+        self.end = 0
+        self.shapes: Dict[str, Tuple[int, ...]] = {}
+        self.buffer = torch.empty(capacity, dtype=dtype, device=device)
+        self.live = 0
+
+    def _new_layout(self):
+        # imported here: the cache is loaded lazily from the package root and only arenas need a Mosaic
+        from .mosaic import Mosaic
+        return Mosaic(dim=1, backend="torch", device=str(self.device), cache=False, autocompile=False,
+                      strategy="greedy_array")
+
+    def _region(self, name: str) -> slice:
+        # regions are placed explicitly, so they are readable without compiling
+        return self.layout.bin_manager.slices[name][0]
+
+    def put(self, name: str, tensor: torch.Tensor):
+        n = tensor.numel()
+        if name in self.shapes:
+            region = self._region(name)
+            if region.stop - region.start == n:
+                self.buffer[region].copy_(tensor.reshape(-1))
+                self.shapes[name] = tuple(tensor.shape)
+                return
+            self.remove(name)
+        start = self.end
+        if start + n > self.buffer.numel():
+            self._grow(start + n)
+        self.layout.bin_manager.add(name, region=(start, start + n))
+        self.end = start + n
+        self.buffer[start:start + n].copy_(tensor.reshape(-1))
+        self.shapes[name] = tuple(tensor.shape)
+        self.live += n
+
+    def _grow(self, need: int):
+        buffer = torch.empty(max(2 * self.buffer.numel(), need), dtype=self.dtype, device=self.device)
+        buffer[:self.end].copy_(self.buffer[:self.end])
+        self.buffer = buffer
+
+    def remove(self, name: str):
+        region = self._region(name)
+        self.layout.bin_manager.remove(name)
+        del self.shapes[name]
+        self.live -= region.stop - region.start
+        if self.end > 1024 and 2 * self.live < self.end:
+            self.compact()
+
+    def view(self, name: str) -> torch.Tensor:
+        return self.buffer[self._region(name)].view(self.shapes[name])
+
+    def compact(self):
+        """Repacks live entries back to back; the data moves in a single gather."""
+        names = list(self.shapes)
+        old = np.array([self._region(k).start for k in names], dtype=np.int64)
+        sizes = np.array([self._region(k).stop - self._region(k).start for k in names], dtype=np.int64)
+        self.layout = self._new_layout()
+        self.layout.add_many(names, sizes)
+        self.layout.compile()
+        _, new, _ = self.layout.bin_manager.slices.columns()
+        # position p of the packed buffer reads old[i] + (p - new[i]) for the entry i it falls in
+        src = np.repeat(old - new, sizes) + np.arange(int(sizes.sum()), dtype=np.int64)
+        self.buffer = self.buffer[torch.from_numpy(src).to(self.device)]
+        self.end = self.layout.shape[0]
+
+    def index(self) -> Dict[str, Tuple[int, int, Tuple[int, ...]]]:
+        """{name: (start, stop, shape)} within the buffer."""
+        return {k: (self._region(k).start, self._region(k).stop, s) for k, s in self.shapes.items()}
+
+    def to(self, device: torch.device) -> "Arena":
+        self.buffer = self.buffer.to(device)
+        self.device = device
+        return self
+
+    def clone(self) -> "Arena":
+        return Arena.from_state(self.state(), self.device, copy=True)
+
+    def state(self) -> Dict[str, Any]:
+        return {"dtype": str(self.dtype), "buffer": self.buffer[:self.end], "index": self.index()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], device: torch.device, copy: bool = False) -> "Arena":
+        buffer = state["buffer"].to(device)
+        arena = cls(_torch_dtype(state["dtype"]), device, capacity=0)
+        arena.buffer = buffer.clone() if copy else buffer
+        for name, (a, b, _) in state["index"].items():
+            arena.layout.bin_manager.add(name, region=(a, b))
+        arena.end = buffer.numel()
+        arena.shapes = {k: tuple(s) for k, (_, _, s) in state["index"].items()}
+        arena.live = sum(b - a for a, b, _ in state["index"].values())
+        return arena
+
 
 class SpaceCache:
-    def __init__(self, device: Union[str, torch.device] = "cpu"):
+    """
+    Named tensors on one device, accessible as attributes or items.
+
+    With max_bytes set, resident tensors are kept within that budget by evicting the least
+    recently used entries. Evicted entries are dropped, or written to spill_dir when given
+    (spill_dir=True picks a temporary directory) and memory-mapped back on their next access.
+    A reloaded entry is written out again on its next eviction only if it was modified in place.
+    The entry just stored or read is never evicted, so a single tensor may exceed the budget.
+
+    With dedup=True, tensors are keyed by a hash of their dtype, shape and bytes, and names
+    holding equal content share one tensor (and one spill file). Storage is released when the
+    last name referring to it goes away. Shared tensors alias: an in-place write shows under
+    every name, and the written tensor is no longer offered to later inserts of the old content.
+
+    With arena=True, tensors are copied into one flat buffer per dtype (see Arena), so to(),
+    clone(), save() and load() are one bulk operation per dtype and index() shows where each
+    name lives. Arena mode does not combine with a budget, spilling or dedup.
+    """
+    _INTERNAL = {"device", "_cache", "max_bytes", "spill_dir", "dedup", "_key", "_refs", "_resident", "_bytes",
+                 "_blobs", "_files", "_spilled_version", "_keyed_version", "_resident_bytes", "counters", "arena", "_arenas", "_arena_of"}
+
+    def __init__(self, device: Union[str, torch.device] = "cpu", max_bytes: Optional[int] = None,
+                 spill_dir: Union[str, bool, None] = None, dedup: bool = False, arena: bool = False):
+        if arena and (max_bytes is not None or spill_dir or dedup):
+            raise ValueError("arena=True cannot be combined with max_bytes, spill_dir or dedup")
+        if spill_dir is True:
+            spill_dir = tempfile.mkdtemp(prefix="spacecache-")
+        elif spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
         self.__dict__["device"] = torch.device(device)
-        self.__dict__["_cache"] = {}
+        self.__dict__["max_bytes"] = max_bytes
+        self.__dict__["spill_dir"] = spill_dir or None
+        self.__dict__["dedup"] = dedup
+        self.__dict__["_cache"] = OrderedDict()          # resident name -> tensor, least recently used first
+        # Storage is tracked per key: the content hash with dedup, the name itself otherwise
+        self.__dict__["_key"] = {}                       # every known name -> key
+        self.__dict__["_refs"] = {}                      # key -> names referring to it
+        self.__dict__["_resident"] = {}                  # key -> resident names referring to it
+        self.__dict__["_bytes"] = {}                     # key -> bytes of one copy
+        self.__dict__["_blobs"] = {}                     # key -> tensor, while some name is resident
+        self.__dict__["_files"] = {}                     # key -> spill file
+        self.__dict__["_spilled_version"] = {}           # key -> tensor._version matching its spill file
+        self.__dict__["_keyed_version"] = {}             # content key -> tensor._version it was hashed at
+        self.__dict__["_resident_bytes"] = 0
+        self.__dict__["arena"] = arena
+        self.__dict__["_arenas"] = {}                    # dtype -> Arena
+        self.__dict__["_arena_of"] = {}                  # name -> dtype, in arena mode
+        self.__dict__["counters"] = {"hits": 0, "misses": 0, "evictions": 0, "spills": 0, "reloads": 0,
+                                     "dedup_hits": 0}
 
     def normalize(self, value: Any) -> torch.Tensor:
         # Accept torch.Tensor, list/tuple/numpy array, etc.
@@ -12,44 +171,270 @@ class SpaceCache:
             return value.to(self.device)
         return torch.as_tensor(value, device=self.device)
 
+    # ---- Storage ----
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by resident tensors (shared tensors counted once)."""
+        return self._resident_bytes
+
+    @staticmethod
+    def content_key(tensor: torch.Tensor) -> Hashable:
+        """(dtype, shape, digest of the raw bytes); equal for tensors with identical content."""
+        raw = tensor.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy()
+        return str(tensor.dtype), tuple(tensor.shape), hashlib.blake2b(raw.data, digest_size=16).hexdigest()
+
+    def _store(self, name: str, tensor: torch.Tensor):
+        if self.arena:
+            previous = self._arena_of.get(name)
+            if previous is not None and previous != tensor.dtype:
+                self._arenas[previous].remove(name)
+            if tensor.dtype not in self._arenas:
+                self._arenas[tensor.dtype] = Arena(tensor.dtype, self.device)
+            self._arenas[tensor.dtype].put(name, tensor)
+            self._arena_of[name] = tensor.dtype
+            return
+        if name in self._key:
+            self._release(name)
+        key = self.content_key(tensor) if self.dedup else name
+        shared = self._blobs.get(key)
+        if self.dedup and shared is not None and shared._version != self._keyed_version[key]:
+            # written in place since it was hashed: share it only if the content still matches
+            if torch.equal(shared, tensor):
+                self._keyed_version[key] = shared._version
+            else:
+                self._rekey(key)
+        if key in self._blobs:
+            self.counters["dedup_hits"] += 1
+            tensor = self._blobs[key]
+        else:
+            if key in self._refs:
+                self.counters["dedup_hits"] += 1
+            if self.dedup:
+                self._keyed_version[key] = tensor._version
+        self._key[name] = key
+        self._refs[key] = self._refs.get(key, 0) + 1
+        self._bytes[key] = tensor.numel() * tensor.element_size()
+        self._admit(name, tensor)
+
+    def _admit(self, name: str, tensor: torch.Tensor):
+        key = self._key[name]
+        self._cache[name] = tensor
+        self._cache.move_to_end(name)
+        if not self._resident.get(key):
+            self._blobs[key] = tensor
+            self.__dict__["_resident_bytes"] += self._bytes[key]
+        self._resident[key] = self._resident.get(key, 0) + 1
+        self._evict()
+
+    def _unload(self, name: str) -> torch.Tensor:
+        # drops the resident copy of name, freeing its storage once no other resident name shares it
+        key = self._key[name]
+        tensor = self._cache.pop(name)
+        self._resident[key] -= 1
+        if not self._resident[key]:
+            del self._resident[key]
+            del self._blobs[key]
+            self.__dict__["_resident_bytes"] -= self._bytes[key]
+        return tensor
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+        while self.nbytes > self.max_bytes and len(self._cache) > 1:
+            name = next(iter(self._cache))
+            key = self._key[name]
+            tensor = self._unload(name)
+            self.counters["evictions"] += 1
+            if self.dedup and key in self._keyed_version and tensor._version != self._keyed_version[key]:
+                # the file must hold what the content key says, so modified content leaves the key
+                key = self._rekey(key)
+            if self.spill_dir is None:
+                self._release(name)
+            elif key not in self._files or tensor._version != self._spilled_version[key]:
+                # in-place writes bump _version, so a file is rewritten only when the tensor changed
+                self._spill(key, tensor)
+
+    def _spill(self, key: Hashable, tensor: torch.Tensor):
+        # unique names, since clones spill into the same directory
+        fd, path = tempfile.mkstemp(suffix=".pt", dir=self.spill_dir)
+        os.close(fd)
+        torch.save(tensor.detach().cpu(), path)
+        # a fresh file, since the old one may still be memory-mapped by a reloaded tensor
+        old = self._files.get(key)
+        if old is not None and os.path.exists(old):
+            os.remove(old)
+        self._files[key] = path
+        self._spilled_version[key] = tensor._version
+        self.counters["spills"] += 1
+
+    def _rekey(self, key: Hashable) -> Hashable:
+        # moves the names and storage under a content key that no longer describes the tensor
+        # to a private key, so later inserts of that content get a tensor of their own
+        new = object()
+        self._keyed_version.pop(key, None)
+        for table in (self._refs, self._resident, self._bytes, self._blobs, self._files, self._spilled_version):
+            if key in table:
+                table[new] = table.pop(key)
+        for name, k in self._key.items():
+            if k == key:
+                self._key[name] = new
+        return new
+
+    def _release(self, name: str):
+        # forgets name; the storage behind it goes once its last name does
+        if name in self._cache:
+            self._unload(name)
+        key = self._key.pop(name)
+        self._refs[key] -= 1
+        if not self._refs[key]:
+            del self._refs[key], self._bytes[key]
+            self._spilled_version.pop(key, None)
+            self._keyed_version.pop(key, None)
+            path = self._files.pop(key, None)
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    def _get(self, name: str) -> torch.Tensor:
+        if self.arena:
+            if name not in self._arena_of:
+                self.counters["misses"] += 1
+                raise KeyError(name)
+            self.counters["hits"] += 1
+            return self._arenas[self._arena_of[name]].view(name)
+        if name in self._cache:
+            self.counters["hits"] += 1
+            self._cache.move_to_end(name)
+            return self._cache[name]
+        if name in self._key:
+            # the file stays until the entry is released, so evicting it unchanged costs no write
+            self.counters["reloads"] += 1
+            key = self._key[name]
+            tensor = self._blobs.get(key)
+            if tensor is None:
+                tensor = torch.load(self._files[key], mmap=True, weights_only=True).to(self.device)
+                self._spilled_version[key] = tensor._version
+                if key in self._keyed_version:
+                    self._keyed_version[key] = tensor._version
+            self._admit(name, tensor)
+            return tensor
+        self.counters["misses"] += 1
+        raise KeyError(name)
+
+    def stats(self) -> Dict[str, int]:
+        """Access counters plus resident entries, spill files and resident bytes."""
+        return {**self.counters, "resident": len(self._cache), "spilled": len(self._files), "bytes": self.nbytes}
+
+    def dedup_report(self) -> Dict[str, int]:
+        """Names vs distinct tensors, and the bytes sharing saves over storing every name separately."""
+        logical = sum(self._bytes[k] * n for k, n in self._refs.items())
+        stored = sum(self._bytes.values())
+        return {"names": len(self._key), "unique": len(self._refs), "logical_bytes": logical,
+                "stored_bytes": stored, "saved_bytes": logical - stored}
+
+    # ---- Access ----
     def __setattr__(self, name: str, value: Any):
-        if name in {"device", "_cache"}:
+        if name in self._INTERNAL:
             self.__dict__[name] = value
         else:
-            self._cache[name] = self.normalize(value)
+            self._store(name, self.normalize(value))
 
     def __getattr__(self, name: str) -> torch.Tensor:
-        if name in self._cache:
-            return self._cache[name]
-        raise AttributeError(f"No space named '{name}' in cache.")
+        if name.startswith("__"):
+            # protocol probes (copy, pickle, numpy) are not cache lookups
+            raise AttributeError(name)
+        try:
+            return self._get(name)
+        except KeyError:
+            raise AttributeError(f"No space named '{name}' in cache.") from None
 
     def __setitem__(self, name: str, value: Any):
-        self._cache[name] = self.normalize(value)
+        self._store(name, self.normalize(value))
 
     def __getitem__(self, name: str) -> torch.Tensor:
-        return self._cache[name]
+        return self._get(name)
 
     def __contains__(self, name: str) -> bool:
-        return name in self._cache
+        return name in self._key or name in self._arena_of
 
     def __delitem__(self, name: str):
-        del self._cache[name]
+        if name in self._arena_of:
+            self._arenas[self._arena_of.pop(name)].remove(name)
+            return
+        if name not in self._key:
+            raise KeyError(name)
+        self._release(name)
+
+    def __len__(self) -> int:
+        return len(self._key) + len(self._arena_of)
+
+    def index(self) -> Dict[str, Tuple[str, int, int, Tuple[int, ...]]]:
+        """{name: (dtype, start, stop, shape)} locating every entry in its arena buffer."""
+        if not self.arena:
+            raise ValueError("index() needs arena=True")
+        out = {}
+        for dtype, arena in self._arenas.items():
+            out.update({k: (str(dtype), *v) for k, v in arena.index().items()})
+        return out
+
+    def compact(self):
+        """Squeezes out the holes left by deleted arena entries."""
+        for arena in self._arenas.values():
+            arena.compact()
+
+    def clone(self) -> "SpaceCache":
+        """Copy of the cache (arena mode: one copy per dtype buffer)."""
+        other = SpaceCache(self.device, max_bytes=self.max_bytes, spill_dir=self.spill_dir, dedup=self.dedup,
+                           arena=self.arena)
+        if self.arena:
+            other._arenas.update({d: a.clone() for d, a in self._arenas.items()})
+            other._arena_of.update(self._arena_of)
+        else:
+            for name in self.keys():
+                other[name] = self[name].clone()
+        return other
+
+    def save(self, path: str):
+        """Writes every entry to one file (arena mode: one buffer per dtype plus the index)."""
+        if self.arena:
+            torch.save({"arenas": [a.state() for a in self._arenas.values()]}, path)
+        else:
+            torch.save({"tensors": dict(self.items())}, path)
+
+    @classmethod
+    def load(cls, path: str, device: Union[str, torch.device] = "cpu", **kwargs) -> "SpaceCache":
+        state = torch.load(path, map_location=torch.device(device), weights_only=True)
+        kwargs.pop("arena", None)  # the file decides
+        sc = cls(device, arena="arenas" in state, **kwargs)
+        for arena_state in state.get("arenas", []):
+            arena = Arena.from_state(arena_state, sc.device)
+            sc._arenas[arena.dtype] = arena
+            sc._arena_of.update(dict.fromkeys(arena.shapes, arena.dtype))
+        for name, tensor in state.get("tensors", {}).items():
+            sc[name] = tensor
+        return sc
 
     def to(self, device: Union[str, torch.device]):
+        """Moves resident tensors; spilled ones land on the new device when reloaded."""
         device = torch.device(device)
         self.device = device
-        for k in self._cache:
-            self._cache[k] = self._cache[k].to(device)
+        for arena in self._arenas.values():
+            arena.to(device)
+        for key in self._blobs:
+            self._blobs[key] = self._blobs[key].to(device)
+        for name in self._cache:
+            self._cache[name] = self._blobs[self._key[name]]
 
     def clear(self):
-        self._cache.clear()
+        for name in list(self._key):
+            self._release(name)
+        self._arenas.clear()
+        self._arena_of.clear()
 
     def keys(self):
-        return self._cache.keys()
+        return list(self._key) + list(self._arena_of)
 
     def values(self):
-        return self._cache.values()
+        return [self[k] for k in self.keys()]
 
     def items(self):
-        return self._cache.items()
-
+        return [(k, self[k]) for k in self.keys()]
@@ -0,0 +1,32 @@
+from typing import Any, Dict, List, Sequence
+from .backend import get_backend
+from .packers import multi_bin_packer
+
+def pack_sequences(arrays: Sequence[Any], capacity: int, backend: str = "torch", device=None,
+                   strategy: str = "ffd", pad_value=0, dtype=None):
+    """
+    Collates variable-length samples into a dense (num_bins, capacity, *features) batch.
+    Samples are placed with multi_bin_packer; arrays[i] may carry trailing feature dims.
+    Returns (batch, segment_ids, position_ids, placements) where segment_ids count samples
+    from 1 within each bin (0 marks padding), position_ids restart at 0 for every sample and
+    placements is {i: (bin_id, tuple of slices)}.
+    """
+    be = get_backend(backend, device)
+    arrays = [be.asarray(x) for x in arrays]
+    if not arrays:
+        raise ValueError("pack_sequences needs at least one array")
+    requests = {i: (int(x.shape[0]),) for i, x in enumerate(arrays)}
+    placements, (num_bins, _) = multi_bin_packer(requests, capacity, strategy=strategy)
+
+    feature_shape = tuple(arrays[0].shape[1:])
+    batch = be.full((num_bins, capacity) + feature_shape, pad_value, dtype=dtype or arrays[0].dtype)
+    segment_ids: List[List[int]] = [[0] * capacity for _ in range(num_bins)]
+    position_ids: List[List[int]] = [[0] * capacity for _ in range(num_bins)]
+    seen: Dict[int, int] = {}
+    # walk samples in bin order so segment ids follow their position in the bin
+    for i, (bin_id, (slc,)) in sorted(placements.items(), key=lambda kv: (kv[1][0], kv[1][1][0].start)):
+        seen[bin_id] = seen.get(bin_id, 0) + 1
+        batch = be.index_put(batch, (bin_id, slc), arrays[i])
+        segment_ids[bin_id][slc] = [seen[bin_id]] * (slc.stop - slc.start)
+        position_ids[bin_id][slc] = list(range(slc.stop - slc.start))
+    return batch, be.asarray(segment_ids), be.asarray(position_ids), placements
@@ -0,0 +1,128 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Tuple
+from . import instrument
+
+class IndexDescriptor:
+    """
+    Closed-form indices of a (possibly strided) region: per-dimension offset, shape and strides.
+    Position i along dimension d is offset[d] + i * strides[d]; nothing is allocated until
+    materialize() is called.
+    """
+    __slots__ = ("offset", "shape", "strides")
+
+    def __init__(self, offset: Tuple[int, ...], shape: Tuple[int, ...], strides: Tuple[int, ...]):
+        self.offset = offset
+        self.shape = shape
+        self.strides = strides
+
+    @classmethod
+    def from_region(cls, region: Tuple[slice, ...]) -> "IndexDescriptor":
+        offset, shape, strides = [], [], []
+        for s in region:
+            step = s.step or 1
+            offset.append(s.start)
+            shape.append(len(range(s.start, s.stop, step)))
+            strides.append(step)
+        return cls(tuple(offset), tuple(shape), tuple(strides))
+
+    @property
+    def numel(self) -> int:
+        n = 1
+        for d in self.shape:
+            n *= d
+        return n
+
+    def materialize(self, backend, dtype=None, batched=False):
+        """Dense (numel, ndim) index tensor, squeezed like Mosaic's historic index cache."""
+        idx_ranges = [backend.arange(o, o + n * st, st, dtype=dtype)
+                      for o, n, st in zip(self.offset, self.shape, self.strides)]
+        grid = backend.meshgrid(idx_ranges)
+        idx_tensor = backend.stack([g.flatten() for g in grid], axis=-1)
+        idx_tensor = idx_tensor.squeeze()
+        if batched:
+            idx_tensor = backend.stack([idx_tensor], axis=0)
+        return idx_tensor
+
+    def __eq__(self, other):
+        return isinstance(other, IndexDescriptor) and \
+            (self.offset, self.shape, self.strides) == (other.offset, other.shape, other.strides)
+
+    def __repr__(self):
+        return f"IndexDescriptor(offset={self.offset}, shape={self.shape}, strides={self.strides})"
+
+
+class IndexCache(MutableMapping):
+    """
+    Lazy {name: index tensor} mapping for a compiled layout.
+    Regions are stored as IndexDescriptors and only densified (once, in the narrowest integer
+    dtype that fits the bin) when a name is looked up.
+    """
+    def __init__(self, backend, batched: bool = False):
+        self.backend = backend
+        self.batched = batched
+        self.dtype = None
+        self._bound = 1
+        self._regions: Dict[str, Tuple[slice, ...]] = {}
+        self._dense: Dict[str, Any] = {}
+
+    def bind(self, slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...]):
+        """Points the cache at a freshly compiled layout, dropping stale tensors."""
+        self._regions = slices.copy()  # cheap for columnar slices; nothing is materialized
+        self._dense.clear()
+        self._bound = max(shape, default=1)
+        self.dtype = self.backend.index_dtype(self._bound)
+
+    def descriptor(self, name: str) -> IndexDescriptor:
+        return IndexDescriptor.from_region(self._regions[name])
+
+    def __getitem__(self, name: str):
+        if name in self._dense:
+            if instrument.ENABLED:
+                instrument.emit("cache_hit", cache="indices", name=name)
+            return self._dense[name]
+        if not instrument.ENABLED:
+            self._dense[name] = self.descriptor(name).materialize(self.backend, self.dtype, self.batched)
+            return self._dense[name]
+        instrument.emit("cache_miss", cache="indices", name=name)
+        with instrument.span("index_build", name=name) as sp:
+            idx = self._dense[name] = self.descriptor(name).materialize(self.backend, self.dtype, self.batched)
+            sp.args["bytes"] = instrument.nbytes(idx)
+        return idx
+
+    def __setitem__(self, name: str, value):
+        self._dense[name] = value
+
+    def __delitem__(self, name: str):
+        if name not in self._regions and name not in self._dense:
+            raise KeyError(name)
+        self._regions.pop(name, None)
+        self._dense.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._regions
+        yield from (k for k in self._dense if k not in self._regions)
+
+    def __len__(self) -> int:
+        return len(self._regions) + sum(1 for k in self._dense if k not in self._regions)
+
+    def clear(self):
+        self._regions.clear()
+        self._dense.clear()
+
+    def to_backend(self, backend) -> "IndexCache":
+        """Copy bound to another backend; tensors already built move over via DLPack."""
+        other = IndexCache(backend, batched=self.batched)
+        other._regions = dict(self._regions)
+        other._bound = self._bound
+        other.dtype = backend.index_dtype(self._bound)
+        for name, idx in self._dense.items():
+            idx = backend.from_dlpack(idx)
+            # keep only tensors whose dtype the new backend would have picked anyway
+            if _dtype_name(idx.dtype) == _dtype_name(other.dtype):
+                other._dense[name] = idx
+        return other
+
+
+def _dtype_name(dtype) -> str:
+    # torch.int32, dtype('int32') and jnp's int32 all end in the same name
+    return str(dtype).rsplit(".", 1)[-1]
@@ -0,0 +1,162 @@
+"""
+Lightweight instrumentation for Mosaic internals.
+
+Callbacks registered with subscribe() receive an Event for every add, compile, packer run,
+index build, allocation and index-cache hit/miss. With no subscribers ENABLED is False:
+hot paths test that flag before building any event, and span() hands back a shared no-op
+context manager, so nothing is timed or allocated.
+
+    with Collector() as c:
+        m.compile()
+    print(c.summary())
+    c.to_chrome_trace("compile.json")   # open in chrome://tracing or Perfetto
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENABLED = False
+_listeners: List[Callable[["Event"], None]] = []
+
+
+class Event:
+    """kind is "span" (with duration) or "instant"; ts and dur are in seconds (perf_counter)."""
+    __slots__ = ("name", "kind", "ts", "dur", "args", "tid")
+
+    def __init__(self, name: str, kind: str, ts: float, dur: float = 0.0, args: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.kind = kind
+        self.ts = ts
+        self.dur = dur
+        self.args = args or {}
+        self.tid = threading.get_ident()
+
+    def __repr__(self):
+        return f"Event({self.name!r}, {self.kind}, dur={self.dur:.6f}, args={self.args})"
+
+
+def subscribe(callback: Callable[[Event], None]) -> Callable[[Event], None]:
+    global ENABLED
+    _listeners.append(callback)
+    ENABLED = True
+    return callback
+
+
+def unsubscribe(callback: Callable[[Event], None]):
+    global ENABLED
+    _listeners.remove(callback)
+    ENABLED = bool(_listeners)
+
+
+def _dispatch(event: Event):
+    for callback in list(_listeners):
+        callback(event)
+
+
+def emit(event: str, **args):
+    """Sends an instant event; a no-op without subscribers."""
+    if ENABLED:
+        _dispatch(Event(event, "instant", time.perf_counter(), args=args))
+
+
+class _Span:
+    __slots__ = ("name", "args", "t0")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        t1 = time.perf_counter()
+        _dispatch(Event(self.name, "span", self.t0, t1 - self.t0, self.args))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(event: str, **args):
+    """Context manager timing a block; the shared no-op span without subscribers."""
+    return _Span(event, args) if ENABLED else _NULL_SPAN
+
+
+def nbytes(x) -> int:
+    """Size of a torch/numpy/jax array in bytes."""
+    return int(getattr(x, "nbytes", 0))
+
+
+class Collector:
+    """Records events and aggregates them into a summary table or a Chrome trace."""
+    def __init__(self):
+        self.events: List[Event] = []
+
+    def __call__(self, event: Event):
+        self.events.append(event)
+
+    def start(self) -> "Collector":
+        subscribe(self)
+        return self
+
+    def stop(self):
+        if self in _listeners:
+            unsubscribe(self)
+
+    def __enter__(self) -> "Collector":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def clear(self):
+        self.events.clear()
+
+    def aggregate(self) -> Dict[str, Dict[str, float]]:
+        """{event name: {"count", "total_s", "max_s", "bytes"}}."""
+        table: Dict[str, Dict[str, float]] = {}
+        for e in self.events:
+            row = table.setdefault(e.name, {"count": 0, "total_s": 0.0, "max_s": 0.0, "bytes": 0})
+            row["count"] += 1
+            row["total_s"] += e.dur
+            row["max_s"] = max(row["max_s"], e.dur)
+            row["bytes"] += e.args.get("bytes", 0)
+        return table
+
+    def summary(self) -> str:
+        rows = sorted(self.aggregate().items(), key=lambda kv: kv[1]["total_s"], reverse=True)
+        lines = [f"{'event':18} {'count':>8} {'total ms':>10} {'max ms':>10} {'bytes':>12}"]
+        for name, r in rows:
+            lines.append(f"{name:18} {r['count']:>8} {1e3 * r['total_s']:>10.3f} {1e3 * r['max_s']:>10.3f} {r['bytes']:>12}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format dict (timestamps in microseconds)."""
+        t0 = min((e.ts for e in self.events), default=0.0)
+        trace = []
+        for e in self.events:
+            entry = {"name": e.name, "pid": 0, "tid": e.tid, "ts": 1e6 * (e.ts - t0),
+                     "args": {k: v if isinstance(v, (int, float, str, bool)) else repr(v) for k, v in e.args.items()}}
+            if e.kind == "span":
+                entry.update(ph="X", dur=1e6 * e.dur)
+            else:
+                entry.update(ph="i", s="t")
+            trace.append(entry)
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,183 @@
+import sys
+from typing import Any, Dict, Optional, Tuple
+from .backend import get_backend
+
+class Layout:
+    """
+    Immutable, hashable snapshot of a compiled Mosaic.
+    Regions are plain tuples of slices, so indexing with them stays static under jax.jit and
+    torch.compile; two layouts with the same regions compare (and hash) equal.
+    aliases maps alias names to (region, view shape or None, perm or None); they resolve like
+    regions but are listed apart from names, since they share storage with them.
+    """
+    __slots__ = ("names", "regions", "shape", "backend_name", "device", "tiled", "aliases", "_slices", "_views",
+                 "_backend", "_key")
+
+    def __init__(self, slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...], backend_name: str = "numpy",
+                 device=None, backend=None, aliases: Optional[Dict[str, Tuple[Any, ...]]] = None):
+        object.__setattr__(self, "names", tuple(slices))
+        object.__setattr__(self, "regions", tuple(tuple((s.start, s.stop, s.step) for s in slices[k]) for k in slices))
+        object.__setattr__(self, "shape", tuple(shape))
+        object.__setattr__(self, "backend_name", backend_name)
+        object.__setattr__(self, "device", device)
+        object.__setattr__(self, "_slices", {k: tuple(slices[k]) for k in slices})
+        object.__setattr__(self, "_backend", backend)
+        views = {k: (tuple(r), shape, perm) for k, (r, shape, perm) in (aliases or {}).items()}
+        object.__setattr__(self, "aliases", tuple(views))
+        object.__setattr__(self, "_views", views)
+        view_key = tuple((k, tuple((s.start, s.stop, s.step) for s in r), shape, perm)
+                         for k, (r, shape, perm) in views.items())
+        object.__setattr__(self, "_key", (self.names, self.regions, self.shape, backend_name, view_key))
+        object.__setattr__(self, "tiled", self._tiles(self.names))
+        if "jax" in sys.modules:
+            register_pytrees()
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Layout is immutable")
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, Layout) and self._key == other._key
+
+    def __repr__(self):
+        return f"Layout(shape={self.shape}, regions={len(self.names)}, backend={self.backend_name!r})"
+
+    def __getitem__(self, name: str) -> Tuple[slice, ...]:
+        if name in self._views:
+            return self._views[name][0]
+        return self._slices[name]
+
+    def __getattr__(self, name: str) -> Tuple[slice, ...]:
+        # only reached when normal lookup fails, so slots and methods take precedence
+        views = object.__getattribute__(self, "_views")
+        try:
+            return views[name][0] if name in views else object.__getattribute__(self, "_slices")[name]
+        except KeyError:
+            raise AttributeError(f"'Layout' object has no region '{name}'") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slices or name in self._views
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def slices(self) -> Dict[str, Tuple[slice, ...]]:
+        return dict(self._slices)
+
+    def alias_spec(self, name: str) -> Tuple[Tuple[slice, ...], Optional[Tuple[int, ...]], Optional[Tuple[int, ...]]]:
+        """(region, view shape, perm) of an alias."""
+        return self._views[name]
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            object.__setattr__(self, "_backend", get_backend(self.backend_name, self.device))
+        return self._backend
+
+    def _tiles(self, names) -> bool:
+        # True when names cover the 1d bin back to back with no holes
+        if len(self.shape) != 1:
+            return False
+        pos = 0
+        for name in sorted(names, key=lambda k: self._slices[k][0].start):
+            s = self._slices[name][0]
+            if s.start != pos or s.step not in (None, 1):
+                return False
+            pos = s.stop
+        return pos == self.shape[0]
+
+    # ---- Static access (safe inside jax.jit / torch.compile) ----
+    def slice_view(self, x, name: str):
+        if name not in self._views:
+            return x[self._slices[name]]
+        region, shape, perm = self._views[name]
+        view = x[region]
+        if shape is not None:
+            view = self.backend.reshape_view(view, shape)
+            if perm is not None:
+                view = self.backend.permute(view, perm)
+        return view
+
+    def unpack(self, x) -> Dict[str, Any]:
+        """Splits a bin into {name: view}, aliases included."""
+        out = {name: x[slc] for name, slc in self._slices.items()}
+        out.update({name: self.slice_view(x, name) for name in self.aliases})
+        return out
+
+    def _storage_order(self, name: str, value):
+        # an alias value in its view shape, back in the flat order of the storage it covers
+        _, shape, perm = self._views[name]
+        if perm is not None:
+            value = self.backend.permute(value, tuple(sorted(range(len(perm)), key=perm.__getitem__)))
+        return value.reshape(-1) if shape is not None else value
+
+    def pack(self, tensors: Dict[str, Any], fill_value=0, dtype=None):
+        """
+        Builds a bin from {name: tensor}; regions left out are set to fill_value. An alias
+        writes its target's storage, so later entries win where names share it.
+        """
+        be = self.backend
+        if dtype is None and self.tiled and len(tensors) == len(self.names) and not any(k in self._views for k in tensors):
+            # one concatenate instead of allocate + per-region writes
+            order = sorted(tensors, key=lambda k: self._slices[k][0].start)
+            return be.concatenate([be.asarray(tensors[k]) for k in order])
+        if fill_value is None:
+            x = be.empty(self.shape, dtype=dtype)
+        else:
+            x = be.full(self.shape, fill_value, dtype=dtype)
+        for name, value in tensors.items():
+            value = be.asarray(value)
+            if name in self._views:
+                value = self._storage_order(name, value)
+            x = be.index_put(x, self[name], value)
+        return x
+
+    def bind(self, x) -> "LayoutBin":
+        return LayoutBin(x, self)
+
+
+class LayoutBin:
+    """A bin tensor carried together with its Layout; a jax pytree whose only leaf is the bin."""
+    __slots__ = ("data", "layout")
+
+    def __init__(self, data, layout: Layout):
+        self.data = data
+        self.layout = layout
+
+    def __getitem__(self, name: str):
+        return self.layout.slice_view(self.data, name)
+
+    def __getattr__(self, name: str):
+        layout = object.__getattribute__(self, "layout")
+        if name in layout:
+            return layout.slice_view(object.__getattribute__(self, "data"), name)
+        raise AttributeError(f"'LayoutBin' object has no attribute '{name}'")
+
+    def unpack(self) -> Dict[str, Any]:
+        return self.layout.unpack(self.data)
+
+    def __repr__(self):
+        return f"LayoutBin({self.layout!r})"
+
+
+_PYTREES_REGISTERED = False
+
+def register_pytrees():
+    """Registers Layout (no leaves, static) and LayoutBin (one leaf) with jax; idempotent."""
+    global _PYTREES_REGISTERED
+    if _PYTREES_REGISTERED:
+        return
+    from jax import tree_util
+    tree_util.register_pytree_node(Layout, lambda lay: ((), lay), lambda lay, _: lay)
+    tree_util.register_pytree_node(
+        LayoutBin,
+        lambda b: ((b.data,), b.layout),
+        lambda lay, children: LayoutBin(children[0], lay),
+    )
+    _PYTREES_REGISTERED = True
@@ -0,0 +1,47 @@
+import numpy as np
+from typing import Dict, List, Tuple
+from .backend import _host_copy
+
+class RegionIndex:
+    """
+    Sorted boundary index over non-overlapping 1d regions (the inverse of a layout).
+    Region ids are positions in .names, which is ordered by region start.
+    """
+    def __init__(self, slices: Dict[str, Tuple[slice, ...]]):
+        self.names: List[str] = sorted(slices, key=lambda k: slices[k][0].start)
+        self.starts = np.array([slices[k][0].start for k in self.names], dtype=np.int64)
+        self.stops = np.array([slices[k][0].stop for k in self.names], dtype=np.int64)
+        self.steps = np.array([slices[k][0].step or 1 for k in self.names], dtype=np.int64)
+
+    @classmethod
+    def from_columns(cls, names: List[str], starts: np.ndarray, stops: np.ndarray) -> "RegionIndex":
+        """Builds the index straight from columnar (names, starts, stops) without slice objects."""
+        order = np.argsort(starts, kind="stable")
+        index = cls.__new__(cls)
+        index.names = [names[i] for i in order.tolist()]
+        index.starts = np.asarray(starts, dtype=np.int64)[order]
+        index.stops = np.asarray(stops, dtype=np.int64)[order]
+        index.steps = np.ones(len(order), dtype=np.int64)
+        return index
+
+    def locate(self, positions) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Maps flat bin positions to (region_ids, local_offsets).
+        Positions owned by no region (holes, or skipped by a strided region) get id -1 and offset -1.
+        """
+        p = np.asarray(_host_copy(positions), dtype=np.int64)
+        ids = np.searchsorted(self.starts, p, side="right") - 1
+        safe = np.clip(ids, 0, max(len(self.names) - 1, 0))
+        if not len(self.names):
+            return np.full(p.shape, -1), np.full(p.shape, -1)
+        rel = p - self.starts[safe]
+        owned = (ids >= 0) & (p < self.stops[safe]) & (rel % self.steps[safe] == 0)
+        ids = np.where(owned, ids, -1)
+        offsets = np.where(owned, rel // self.steps[safe], -1)
+        return ids, offsets
+
+    def overlapping(self, a: int, b: int) -> List[str]:
+        """Names of the regions intersecting [a, b), in bin order."""
+        lo = np.searchsorted(self.stops, a, side="right")
+        hi = np.searchsorted(self.starts, b, side="left")
+        return self.names[lo:hi]
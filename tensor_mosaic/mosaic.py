@@ -1,33 +1,63 @@
+import functools
 from typing import Dict, Tuple, Union, Optional, Callable, Any, List
-from .backend import TorchBackend, NumpyBackend, JaxBackend
-from .packers import greedy_packer
-from .slicemanager import BinManager
+from .backend import get_backend
+from .packers import greedy_packer, greedy_gap_packer, best_fit_gap_packer, worst_fit_gap_packer, best_of_packer, \
+    branch_and_bound_packer, array_greedy_packer, array_gap_packer, make_stable_packer
+from .slicemanager import Alias, BinManager, SliceColumns
+from .sharding import shard_layout
+from .indices import IndexCache
+from .lookup import RegionIndex
+from .layout import Layout
+from .stats import LayoutStats, MemoryPlan, layout_stats, memory_plan
+from .paged import PagedBin
+from .relayout import RelayoutPlan
+from .validate import OverlapError, check_layout
+from . import instrument
 
-BACKEND_MAP = {
-    "torch": TorchBackend,
-    "numpy": NumpyBackend,
-    "jax":   JaxBackend,
-}
+# Overlapping explicit regions were accepted silently before compile() validated layouts
+_OVERLAP_HINT = ("to share storage on purpose, declare the second name with Mosaic.alias(); "
+                 "Mosaic(validate=False) skips this check")
 
 class Mosaic:
 
-    def __init__(self, dim, backend="torch", device=None, cache=True, autocompile=True, strategy="greedy", batched=False):
+    def __init__(self, dim, backend="torch", device=None, cache=True, autocompile=True, strategy="greedy", batched=False,
+                 validate=True):
         self.backend_name = backend
-        self.backend = BACKEND_MAP[backend](device) if backend != "numpy" else BACKEND_MAP[backend]()
+        self.backend = get_backend(backend, device)
         self.device = device
         self.bin_manager = BinManager(dim=dim)
         self.cache_indices = cache
-        self.indices = {}
+        self.indices = IndexCache(self.backend, batched=batched)
+        self._region_index: Optional[RegionIndex] = None
+        self._layout: Optional[Layout] = None
+        self._children: Dict[str, "Mosaic"] = {}
+        self._flat: Optional[Dict[str, Tuple[slice, ...]]] = None
+        # aliases at any depth (dotted for children) as of the last compile, for their view shapes
+        self._flat_aliases: Dict[str, Alias] = {}
+        # compile counts: this layout's own, and each child's as of this layout's last compile
+        self._compiles = 0
+        self._child_compiles: Dict[str, int] = {}
         self._allocation_recipe: List[Dict] = []
         self._packer_map: Dict[str, Callable] = {
             "greedy": greedy_packer,
+            "gap": greedy_gap_packer,
+            "best_fit": best_fit_gap_packer,
+            "worst_fit": worst_fit_gap_packer,
+            "best_of": best_of_packer,
+            "exact": branch_and_bound_packer,
+            "greedy_array": array_greedy_packer,
+            "gap_array": array_gap_packer,
         }
         self._strategy = strategy
         self.autocompile = autocompile
         self.batched = batched
+        self.validate = validate
 
     # ---- BinManager Pass-Through Methods ----
     def add(self, name: str, shape=None, region=None):
+        if instrument.ENABLED:
+            instrument.emit("add", name=name, shape=shape, region=region)
+        self._children.pop(name, None)
         self.bin_manager.add(name, shape=shape, region=region)
         # Save recipe for serialization
         self._allocation_recipe.append({
@@ -36,18 +66,72 @@ class Mosaic:
             "region": region if region is not None else None,
         })
         if self.autocompile:
-            self.compile()
+            self._autocompile()
+
+    def add_many(self, names, sizes):
+        """Adds many 1d shape requests in one call; pairs well with the array-native strategies."""
+        names = list(names)
+        self.bin_manager.add_many(names, sizes)
+        requests = self.bin_manager.requests
+        self._allocation_recipe.extend({"name": name, "shape": requests[name][0], "region": None} for name in names)
+        if self.autocompile:
+            self._autocompile()
+
+    def add_child(self, name: str, child: "Mosaic"):
+        """
+        Nests child's layout inside a region of this one. The region is sized to the child's bin
+        at every compile, and child names are reachable as "name.<child name>" (recursively).
+        Changes to a child (at any depth) show up in the parent at its next compile, which
+        first recompiles every child that changed; autocompile on the child does not reach up.
+        """
+        if self.bin_manager.dim != 1 or child.bin_manager.dim != 1:
+            raise NotImplementedError("Nested mosaics currently support 1d layouts only.")
+        if child._stale():
+            child.compile()
+        self.bin_manager.add(name, shape=child.shape)
+        self._children[name] = child
+        self._allocation_recipe.append({"name": name, "shape": None, "region": None, "child": child._allocation_recipe})
+        if self.autocompile:
+            self._autocompile()
+
+    def alias(self, name: str, target: str, shape=None, offset: int = 0, perm=None):
+        """
+        Declares name as a view of target's storage: elements [offset, offset + numel) of it,
+        reshaped to shape and with axes reordered by perm when given. Aliases take no space in
+        the bin, so writes through either name are seen by both. Without autocompile, the
+        target may be declared later; it is resolved at compile.
+        """
+        bm = self.bin_manager
+        if self.autocompile and (target == name or not (target in bm.requests or target in bm.slices
+                                                        or target in bm.aliases)):
+            # checked up front, so a failed declaration leaves the layout as it was
+            raise KeyError(f"Alias target '{target}' is not a region of this layout")
+        if instrument.ENABLED:
+            instrument.emit("add", name=name, alias=target)
+        self._children.pop(name, None)
+        self.bin_manager.add_alias(name, target, shape=shape, offset=offset, perm=perm)
+        self._allocation_recipe.append({"name": name, "shape": None, "region": None,
+                                        "alias": self.bin_manager.aliases[name].to_dict()})
+        if self.autocompile:
+            self._autocompile()
+
+    @property
+    def children(self) -> Dict[str, "Mosaic"]:
+        return dict(self._children)
 
     def __setattr__(self, name, value):
         # Allow normal setting for special/internal names
         if name in {
             "backend", "backend_name", "device", "bin_manager", "cache_indices", "indices",
-            "_packer_map", "_strategy", "strategy", "packer", "autocompile", "batched", "_allocation_recipe"
+            "_packer_map", "_strategy", "strategy", "packer", "autocompile", "batched", "_allocation_recipe",
+            "_region_index", "_layout", "_children", "_flat", "_flat_aliases", "validate", "_compiles", "_child_compiles"
         }:
             super().__setattr__(name, value)
         # Pass attribute assignments to BinManager
         elif hasattr(self, "bin_manager"):
-            if isinstance(value, (int, tuple, list)):
+            if isinstance(value, Mosaic):
+                self.add_child(name, value)
+            elif isinstance(value, (int, tuple, list)):
                 self.add(name, shape=value)
             else:
                 self.add(name, region=value)
@@ -55,6 +139,9 @@ class Mosaic:
             super().__setattr__(name, value)
 
     def __getitem__(self, name):
+        if self._flat is not None and self.bin_manager._compiled:
+            # absolute regions of the whole tree, dotted names included
+            return self._flat[name]
         return self.bin_manager[name]
 
     def __getattr__(self, name):
@@ -66,25 +153,133 @@ class Mosaic:
         else:
             raise AttributeError(f"'Mosaic' object has no attribute '{name}'")
 
-    def compile(self, packer: Optional[Callable] = None):
+    def _autocompile(self):
+        # runs after every add, so best_of stays in-process: a worker pool per add costs more than it saves
+        packer = self._packer_map[self._strategy]
+        if packer is best_of_packer:
+            packer = functools.partial(best_of_packer, max_workers=0)
+        self.compile(packer)
+
+    def compile(self, packer: Optional[Callable] = None, stable: bool = False):
+        """Packs all requests. With stable=True, requests keep their current placement where they still fit."""
         packer = packer or self._packer_map[self._strategy]
-        self.bin_manager.compile(packer)
-        # Build indices for each region
-        if self.cache_indices:
-            self.indices.clear()
-            for name, region in self.bin_manager.slices.items():
-                idx_ranges = [self.backend.arange(s.start, s.stop) for s in region]
-                grid = self.backend.meshgrid(idx_ranges)
-                idx_tensor = self.backend.stack([g.flatten() for g in grid], axis=-1)
-                idx_tensor = idx_tensor.squeeze()
-                if self.batched:
-                    idx_tensor = self.backend.stack([idx_tensor], axis=0)
-                self.indices[name] = idx_tensor
+        if stable:
+            previous = {**self.bin_manager.displaced, **self.bin_manager.slices}
+            packer = make_stable_packer({k: previous[k] for k in self.bin_manager.requests if k in previous}, packer)
+        with instrument.span("compile", strategy=self._strategy, requests=len(self.bin_manager.requests)):
+            for name, child in self._children.items():
+                # children first, so each parent region is sized to its child's current bin
+                if child._stale():
+                    child.compile()
+                self.bin_manager.requests[name] = child.shape
+            with instrument.span("pack", packer=getattr(packer, "__name__", repr(packer))):
+                self.bin_manager.compile(packer)
+            if self.validate:
+                with instrument.span("validate"):
+                    try:
+                        check_layout(self.bin_manager.slices, self.bin_manager.shape)
+                    except OverlapError as e:
+                        self.bin_manager._compiled = False
+                        if not e.conflicts:
+                            raise
+                        raise OverlapError(e.conflicts, e.out_of_bounds, hint=_OVERLAP_HINT) from None
+            self._layout = None
+            # Sorted boundaries for position -> region lookups
+            slices = self.bin_manager.slices
+            if self.bin_manager.dim != 1:
+                self._region_index = None
+            elif isinstance(slices, SliceColumns) and not any((v[0].step or 1) != 1 for v in slices.explicit.values()):
+                self._region_index = RegionIndex.from_columns(*slices.columns())
+            else:
+                self._region_index = RegionIndex(slices)
+            self._flat = self._flatten() if self._children else None
+            self._flat_aliases = dict(self.bin_manager.aliases)
+            for name, child in self._children.items():
+                self._flat_aliases.update({f"{name}.{path}": a for path, a in child._flat_aliases.items()})
+            self._child_compiles = {name: child._compiles for name, child in self._children.items()}
+            self._compiles += 1
+            # Index tensors are described per region and built on first lookup
+            if self.cache_indices:
+                regions = self._regions()
+                self.indices.bind(regions, self.bin_manager.shape)
+                self._bind_permuted_aliases(regions)
+
+    def _stale(self) -> bool:
+        # uncompiled, or some child at any depth changed or was recompiled since this layout was packed
+        if not self.bin_manager._compiled:
+            return True
+        return any(child._stale() or child._compiles != self._child_compiles.get(name)
+                   for name, child in self._children.items())
+
+    def _regions(self):
+        # every addressable region: dotted child paths and aliases included
+        if self._flat is not None:
+            return self._flat
+        if not self.bin_manager.alias_slices:
+            return self.bin_manager.slices
+        return {**self.bin_manager.slices, **self.bin_manager.alias_slices}
+
+    def _bind_permuted_aliases(self, regions):
+        # flat positions of a permuted alias follow its permuted element order, not storage order
+        for name, alias in self._flat_aliases.items():
+            if alias.perm is None:
+                continue
+            (s,) = regions[name]
+            idx = self.backend.arange(s.start, s.stop, dtype=self.indices.dtype)
+            idx = self.backend.permute(self.backend.reshape_view(idx, alias.shape), alias.perm).reshape(-1)
+            if self.batched:
+                idx = self.backend.stack([idx], axis=0)
+            self.indices[name] = idx
+
+    def _flatten(self) -> Dict[str, Tuple[slice, ...]]:
+        # {name or dotted path: absolute region}; child regions are shifted by their parent offset
+        flat = dict(self.bin_manager.slices)
+        flat.update(self.bin_manager.alias_slices)
+        for name, child in self._children.items():
+            offset = flat[name][0].start
+            for path, (s,) in child._regions().items():
+                flat[f"{name}.{path}"] = (slice(s.start + offset, s.stop + offset, s.step),)
+        return flat
 
     def bin_tensor(self, fill_value=0, dtype=None):
         if not self.bin_manager._compiled:
             self.compile()
-        return self.backend.full(self.bin_manager.shape, fill_value, dtype=dtype)
+        if fill_value is None:
+            # caller overwrites everything; skip the fill
+            x = self.backend.empty(self.bin_manager.shape, dtype=dtype)
+        else:
+            x = self.backend.full(self.bin_manager.shape, fill_value, dtype=dtype)
+        if instrument.ENABLED:
+            instrument.emit("alloc", what="bin", bytes=instrument.nbytes(x))
+        return x
+
+    def plan(self, dtype=None, backend: Optional[str] = None) -> MemoryPlan:
+        """
+        Dry run: packs the layout (if needed) and reports bin, per-region and index-cache bytes
+        for a backend and dtype without allocating any bin or index data.
+        """
+        if not self.bin_manager._compiled:
+            self.compile()
+        index_numel = None
+        if self._flat is not None or self.bin_manager.alias_slices:
+            # the index cache also covers dotted names and aliases
+            index_numel = int(memory_plan(self._regions(), self.shape).counts.sum())
+        return memory_plan(self.bin_manager.slices, self.shape, backend=backend or self.backend_name, dtype=dtype,
+                           index_numel=index_numel)
+
+    def paged_bin(self, page_size: int = 4096, fill_value=0, dtype=None) -> PagedBin:
+        """Sparse bin allocating only the pages regions touch; for layouts with huge address gaps."""
+        if not self.bin_manager._compiled:
+            self.compile()
+        regions = self._regions()
+        aliases = {k: (regions[k], a.shape, a.perm) for k, a in self._flat_aliases.items()}
+        if aliases:
+            regions = {k: v for k, v in regions.items() if k not in aliases}
+        x = PagedBin(regions, self.shape, page_size=page_size, backend_name=self.backend_name, device=self.device,
+                     backend=self.backend, fill_value=fill_value, dtype=dtype, aliases=aliases)
+        if instrument.ENABLED:
+            instrument.emit("alloc", what="paged_bin", bytes=x.nbytes)
+        return x
 
     @property
     def shape(self):
@@ -95,11 +290,101 @@ class Mosaic:
         for k, v in self.bin_manager.slices.items():
             print(f"{k:10}: {v}")
         print(f"Bin shape: {self.shape}")
+        print(self.stats())
+
+    def stats(self) -> LayoutStats:
+        """Requested elements, utilization, holes and wasted space of the compiled layout."""
+        if not self.bin_manager._compiled:
+            self.compile()
+        return layout_stats(self.bin_manager.slices, self.shape)
 
     def slice_view(self, x, name: str):
         if not self.bin_manager._compiled:
             self.compile()
-        return x[self.bin_manager[name]]
+        view = x[self[name]]
+        alias = self._flat_aliases.get(name)
+        if alias is not None and alias.shape is not None:
+            view = self.backend.reshape_view(view, alias.shape)
+            if alias.perm is not None:
+                view = self.backend.permute(view, alias.perm)
+        return view
+
+    def _lookup(self) -> RegionIndex:
+        if not self.bin_manager._compiled:
+            self.compile()
+        if self._region_index is None:
+            raise NotImplementedError("Position lookups currently support 1d layouts only.")
+        return self._region_index
+
+    @property
+    def region_names(self) -> List[str]:
+        """Region names in bin order; the ids returned by locate() index into this list."""
+        return self._lookup().names
+
+    def locate(self, positions):
+        """Vectorized flat position -> (region_ids, local_offsets); unowned positions get -1."""
+        ids, offsets = self._lookup().locate(positions)
+        return self.backend.asarray(ids), self.backend.asarray(offsets)
+
+    def regions_in_range(self, start: int, stop: int) -> List[str]:
+        """Names of all regions intersecting [start, stop)."""
+        return self._lookup().overlapping(start, stop)
+
+    def layout(self) -> Layout:
+        """Hashable snapshot of the compiled layout; safe as a static argument to jax.jit."""
+        if not self.bin_manager._compiled:
+            self.compile()
+        if self._layout is None:
+            aliases = {k: (self.bin_manager.alias_slices[k], a.shape, a.perm) for k, a in self.bin_manager.aliases.items()}
+            self._layout = Layout(self.bin_manager.slices, self.shape, self.backend_name,
+                                  device=self.device, backend=self.backend, aliases=aliases)
+        return self._layout
+
+    def pack(self, tensors: Dict[str, Any], fill_value=0, dtype=None):
+        """Builds a bin from {name: tensor}; regions left out are set to fill_value."""
+        return self.layout().pack(tensors, fill_value=fill_value, dtype=dtype)
+
+    def unpack(self, x) -> Dict[str, Any]:
+        """Splits a bin into {name: view}."""
+        names = list(self.bin_manager.slices) + list(self.bin_manager.aliases)
+        return {name: self.slice_view(x, name) for name in names}
+
+    def shard(self, num_shards: int, split: bool = True, itemsize: Optional[Dict[str, int]] = None):
+        """Splits the bin into num_shards balanced contiguous ranges; see sharding.shard_layout."""
+        if not self.bin_manager._compiled:
+            self.compile()
+        return shard_layout(self.bin_manager.slices, self.shape, num_shards, split=split, itemsize=itemsize)
+
+    @staticmethod
+    def relayout_plan(old, new) -> RelayoutPlan:
+        """Plan migrating bins from old's layout to new's (Mosaics, Layouts or (slices, shape) pairs)."""
+        return RelayoutPlan(old, new)
+
+    # --------- Cross-Backend Conversion ---------
+    def convert(self, x, to: str = None, device=None):
+        """Converts a bin (or any array) to another backend, zero-copy through DLPack where possible."""
+        backend = get_backend(to, device) if to is not None else self.backend
+        return backend.from_dlpack(x)
+
+    def to_backend(self, backend: str, device=None) -> "Mosaic":
+        """Returns a Mosaic on another backend that reuses this layout and its cached indices."""
+        m = Mosaic(self.bin_manager.dim, backend=backend, device=device, cache=self.cache_indices,
+                   autocompile=self.autocompile, strategy=self._strategy, batched=self.batched, validate=self.validate)
+        m._packer_map = dict(self._packer_map)
+        m._allocation_recipe = list(self._allocation_recipe)
+        m._children = dict(self._children)
+        m._flat = self._flat
+        m._region_index = self._region_index  # backend-independent, shared like the slices
+        m._flat_aliases = dict(self._flat_aliases)
+        m._compiles, m._child_compiles = self._compiles, dict(self._child_compiles)
+        m.bin_manager.requests = dict(self.bin_manager.requests)
+        m.bin_manager.aliases = dict(self.bin_manager.aliases)
+        m.bin_manager.alias_slices = dict(self.bin_manager.alias_slices)
+        m.bin_manager.slices = self.bin_manager.slices.copy()
+        m.bin_manager.shape = self.bin_manager.shape
+        m.bin_manager._compiled = self.bin_manager._compiled
+        m.indices = self.indices.to_backend(m.backend)
+        return m
 
     # --------- Serialization & Reload Support ---------
     def save_allocations(self, path):
@@ -112,9 +397,23 @@ class Mosaic:
         import json
         with open(path, "r") as f:
             recipe = json.load(f)
+        return cls._from_recipe(recipe, dim, backend, device, **kwargs)
+
+    @classmethod
+    def _from_recipe(cls, recipe, dim, backend, device, **kwargs):
         m = cls(dim=dim, backend=backend, device=device, **kwargs)
+        # replay without compiling, so aliases may precede their targets; compile once at the end
+        autocompile, m.autocompile = m.autocompile, False
         for req in recipe:
-            m.add(req["name"], shape=req.get("shape"), region=req.get("region"))
+            if req.get("child") is not None:
+                m.add_child(req["name"], cls._from_recipe(req["child"], dim, backend, device, **kwargs))
+            elif req.get("alias") is not None:
+                m.alias(req["name"], **req["alias"])
+            else:
+                m.add(req["name"], shape=req.get("shape"), region=req.get("region"))
+        m.autocompile = autocompile
+        if autocompile:
+            m.compile()
         return m
 
     def save_bin(self, x, path):
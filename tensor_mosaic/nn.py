@@ -0,0 +1,52 @@
+import torch
+from typing import TYPE_CHECKING, Dict, Union
+from .layout import Layout
+
+if TYPE_CHECKING:
+    from .mosaic import Mosaic
+
+def _as_layout(layout) -> Layout:
+    return layout if isinstance(layout, Layout) else layout.layout()
+
+class Unpack(torch.nn.Module):
+    """
+    Splits a bin into {name: view} inside a model, aliases included.
+    Regions are frozen into plain slice tuples at construction, so torch.compile traces the
+    forward without guards on Mosaic state. Regions index the trailing dims, so leading batch
+    dims pass through.
+    """
+    def __init__(self, layout: Union[Layout, "Mosaic"]):
+        super().__init__()
+        layout = _as_layout(layout)
+        self.names = layout.names
+        self.regions = tuple((Ellipsis,) + layout[name] for name in layout.names)
+        # (name, region, view shape, perm) per alias
+        self.views = tuple((name, (Ellipsis,) + layout[name], *layout.alias_spec(name)[1:]) for name in layout.aliases)
+
+    def forward(self, x: torch.Tensor) -> Dict[str, torch.Tensor]:
+        out = {name: x[region] for name, region in zip(self.names, self.regions)}
+        for name, region, shape, perm in self.views:
+            view = x[region]
+            if shape is not None:
+                lead = view.dim() - 1
+                view = view.reshape(*view.shape[:lead], *shape)
+                if perm is not None:
+                    view = view.permute(*range(lead), *(lead + p for p in perm))
+            out[name] = view
+        return out
+
+
+class Pack(torch.nn.Module):
+    """
+    Inverse of Unpack: concatenates {name: tensor} into a bin along the last dim (1d layouts
+    with no holes). Aliases are views of other regions, so only the regions are read.
+    """
+    def __init__(self, layout: Union[Layout, "Mosaic"]):
+        super().__init__()
+        layout = _as_layout(layout)
+        if not layout.tiled:
+            raise ValueError("Pack needs a 1d layout whose regions tile the bin without holes")
+        self.order = tuple(sorted(layout.names, key=lambda k: layout[k][0].start))
+
+    def forward(self, tensors: Dict[str, torch.Tensor]) -> torch.Tensor:
+        return torch.cat([tensors[name] for name in self.order], dim=-1)
@@ -1,23 +1,65 @@
+import bisect
+import itertools
+import multiprocessing
+import random
+import time
+import numpy as np
 from typing import Dict, Tuple, Union, Optional, Callable, Any
 
-def greedy_packer(requests: Dict[str, Tuple[int, ...]], static) -> Dict[str, Tuple[slice, ...]]:
+def _skip_static(sizes: np.ndarray, static_starts: np.ndarray, static_stops: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Back-to-back placement from 0 that jumps over static intervals: a request that does not fit
+    before the next static region starts after it (no backfilling). One searchsorted over the
+    request prefix sums per gap. Returns the starts and the end of the last placed request.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    cum = np.concatenate([[0], np.cumsum(sizes)])
+    starts = np.empty(len(sizes), dtype=np.int64)
+    order = np.argsort(np.asarray(static_starts, dtype=np.int64), kind="stable")
+    s_starts = np.asarray(static_starts, dtype=np.int64)[order]
+    s_stops = np.asarray(static_stops, dtype=np.int64)[order]
+    keep = s_stops > s_starts
+    s_starts, s_stops = s_starts[keep], s_stops[keep]
+    reach = np.maximum.accumulate(s_stops) if len(s_stops) else s_stops
+    i, cursor = 0, 0
+    for a, r in zip(s_starts.tolist(), reach.tolist()):
+        if i == len(sizes):
+            break
+        if a > cursor:
+            # requests i..k-1 fit back to back into [cursor, a)
+            k = int(np.searchsorted(cum, cum[i] + a - cursor, side="right")) - 1
+            starts[i:k] = cursor + cum[i:k] - cum[i]
+            i = k
+        cursor = max(cursor, r)
+    starts[i:] = cursor + cum[i:-1] - cum[i]
+    end = int(starts[-1] + sizes[-1]) if len(sizes) else 0
+    return starts, end
+
+
+def greedy_packer(requests: Dict[str, Tuple[int, ...]], static=None) -> Dict[str, Tuple[slice, ...]]:
     """
     Naive greedy allocation: Place each shape sequentially, growing the bin as needed along the first axis.
+    Static regions are stepped over along the first axis.
     Returns a dict of {alias: tuple of slices} and the bin size.
     """
+    static = static or {}
+    ndim = len(next(iter(requests.values()))) if requests else \
+        len(next(iter(static.values()))) if static else 1
+    names = list(requests)
+    starts, _ = _skip_static(np.array([requests[k][0] for k in names], dtype=np.int64),
+                             [v[0].start for v in static.values()], [v[0].stop for v in static.values()])
     allocations = {}
-    pos = [0] * (len(next(iter(requests.values()))) if requests else 1)
-    max_dims = [0] * len(pos)
-    for alias, shape in requests.items():
-        slices = []
-        for i, dim in enumerate(shape):
-            start = pos[i] if i == 0 else 0
-            stop = start + dim
-            slices.append(slice(start, stop))
-            if stop > max_dims[i]:
-                max_dims[i] = stop
+    max_dims = [0] * ndim
+    for alias, start in zip(names, starts.tolist()):
+        shape = requests[alias]
+        slices = [slice(start, start + shape[0])] + [slice(0, dim) for dim in shape[1:]]
         allocations[alias] = tuple(slices)
-        pos[0] += shape[0]
+        for i, s in enumerate(slices):
+            max_dims[i] = max(max_dims[i], s.stop)
+    # the bin covers static regions too
+    for region in static.values():
+        for i, s in enumerate(region[:ndim]):
+            max_dims[i] = max(max_dims[i], s.stop)
     return allocations, tuple(max_dims)
 
 
@@ -57,3 +99,350 @@ def greedy_gap_packer(requests, static):
     all_ends = [stop for _, stop in intervals]
     bin_shape = (max(all_ends),)
     return allocs, bin_shape
+
+
+def multi_bin_packer(requests, capacity: int, strategy: str = "ffd"):
+    """
+    Packs 1d requests into as many fixed-capacity bins as needed (sequence packing).
+    strategy is "ffd" (first-fit decreasing) or "bfd" (best-fit decreasing).
+    Returns a dict of {alias: (bin_id, tuple of slices)} and the (num_bins, capacity) shape.
+    """
+    if strategy not in ("ffd", "bfd"):
+        raise ValueError(f"Unknown multi-bin strategy: {strategy}")
+    # largest first; sorted() is stable so equal sizes keep insertion order
+    order = sorted(requests.items(), key=lambda kv: kv[1][0], reverse=True)
+
+    fill = []        # used length of each bin
+    free = []        # sorted (remaining, bin_id) pairs, only used by bfd
+    allocs = {}
+    for k, shape in order:
+        length = shape[0]
+        if length > capacity:
+            raise ValueError(f"Request '{k}' of length {length} exceeds bin capacity {capacity}")
+        bin_id = None
+        if strategy == "ffd":
+            for i, used in enumerate(fill):
+                if capacity - used >= length:
+                    bin_id = i
+                    break
+        else:
+            # tightest bin that still fits
+            j = bisect.bisect_left(free, (length, -1))
+            if j < len(free):
+                _, bin_id = free.pop(j)
+        if bin_id is None:
+            bin_id = len(fill)
+            fill.append(0)
+        start = fill[bin_id]
+        fill[bin_id] = start + length
+        if strategy == "bfd":
+            bisect.insort(free, (capacity - fill[bin_id], bin_id))
+        allocs[k] = (bin_id, (slice(start, start + length),))
+    # hand results back in request order
+    allocs = {k: allocs[k] for k in requests}
+    return allocs, (len(fill), capacity)
+
+
+def fit_gap_packer(requests, static, fit: str = "first", order=None):
+    """
+    Places 1d requests into the first, best (tightest) or worst (roomiest) fitting gap between
+    occupied intervals, appending at the end when no gap is large enough.
+    order lists the request names in placement order (insertion order by default).
+    """
+    if fit not in ("first", "best", "worst"):
+        raise ValueError(f"Unknown fit: {fit}")
+    intervals = sorted((s[0].start, s[0].stop) for s in static.values())
+    allocs = {}
+    for k in (order if order is not None else requests):
+        length = requests[k][0]
+        chosen = None  # (gap size, gap start)
+        prev_end = 0
+        for start, end in intervals:
+            gap = start - prev_end
+            if gap >= length:
+                if fit == "first":
+                    chosen = (gap, prev_end)
+                    break
+                if chosen is None or (gap < chosen[0] if fit == "best" else gap > chosen[0]):
+                    chosen = (gap, prev_end)
+            prev_end = max(prev_end, end)
+        pos = chosen[1] if chosen is not None else prev_end
+        allocs[k] = (slice(pos, pos + length),)
+        bisect.insort(intervals, (pos, pos + length))
+    allocs = {k: allocs[k] for k in requests}
+    return allocs, (max((end for _, end in intervals), default=0),)
+
+
+def best_fit_gap_packer(requests, static):
+    """Gap packing into the tightest gap that fits."""
+    return fit_gap_packer(requests, static, fit="best")
+
+
+def worst_fit_gap_packer(requests, static):
+    """Gap packing into the roomiest gap, leaving larger leftovers for later requests."""
+    return fit_gap_packer(requests, static, fit="worst")
+
+
+def count_holes(allocs, static) -> int:
+    """Number of free gaps below the end of the occupied 1d range."""
+    intervals = sorted((s[0].start, s[0].stop) for s in list(static.values()) + list(allocs.values()))
+    holes, prev_end = 0, 0
+    for start, end in intervals:
+        if start > prev_end:
+            holes += 1
+        prev_end = max(prev_end, end)
+    return holes
+
+
+def _run_candidate(requests, static, fit, order):
+    allocs, shape = fit_gap_packer(requests, static, fit=fit, order=order)
+    return (shape[0], count_holes(allocs, static)), allocs, shape
+
+
+def best_of_packer(requests, static, time_budget: float = 1.0, restarts: int = 4, max_workers: Optional[int] = None,
+                   seed: int = 0, parallel_threshold: int = 64):
+    """
+    Tries first-, best- and worst-fit gap packing over several request orderings (insertion,
+    size-descending and `restarts` seeded shuffles) and keeps the smallest bin, breaking ties
+    by the fewest holes. Candidates run in a process pool when there are at least
+    parallel_threshold requests (below that, pool startup costs more than packing) and
+    max_workers is not 0; workers still running after time_budget seconds are terminated.
+    """
+    deadline = time.monotonic() + time_budget
+    names = list(requests)
+    orders = [sorted(names, key=lambda k: requests[k][0], reverse=True), names]
+    rng = random.Random(seed)
+    for _ in range(restarts):
+        shuffled = names[:]
+        rng.shuffle(shuffled)
+        orders.append(shuffled)
+    candidates = [(fit, order) for order in orders for fit in ("first", "best", "worst")]
+
+    # size-descending first fit runs up front so there is always an answer
+    best = _run_candidate(requests, static, *candidates[0])
+    rest = candidates[1:]
+    if len(requests) < parallel_threshold or max_workers == 0:
+        for fit, order in rest:
+            if time.monotonic() >= deadline:
+                break
+            best = min(best, _run_candidate(requests, static, fit, order), key=lambda r: r[0])
+    else:
+        # forkserver workers start from a clean process, so threads held by torch/jax are not forked
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        # a Pool we own, so workers still running past the budget can be terminated
+        pool = multiprocessing.get_context(method).Pool(processes=max_workers)
+        try:
+            results = [pool.apply_async(_run_candidate, (requests, static, fit, order)) for fit, order in rest]
+            for r in results:
+                r.wait(max(0.0, deadline - time.monotonic()))
+                if r.ready() and r.successful():
+                    best = min(best, r.get(), key=lambda c: c[0])
+        finally:
+            pool.terminate()
+            pool.join()
+    _, allocs, shape = best
+    return allocs, shape
+
+
+def branch_and_bound_packer(requests, static, node_limit: int = 1_000_000, time_limit: Optional[float] = 10.0,
+                            return_stats: bool = False):
+    """
+    Exact 1d gap filling around static regions. Requests placed in the gaps between static
+    regions cost nothing; the rest are appended after the last static region, so the smallest
+    bin is the one that packs the most length into gaps. Depth-first branch-and-bound over
+    size-descending requests, pruned by `packed + min(remaining that fit, free gap space)`, starting
+    from a first-fit-decreasing incumbent. Stops at node_limit nodes or time_limit seconds
+    with the best layout found so far.
+    With return_stats, also returns {"nodes", "optimal", "lower_bound", "gap"} where gap is
+    the relative distance between the bin size and the proven lower bound.
+    """
+    deadline = time.monotonic() + time_limit if time_limit is not None else None
+    # merge static intervals and collect the finite gaps between them
+    gaps = []  # [start, capacity]
+    end = 0
+    for start, stop in sorted((s[0].start, s[0].stop) for s in static.values()):
+        if start > end:
+            gaps.append([end, start - end])
+        end = max(end, stop)
+    names = sorted(requests, key=lambda k: requests[k][0], reverse=True)
+    sizes = [requests[k][0] for k in names]
+    suffix = [0] * (len(sizes) + 1)
+    for i in range(len(sizes) - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + sizes[i]
+    residual = [cap for _, cap in gaps]
+    neg_sizes = [-size for size in sizes]  # ascending, for bisect
+
+    # incumbent: first fit decreasing, tail for anything that does not fit
+    assign = []
+    free = residual[:]
+    for size in sizes:
+        g = next((j for j, r in enumerate(free) if r >= size), -1)
+        if g >= 0:
+            free[g] -= size
+        assign.append(g)
+    best = {"packed": sum(s for s, g in zip(sizes, assign) if g >= 0), "assign": assign}
+
+    nodes = 0
+    exhausted = True
+    current = [-1] * len(sizes)
+
+    def expand(i, packed):
+        # visits node (i, packed) and returns the branches to try there, or None if there are none
+        nonlocal nodes, exhausted
+        if packed > best["packed"]:
+            best["packed"], best["assign"] = packed, current[:]
+        if i == len(sizes) or best["packed"] == suffix[0]:
+            return None
+        # only requests no larger than the roomiest gap can still be packed
+        first_fit = max(i, bisect.bisect_left(neg_sizes, -max(residual, default=0)))
+        if packed + min(suffix[first_fit], sum(residual)) <= best["packed"]:
+            return None
+        nodes += 1
+        if nodes > node_limit or (deadline is not None and time.monotonic() > deadline):
+            exhausted = False
+            return None
+        size, tried, branches = sizes[i], set(), []
+        for g in sorted(range(len(residual)), key=lambda j: residual[j]):
+            # gaps with equal residual space are interchangeable
+            if residual[g] < size or residual[g] in tried:
+                continue
+            tried.add(residual[g])
+            branches.append(g)
+        branches.append(-1)  # append to the tail
+        return branches
+
+    # depth-first with an explicit stack (depth is the number of requests): [i, packed, branches, next, gap taken]
+    root = expand(0, 0)
+    stack = [[0, 0, root, 0, -1]] if root is not None else []
+    while stack and exhausted:
+        frame = stack[-1]
+        i, packed, branches, k, taken = frame
+        if taken >= 0:
+            # back from the subtree below gap `taken`: undo the placement
+            residual[taken] += sizes[i]
+            current[i] = -1
+            frame[4] = -1
+        if k == len(branches):
+            stack.pop()
+            continue
+        g = branches[k]
+        frame[3] = k + 1
+        if g >= 0:
+            residual[g] -= sizes[i]
+            current[i] = frame[4] = g
+            packed += sizes[i]
+        child = expand(i + 1, packed)
+        if child is not None:
+            stack.append([i + 1, packed, child, 0, -1])
+
+    allocs = {}
+    fill = [start for start, _ in gaps]
+    tail = end
+    for k, size, g in zip(names, sizes, best["assign"]):
+        if g >= 0:
+            allocs[k] = (slice(fill[g], fill[g] + size),)
+            fill[g] += size
+        else:
+            allocs[k] = (slice(tail, tail + size),)
+            tail += size
+    allocs = {k: allocs[k] for k in requests}
+    shape = (tail,)
+    if not return_stats:
+        return allocs, shape
+    bound = end + suffix[0] - min(suffix[0], sum(cap for _, cap in gaps))
+    lower = shape[0] if exhausted else bound
+    stats = {"nodes": nodes, "optimal": exhausted, "lower_bound": lower,
+             "gap": (shape[0] - lower) / shape[0] if shape[0] else 0.0}
+    return allocs, shape, stats
+
+
+# ---- Array-native packers ----
+# Packers flagged with `array_native = True` take request sizes as an int array (1d, in
+# request order) plus the starts/stops of static regions, and return start offsets as an
+# int array and the bin size. BinManager then keeps the layout in columns and only builds
+# slice objects on lookup.
+
+def array_greedy_packer(sizes: np.ndarray, static_starts: np.ndarray = None, static_stops: np.ndarray = None):
+    """greedy_packer as prefix sums: requests are laid out back to back from 0, stepping over static regions."""
+    static_starts = np.zeros(0, dtype=np.int64) if static_starts is None else static_starts
+    static_stops = np.zeros(0, dtype=np.int64) if static_stops is None else static_stops
+    starts, end = _skip_static(sizes, static_starts, static_stops)
+    return starts, max(end, int(np.max(static_stops, initial=0)))
+
+array_greedy_packer.array_native = True
+
+
+def array_gap_packer(sizes: np.ndarray, static_starts: np.ndarray, static_stops: np.ndarray):
+    """
+    greedy_gap_packer on arrays: first-fit into the gaps between static regions, searched
+    with vectorized comparisons; once no gap can hold any remaining request, the rest is
+    placed after the last static region with one prefix sum.
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    order = np.argsort(np.asarray(static_starts, dtype=np.int64), kind="stable")
+    s_starts = np.asarray(static_starts, dtype=np.int64)[order]
+    s_stops = np.asarray(static_stops, dtype=np.int64)[order]
+    # merged occupied ends preceding each static region give the gaps [prev_end, start)
+    ends = np.maximum.accumulate(s_stops) if len(s_stops) else s_stops
+    prev = np.concatenate([[0], ends[:-1]])
+    gap_start = prev.copy()
+    gap_free = np.maximum(s_starts - prev, 0)
+    end = int(ends[-1]) if len(ends) else 0
+
+    starts = np.empty_like(sizes)
+    # suffix minimum tells when no later request can fit any gap
+    suffix_min = np.minimum.accumulate(sizes[::-1])[::-1] if len(sizes) else sizes
+    i = 0
+    while i < len(sizes) and len(gap_free) and gap_free.max() >= suffix_min[i]:
+        fits = gap_free >= sizes[i]
+        if fits.any():
+            g = int(fits.argmax())
+            starts[i] = gap_start[g]
+            gap_start[g] += sizes[i]
+            gap_free[g] -= sizes[i]
+        else:
+            starts[i] = -1  # tail, assigned below
+        i += 1
+    tail = np.flatnonzero(starts[:i] < 0)
+    tail = np.concatenate([tail, np.arange(i, len(sizes))]).astype(np.int64)
+    tail_stops = end + np.cumsum(sizes[tail])
+    starts[tail] = tail_stops - sizes[tail]
+    return starts, int(tail_stops[-1]) if len(tail) else end
+
+array_gap_packer.array_native = True
+
+
+def make_stable_packer(previous: Dict[str, Tuple[slice, ...]], packer: Optional[Callable] = None):
+    """
+    Wraps a 1d packer so requests keep their previous placement when they still fit there:
+    a request no larger than its old region stays at the old start (shrinking in place) and
+    is treated as static; only new and grown requests go through packer (first-fit gap
+    packing by default). Minimizes data movement between consecutive layouts.
+    """
+    if packer is None or getattr(packer, "array_native", False):
+        packer = fit_gap_packer
+
+    def stable_packer(requests, static):
+        # static intervals by start, with the furthest stop seen so far, to test overlaps by bisection
+        fixed = sorted((v[0].start, v[0].stop) for v in static.values())
+        starts = [a for a, _ in fixed]
+        reach = list(itertools.accumulate((b for _, b in fixed), max))
+        kept, moved = {}, {}
+        for k, shape in requests.items():
+            old = previous.get(k)
+            if old is not None and (old[0].step or 1) == 1 and shape[0] <= old[0].stop - old[0].start:
+                a, b = old[0].start, old[0].start + shape[0]
+                i = bisect.bisect_left(starts, b)
+                if i and reach[i - 1] > a:
+                    moved[k] = shape
+                    continue
+                kept[k] = (slice(a, b),)
+            else:
+                moved[k] = shape
+        allocs, shape = packer(moved, {**static, **kept}) if moved else ({}, (0,))
+        allocs = {k: kept[k] if k in kept else allocs[k] for k in requests}
+        end = max((s[0].stop for s in list(allocs.values()) + list(static.values())), default=0)
+        return allocs, (max(end, shape[0]),)
+
+    stable_packer.__name__ = f"stable_{getattr(packer, '__name__', 'packer')}"
+    return stable_packer
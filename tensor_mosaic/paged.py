@@ -0,0 +1,122 @@
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from .backend import get_backend
+from .layout import Layout
+from .slicemanager import SliceColumns
+
+class PagedBin:
+    """
+    Sparse 1d bin: storage exists only for the fixed-size pages that some region touches.
+    Allocated pages are stored back to back in page-id order, so every region (whose pages
+    are all allocated and consecutive) is still one contiguous, possibly strided, slice of the
+    flat storage and slice_view returns a view. Memory scales with the occupied pages, not
+    with the largest address. aliases are given as in Layout and live inside their targets' pages.
+    """
+    def __init__(self, slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...], page_size: int = 4096,
+                 backend_name: str = "numpy", device=None, backend=None, fill_value=0, dtype=None,
+                 aliases: Optional[Dict[str, Tuple[Any, ...]]] = None):
+        if len(shape) != 1:
+            raise NotImplementedError("Paged bins currently support 1d layouts only.")
+        if page_size < 1:
+            raise ValueError(f"page_size must be positive (got {page_size})")
+        self.backend_name = backend_name
+        self.device = device
+        self.backend = backend or get_backend(backend_name, device)
+        self.slices = slices
+        self._views = dict(aliases or {})
+        self.aliases = tuple(self._views)
+        self._layout = None
+        self.shape = tuple(shape)
+        self.page_size = page_size
+        names, starts, stops = _columns(slices)
+        live = stops > starts
+        first, last = starts[live] // page_size, (stops[live] - 1) // page_size
+        counts = last - first + 1
+        # every page id covered by some region, without materializing the regions themselves
+        offsets = np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        self.page_ids = np.unique(np.repeat(first, counts) + offsets)
+        size = len(self.page_ids) * page_size
+        if fill_value is None:
+            self.data = self.backend.empty((size,), dtype=dtype)
+        else:
+            self.data = self.backend.full((size,), fill_value, dtype=dtype)
+
+    @property
+    def num_pages(self) -> int:
+        return len(self.page_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return int(getattr(self.data, "nbytes", 0))
+
+    def translate(self, region: Tuple[slice, ...]) -> Tuple[slice, ...]:
+        """Maps a region in bin addresses to the same elements in the flat page storage."""
+        (s,) = region
+        if s.stop <= s.start:
+            return (slice(0, 0, s.step),)
+        first, last = s.start // self.page_size, (s.stop - 1) // self.page_size
+        lo, hi = np.searchsorted(self.page_ids, [first, last])
+        if hi >= len(self.page_ids) or self.page_ids[lo] != first or hi - lo != last - first:
+            raise KeyError(f"Region {region} touches pages that are not allocated")
+        start = int(lo) * self.page_size + s.start - first * self.page_size
+        return (slice(start, start + s.stop - s.start, s.step),)
+
+    def compact_slices(self) -> Dict[str, Tuple[slice, ...]]:
+        """The layout remapped onto page storage: {name: region in self.data}."""
+        return {name: self.translate(region) for name, region in self.slices.items()}
+
+    def densify(self) -> Tuple[Layout, Any]:
+        """(Layout of the remapped regions, flat storage); the storage is shared, not copied."""
+        if self._layout is None:
+            aliases = {k: (self.translate(r), shape, perm) for k, (r, shape, perm) in self._views.items()}
+            self._layout = Layout(self.compact_slices(), (len(self.data),), self.backend_name, device=self.device,
+                                  backend=self.backend, aliases=aliases)
+        return self._layout, self.data
+
+    def _region(self, key) -> Tuple[slice, ...]:
+        if isinstance(key, str):
+            region = self._views[key][0] if key in self._views else self.slices[key]
+        else:
+            region = key
+        return (region,) if isinstance(region, slice) else region
+
+    def __getitem__(self, key):
+        return self.data[self.translate(self._region(key))]
+
+    def __setitem__(self, key, value):
+        value = self.backend.asarray(value)
+        if isinstance(key, str) and key in self._views:
+            # an alias value comes in its view shape; write it back in storage order
+            value = self.densify()[0]._storage_order(key, value)
+        self.data = self.backend.index_put(self.data, self.translate(self._region(key)), value)
+
+    def slice_view(self, name: str):
+        """View of a region or alias; aliases come back reshaped and permuted as declared."""
+        if name not in self._views:
+            return self[name]
+        layout, data = self.densify()
+        return layout.slice_view(data, name)
+
+    def pack(self, tensors: Dict[str, Any]) -> "PagedBin":
+        """Writes {name: tensor} into the bin in place and returns it."""
+        for name, value in tensors.items():
+            self[name] = value
+        return self
+
+    def unpack(self) -> Dict[str, Any]:
+        """Splits the bin into {name: view}, aliases included."""
+        out = {name: self[name] for name in self.slices}
+        out.update({name: self.slice_view(name) for name in self.aliases})
+        return out
+
+    def __repr__(self):
+        return f"PagedBin(shape={self.shape}, pages={self.num_pages}x{self.page_size}, regions={len(self.slices)})"
+
+
+def _columns(slices) -> Tuple[list, np.ndarray, np.ndarray]:
+    if isinstance(slices, SliceColumns):
+        return slices.columns()
+    names = list(slices)
+    starts = np.array([slices[k][0].start for k in names], dtype=np.int64)
+    stops = np.array([slices[k][0].stop for k in names], dtype=np.int64)
+    return names, starts, stops
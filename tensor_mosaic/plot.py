@@ -1,60 +1,136 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+import matplotlib
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
 import numpy as np
+from .slicemanager import SliceColumns
+from .stats import LayoutStats
 
-def plot_slices(slices: dict, bin_shape=None, title="Allocation Plot", color_map="tab20"):
+def _resolve(obj, bin_shape):
+    # Mosaic, LayoutStats or a plain {name: tuple of slices}
+    stats = None
+    if isinstance(obj, LayoutStats):
+        stats, slices, bin_shape = obj, obj.slices, bin_shape or obj.shape
+    elif hasattr(obj, "bin_manager"):
+        if not obj.bin_manager._compiled:
+            obj.compile()
+        slices, bin_shape = obj.bin_manager.slices, bin_shape or obj.shape
+    else:
+        slices = obj
+    if slices is None:
+        raise ValueError("LayoutStats carries no slices to plot")
+    return slices, bin_shape, stats
+
+
+def _columns(slices):
+    """(names, bounds) with bounds[i, d] = (start, stop) of region i along dimension d."""
+    if isinstance(slices, SliceColumns):
+        names, starts, stops = slices.columns()
+        return names, np.stack([starts, stops], axis=-1)[:, None, :]
+    names = list(slices)
+    bounds = np.array([[(s.start, s.stop) for s in slices[k]] for k in names], dtype=np.int64)
+    return names, bounds.reshape(len(names), -1, 2)
+
+
+def _raster(bounds, bin_shape, pixels):
+    """Region id (or -1) sampled on a grid of at most `pixels` points per axis."""
+    axes = [np.linspace(0, n, min(n, pixels), endpoint=False).astype(np.int64) for n in bin_shape]
+    if len(bin_shape) == 1:
+        order = np.argsort(bounds[:, 0, 0], kind="stable")
+        starts, stops = bounds[order, 0, 0], bounds[order, 0, 1]
+        i = np.searchsorted(starts, axes[0], side="right") - 1
+        safe = np.clip(i, 0, max(len(order) - 1, 0))
+        owned = (i >= 0) & (axes[0] < stops[safe]) if len(order) else np.zeros(len(axes[0]), bool)
+        return np.where(owned, order[safe] if len(order) else -1, -1)[None, :]
+    img = np.full([len(a) for a in axes], -1, dtype=np.int64)
+    for rid, b in enumerate(bounds):
+        rows = slice(*np.searchsorted(axes[0], b[0]))
+        cols = slice(*np.searchsorted(axes[1], b[1]))
+        img[rows, cols] = rid
+    return img
+
+
+def plot_slices(slices, bin_shape=None, title="Allocation Plot", color_map="tab20", path=None, show=None,
+                ax=None, max_labels=200, min_label_frac=0.02, raster_threshold=20_000, pixels=2048):
     """
-    Universal plotting for {name: tuple of slices}.
+    Universal plotting for {name: tuple of slices}, a Mosaic or a LayoutStats.
     Supports 1D and 2D; falls back to sensible default for missing bin_shape.
+
+    Regions are drawn as one PolyCollection; above raster_threshold regions the occupancy map
+    is rasterized with imshow instead. Only the max_labels widest regions spanning at least
+    min_label_frac of the axis are labelled. With path the figure is written (PNG, SVG, ...)
+    without touching a display; show defaults to True only when neither path nor ax is given.
+    Returns the matplotlib Figure.
     """
+    slices, bin_shape, stats = _resolve(slices, bin_shape)
+    names, bounds = _columns(slices)
     # Auto-detect bin shape if not supplied
     if bin_shape is None:
-        n_dim = len(next(iter(slices.values())))
-        maxes = [0] * n_dim
-        for v in slices.values():
-            for i, s in enumerate(v):
-                maxes[i] = max(maxes[i], s.stop)
-        bin_shape = tuple(maxes)
-    else:
-        n_dim = len(bin_shape)
+        bin_shape = tuple(int(m) for m in bounds[:, :, 1].max(axis=0)) if len(names) else (1,)
+    n_dim = len(bin_shape)
+    if n_dim not in (1, 2):
+        raise NotImplementedError("plot_slices only supports 1D and 2D slices at present.")
+    if stats is not None:
+        title = f"{title} (utilization {stats.utilization:.1%})"
 
-    cmap = plt.get_cmap(color_map)
-    fig, ax = plt.subplots(figsize=(8, 2) if n_dim == 1 else (8, 8))
+    cmap = matplotlib.colormaps[color_map]
+    colors = cmap(np.arange(len(names)) % cmap.N)
+    if ax is None:
+        if show is None:
+            show = path is None
+        if show:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(8, 2) if n_dim == 1 else (8, 8))
+        else:
+            # no pyplot: works on headless machines whatever the default backend
+            fig = Figure(figsize=(8, 2) if n_dim == 1 else (8, 8))
+        ax = fig.add_subplot()
+    else:
+        fig = ax.figure
     ax.set_title(title)
 
+    # x runs along the last dimension, y along the first (1d regions span y in [0.2, 0.8])
+    x0, x1 = bounds[:, -1, 0], bounds[:, -1, 1]
+    y0, y1 = (bounds[:, 0, 0], bounds[:, 0, 1]) if n_dim == 2 else (np.full(len(names), 0.2), np.full(len(names), 0.8))
+    extent = (0, bin_shape[-1], bin_shape[0], 0) if n_dim == 2 else (0, bin_shape[0], 0, 1)
+
+    if len(names) > raster_threshold:
+        img = _raster(bounds, bin_shape, pixels)
+        rgba = np.where((img >= 0)[..., None], colors[np.maximum(img, 0)], 1.0)
+        ax.imshow(rgba, extent=extent, aspect="auto", interpolation="nearest")
+    elif len(names):
+        verts = np.stack([np.stack([x0, y0], -1), np.stack([x1, y0], -1),
+                          np.stack([x1, y1], -1), np.stack([x0, y1], -1)], axis=1)
+        ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors="black",
+                                         linewidths=0.5 if len(names) < 1000 else 0, alpha=1.0 if n_dim == 1 else 0.7))
+
+    # Label culling: only regions wide enough to hold text, widest first
+    width = (x1 - x0) / max(bin_shape[-1], 1)
+    if n_dim == 2:
+        width = np.minimum(width, (y1 - y0) / max(bin_shape[0], 1))
+    keep = np.flatnonzero(width >= min_label_frac)
+    keep = keep[np.argsort(-width[keep], kind="stable")[:max_labels]]
+    for i in keep.tolist():
+        ax.text((x0[i] + x1[i]) / 2, (y0[i] + y1[i]) / 2, names[i], color="black", ha="center", va="center",
+                fontsize=12 if len(keep) < 20 else 8, clip_on=True)
+
     if n_dim == 1:
-        y = 0.5
-        for i, (alias, slc) in enumerate(slices.items()):
-            color = cmap(i % cmap.N)
-            x0 = slc[0].start
-            width = slc[0].stop - slc[0].start
-            rect = patches.Rectangle((x0, y-0.3), width, 0.6, facecolor=color, edgecolor="black")
-            ax.add_patch(rect)
-            ax.text(x0 + width/2, y, alias, color='black', ha='center', va='center', fontsize=12)
         ax.set_xlim(0, bin_shape[0])
         ax.set_ylim(0, 1)
         ax.set_yticks([])
         ax.set_xlabel("Index")
-
-    elif n_dim == 2:
-        for i, (alias, slc) in enumerate(slices.items()):
-            color = cmap(i % cmap.N)
-            x0, y0 = slc[1].start, slc[0].start
-            width = slc[1].stop - slc[1].start
-            height = slc[0].stop - slc[0].start
-            rect = patches.Rectangle((x0, y0), width, height, facecolor=color, edgecolor="black", alpha=0.7)
-            ax.add_patch(rect)
-            ax.text(x0 + width/2, y0 + height/2, alias, color='black', ha='center', va='center', fontsize=12)
+    else:
         ax.set_xlim(0, bin_shape[1])
-        ax.set_ylim(0, bin_shape[0])
+        ax.set_ylim(bin_shape[0], 0)
         ax.set_xlabel("X")
         ax.set_ylabel("Y")
-        ax.invert_yaxis()
-    else:
-        raise NotImplementedError("plot_slices only supports 1D and 2D slices at present.")
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    if path is not None:
+        fig.savefig(path)
+    if show:
+        import matplotlib.pyplot as plt
+        plt.show()
+    return fig
 
 
 # Example usage:
@@ -71,4 +147,3 @@ if __name__ == "__main__":
 
 # Now plot it:
     plot_slices(slices, bin_shape=bin_shape, title="Irregular MOSAIC", color_map="Spectral")
-
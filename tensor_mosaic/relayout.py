@@ -0,0 +1,94 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .backend import get_backend
+
+def _regions(layout) -> Tuple[Dict[str, Tuple[slice, ...]], Tuple[int, ...]]:
+    # Mosaic, Layout or (slices, shape)
+    if hasattr(layout, "bin_manager"):
+        if not layout.bin_manager._compiled:
+            layout.compile()
+        return layout.bin_manager.slices, layout.shape
+    if hasattr(layout, "regions") and hasattr(layout, "slices"):
+        return layout.slices, layout.shape
+    slices, shape = layout
+    return slices, tuple(shape)
+
+
+def _merge(src: np.ndarray, dst: np.ndarray, length: np.ndarray) -> List[Tuple[int, int, int]]:
+    """Coalesces (src, dst, length) runs that continue each other in both bins."""
+    keep = length > 0
+    src, dst, length = src[keep], dst[keep], length[keep]
+    order = np.argsort(dst, kind="stable")
+    src, dst, length = src[order], dst[order], length[order]
+    # a run starts a new block unless it picks up exactly where the previous one ended, in both bins
+    new = np.ones(len(dst), dtype=bool)
+    new[1:] = (src[1:] != src[:-1] + length[:-1]) | (dst[1:] != dst[:-1] + length[:-1])
+    heads = np.flatnonzero(new)
+    sizes = np.add.reduceat(length, heads) if len(heads) else length[:0]
+    return list(zip(src[heads].tolist(), dst[heads].tolist(), sizes.tolist()))
+
+
+class RelayoutPlan:
+    """
+    Copies that migrate a bin from one compiled 1d layout to another.
+    Regions are matched by name; a shrunk region keeps its leading elements, and the tail
+    of a grown region, new regions and holes get fill_value. Adjacent region moves are
+    merged into maximal block copies (in copies), so apply() issues one copy per block.
+    """
+    def __init__(self, old, new):
+        old_slices, self.old_shape = _regions(old)
+        new_slices, self.shape = _regions(new)
+        if len(self.old_shape) != 1 or len(self.shape) != 1:
+            raise NotImplementedError("Relayout plans currently support 1d layouts only.")
+        common = [k for k in new_slices if k in old_slices]
+        for k in common:
+            if (old_slices[k][0].step or 1) != 1 or (new_slices[k][0].step or 1) != 1:
+                raise NotImplementedError(f"Region '{k}' is strided; relayout needs contiguous regions.")
+        src = np.array([old_slices[k][0].start for k in common], dtype=np.int64)
+        dst = np.array([new_slices[k][0].start for k in common], dtype=np.int64)
+        old_len = np.array([old_slices[k][0].stop - old_slices[k][0].start for k in common], dtype=np.int64)
+        new_len = np.array([new_slices[k][0].stop - new_slices[k][0].start for k in common], dtype=np.int64)
+        self.copies: List[Tuple[int, int, int]] = _merge(src, dst, np.minimum(old_len, new_len))
+        self.added = [k for k in new_slices if k not in old_slices]
+        # new regions and the grown tails of resized ones; only written when apply() gets out=
+        grow = new_len > old_len
+        f_start = np.concatenate([[new_slices[k][0].start for k in self.added], (dst + old_len)[grow]]).astype(np.int64)
+        f_len = np.concatenate([[new_slices[k][0].stop - new_slices[k][0].start for k in self.added],
+                                (new_len - old_len)[grow]]).astype(np.int64)
+        self.fills: List[Tuple[int, int]] = [(d, n) for _, d, n in _merge(f_start, f_start, f_len)]
+        self.removed = [k for k in old_slices if k not in new_slices]
+        self.resized = {k: (int(a), int(b)) for k, a, b in zip(common, old_len, new_len) if a != b}
+        self.moved_elements = sum(n for s, d, n in self.copies if s != d)
+
+    @property
+    def num_copies(self) -> int:
+        return len(self.copies)
+
+    def __repr__(self):
+        return (f"RelayoutPlan({self.old_shape} -> {self.shape}, copies={self.num_copies}, added={len(self.added)}, "
+                f"removed={len(self.removed)}, resized={len(self.resized)})")
+
+    def apply(self, old_bin, backend: str = None, device=None, fill_value=0, out=None, chunk: Optional[int] = None):
+        """
+        Builds the new bin from old_bin. out may be a preallocated (e.g. memmapped) array that is
+        written in place; then only copied and filled regions are touched, while holes keep what
+        out held; it must not share memory with old_bin. chunk caps the elements moved per copy
+        call, so memmapped bins stream through bounded memory (defaults to 2**24 for np.memmap).
+        """
+        if backend is None:
+            backend = "torch" if type(old_bin).__module__.startswith("torch") else \
+                "jax" if type(old_bin).__module__.startswith("jax") else "numpy"
+        be = get_backend(backend, device)
+        if chunk is None and (isinstance(old_bin, np.memmap) or isinstance(out, np.memmap)):
+            chunk = 1 << 24
+        if out is None:
+            out = be.full(self.shape, fill_value, dtype=old_bin.dtype)
+        else:
+            for dst, n in self.fills:
+                out = be.index_put(out, slice(dst, dst + n), fill_value)
+        for src, dst, n in self.copies:
+            step = chunk or n
+            for off in range(0, n, step):
+                m = min(step, n - off)
+                out = be.index_put(out, slice(dst + off, dst + off + m), old_bin[src + off:src + off + m])
+        return out
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .slicemanager import BinManager
+
+class Shard:
+    """
+    One rank's contiguous piece [start, stop) of a 1d bin.
+    bin_manager holds the sub-layout in local coordinates; global_slices maps the same names
+    back to the parent bin (local = global - start).
+    """
+    def __init__(self, rank: int, start: int, stop: int, load: float,
+                 local_slices: Dict[str, Tuple[slice, ...]], global_slices: Dict[str, Tuple[slice, ...]]):
+        self.rank = rank
+        self.start = start
+        self.stop = stop
+        self.load = load
+        self.global_slices = global_slices
+        self.bin_manager = BinManager(dim=1)
+        self.bin_manager.slices = local_slices
+        self.bin_manager.shape = (stop - start,)
+        self.bin_manager._compiled = True
+
+    @property
+    def slices(self) -> Dict[str, Tuple[slice, ...]]:
+        return self.bin_manager.slices
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.bin_manager.shape
+
+    @property
+    def region(self) -> Tuple[slice, ...]:
+        return (slice(self.start, self.stop),)
+
+    def __repr__(self):
+        return f"Shard(rank={self.rank}, region=[{self.start}, {self.stop}), load={self.load}, regions={list(self.slices)})"
+
+
+def _weighted_position(t, starts, stops, cum_before, item):
+    # first region whose cumulative end reaches t, then step into it by whole elements
+    i = min(np.searchsorted(cum_before + (stops - starts) * item, t, side="left"), len(starts) - 1)
+    return int(min(stops[i], starts[i] + np.ceil((t - cum_before[i]) / item[i])))
+
+
+def shard_layout(slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...], num_shards: int,
+                 split: bool = True, itemsize: Optional[Dict[str, int]] = None) -> Tuple[List[Shard], float]:
+    """
+    Partitions a compiled 1d layout into num_shards contiguous ranges with near-equal load.
+    Load is the element count of each region, or its byte count when itemsize maps names to
+    bytes per element. With split=True regions are cut at shard boundaries; otherwise each
+    region is kept whole and boundaries snap to the nearest region edge.
+    Returns the shards and the imbalance (max load / mean load - 1).
+    """
+    if len(shape) != 1:
+        raise NotImplementedError("Sharding currently supports 1d layouts only.")
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be positive (got {num_shards})")
+    itemsize = itemsize or {}
+
+    names = sorted(slices, key=lambda k: slices[k][0].start)
+    starts = np.array([slices[k][0].start for k in names], dtype=np.int64)
+    stops = np.array([slices[k][0].stop for k in names], dtype=np.int64)
+    item = np.array([itemsize.get(k, 1) for k in names], dtype=np.float64)
+    weights = (stops - starts) * item
+    cum_before = np.concatenate([[0.0], np.cumsum(weights)[:-1]]) if len(names) else np.zeros(0)
+    total = float(weights.sum())
+    targets = total * np.arange(1, num_shards) / num_shards
+
+    # bin positions of the num_shards - 1 inner boundaries
+    if not len(names):
+        cuts = [0] * (num_shards - 1)
+    elif split:
+        cuts = [_weighted_position(t, starts, stops, cum_before, item) for t in targets]
+    else:
+        # snap every target to the closer region edge, keeping boundaries monotone
+        edges = np.append(cum_before, total)
+        j = np.clip(np.searchsorted(edges, targets), 1, len(edges) - 1)
+        j = np.where(targets - edges[j - 1] <= edges[j] - targets, j - 1, j)
+        j = np.maximum.accumulate(j) if len(j) else j
+        cuts = [int(starts[k]) if k < len(names) else int(shape[0]) for k in j]
+    bounds = [0] + cuts + [int(shape[0])]
+
+    shards = []
+    for rank in range(num_shards):
+        lo, hi = bounds[rank], max(bounds[rank], bounds[rank + 1])
+        # regions intersecting [lo, hi)
+        a = np.searchsorted(stops, lo, side="right")
+        b = np.searchsorted(starts, hi, side="left")
+        local, glob, load = {}, {}, 0.0
+        for k in range(a, b):
+            s, e = max(int(starts[k]), lo), min(int(stops[k]), hi)
+            if e <= s:
+                continue
+            glob[names[k]] = (slice(s, e),)
+            local[names[k]] = (slice(s - lo, e - lo),)
+            load += (e - s) * item[k]
+        shards.append(Shard(rank, lo, hi, load, local, glob))
+
+    mean = total / num_shards
+    imbalance = max(s.load for s in shards) / mean - 1.0 if mean else 0.0
+    return shards, imbalance
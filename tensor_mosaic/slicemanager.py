@@ -1,4 +1,95 @@
-from typing import Union, Tuple, Optional, Callable, Dict, Any
+import itertools
+from collections.abc import MutableMapping
+from typing import Union, Tuple, Optional, Callable, Dict, Any, List
+import numpy as np
+
+class SliceColumns(MutableMapping):
+    """
+    {name: tuple of slices} backed by columns (names, starts, stops) for packed 1d regions,
+    plus a plain dict for explicit regions. Slice tuples are built only when looked up.
+    """
+    def __init__(self, explicit: Dict[str, Tuple[slice, ...]], names: List[str], starts: np.ndarray, stops: np.ndarray):
+        self.explicit = dict(explicit)
+        self.names = names
+        self.starts = starts
+        self.stops = stops
+        self._rows = dict(zip(names, range(len(names))))
+
+    def __getitem__(self, name):
+        if name in self.explicit:
+            return self.explicit[name]
+        row = self._rows[name]
+        return (slice(int(self.starts[row]), int(self.stops[row])),)
+
+    def __setitem__(self, name, region):
+        self._rows.pop(name, None)
+        self.explicit[name] = region
+
+    def __delitem__(self, name):
+        if name in self.explicit:
+            del self.explicit[name]
+            self._rows.pop(name, None)
+        else:
+            del self._rows[name]
+
+    def __iter__(self):
+        yield from self.explicit
+        yield from (k for k in self._rows if k not in self.explicit)
+
+    def __len__(self):
+        return len(self.explicit) + sum(1 for k in self._rows if k not in self.explicit)
+
+    def __contains__(self, name):
+        return name in self.explicit or name in self._rows
+
+    def copy(self) -> "SliceColumns":
+        other = SliceColumns.__new__(SliceColumns)
+        other.explicit = dict(self.explicit)
+        other.names, other.starts, other.stops = self.names, self.starts, self.stops
+        other._rows = dict(self._rows)
+        return other
+
+    def columns(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """(names, starts, stops) for every 1d region, explicit ones first."""
+        ex = list(self.explicit)
+        if len(self._rows) == len(self.names) and not any(k in self._rows for k in ex):
+            # untouched since packing: the columns are used as they are
+            packed, rows = self.names, slice(None)
+        else:
+            packed = [k for k in self._rows if k not in self.explicit]
+            rows = np.fromiter((self._rows[k] for k in packed), dtype=np.int64, count=len(packed))
+        starts = np.concatenate([np.array([self.explicit[k][0].start for k in ex], dtype=np.int64), self.starts[rows]])
+        stops = np.concatenate([np.array([self.explicit[k][0].stop for k in ex], dtype=np.int64), self.stops[rows]])
+        return ex + packed, starts, stops
+
+    def __repr__(self):
+        return f"SliceColumns({len(self)} regions)"
+
+class Alias:
+    """
+    A name for elements [offset, offset + numel) of another region's storage, optionally
+    viewed with a shape (row-major) and an axis permutation. Takes no space of its own.
+    """
+    __slots__ = ("target", "offset", "shape", "perm")
+
+    def __init__(self, target: str, offset: int = 0, shape: Optional[Tuple[int, ...]] = None,
+                 perm: Optional[Tuple[int, ...]] = None):
+        if perm is not None and (shape is None or sorted(perm) != list(range(len(shape)))):
+            raise ValueError(f"perm {perm} must permute the axes of shape {shape}")
+        self.target = target
+        self.offset = offset
+        self.shape = tuple(shape) if shape is not None else None
+        self.perm = tuple(perm) if perm is not None else None
+
+    @property
+    def numel(self) -> Optional[int]:
+        return int(np.prod(self.shape, dtype=np.int64)) if self.shape is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"target": self.target, "offset": self.offset, "shape": self.shape, "perm": self.perm}
+
+    def __repr__(self):
+        return f"Alias(target={self.target!r}, offset={self.offset}, shape={self.shape}, perm={self.perm})"
 
 class BinManager:
     def __init__(self, dim: int):
@@ -7,6 +98,11 @@ class BinManager:
         self.shape: Optional[Tuple[int, ...]] = None
         self._compiled = False
         self.dim = dim
+        # placements of requests re-added since the last compile (see Mosaic.compile(stable=True))
+        self.displaced: Dict[str, Tuple[slice, ...]] = {}
+        # aliases never reach the packer; their storage regions are resolved after each compile
+        self.aliases: Dict[str, Alias] = {}
+        self.alias_slices: Dict[str, Tuple[slice, ...]] = {}
 
 
     def _as_shape(self, v) -> Tuple[int, ...]:
@@ -45,6 +141,7 @@ class BinManager:
         raise TypeError(f"Could not interpret region from {v}")
 
     def add(self, name: str, shape: Any = None, region: Any = None):
+        self.aliases.pop(name, None)
         if region is not None:
             region_tuple = self._as_region(region)
             self.slices[name] = region_tuple
@@ -52,13 +149,13 @@ class BinManager:
         elif shape is not None:
             shape_tuple = self._as_shape(shape)
             self.requests[name] = shape_tuple
-            self.slices.pop(name, None)
+            self._displace(name)
         else:
             raise ValueError("Either shape or region must be specified")
         self._compiled = False
 
     def __setattr__(self, name, value):
-        if name in {"requests", "slices", "shape", "_compiled", "dim"}:
+        if name in {"requests", "slices", "shape", "_compiled", "dim", "displaced", "aliases", "alias_slices"}:
             super().__setattr__(name, value)
         elif isinstance(value, slice) or (
             isinstance(value, (tuple, list)) and (
@@ -76,6 +173,8 @@ class BinManager:
     def __getitem__(self, name):
         if not self._compiled:
             raise RuntimeError("Call .compile(packer) first!")
+        if name in self.alias_slices:
+            return self.alias_slices[name]
         return self.slices[name]
 
     def __getattr__(self, name):
@@ -92,12 +191,105 @@ class BinManager:
         # For nice tab completion and inspection
         attrs = set(super().__dir__())
         attrs.update(self.slices.keys())
+        attrs.update(self.aliases.keys())
         return sorted(attrs)
 
+    def remove(self, name: str):
+        """Forgets a request, region or alias."""
+        found = [d.pop(name, None) is not None for d in (self.requests, self.slices, self.aliases)]
+        if not any(found):
+            raise KeyError(name)
+        self.displaced.pop(name, None)
+        self._compiled = False
+
+    def add_many(self, names, sizes):
+        """Registers many 1d shape requests at once (names and sizes aligned)."""
+        if self.dim != 1:
+            raise NotImplementedError("add_many currently supports dim=1 only.")
+        for name, size in zip(names, np.asarray(sizes).tolist()):
+            self.requests[name] = (size,)
+            self._displace(name)
+        self._compiled = False
+
+    def add_alias(self, name: str, target: str, shape: Optional[Tuple[int, ...]] = None, offset: int = 0,
+                  perm: Optional[Tuple[int, ...]] = None):
+        """Declares name as a view of target's storage (see Alias)."""
+        if self.dim != 1:
+            raise NotImplementedError("Aliases currently support dim=1 layouts only.")
+        if isinstance(shape, int):
+            shape = (shape,)
+        alias = Alias(target, offset=offset, shape=shape, perm=perm)
+        self.requests.pop(name, None)
+        self.slices.pop(name, None)
+        self.aliases[name] = alias
+        self._compiled = False
+
+    def _resolve_aliases(self):
+        resolved: Dict[str, Tuple[slice, ...]] = {}
+
+        def region(name, seen):
+            if name in resolved:
+                return resolved[name]
+            if name in self.slices:
+                return self.slices[name]
+            if name not in self.aliases:
+                raise KeyError(f"Alias target '{name}' is not a region of this layout")
+            if name in seen:
+                raise ValueError(f"Alias cycle through '{name}'")
+            alias = self.aliases[name]
+            (s,) = region(alias.target, seen | {name})
+            if (s.step or 1) != 1:
+                raise ValueError(f"Alias '{name}' targets strided region '{alias.target}'")
+            size = s.stop - s.start
+            numel = alias.numel if alias.shape is not None else size - alias.offset
+            if alias.offset < 0 or numel < 0 or alias.offset + numel > size:
+                raise ValueError(f"Alias '{name}' ({numel} elements at offset {alias.offset}) "
+                                 f"does not fit in '{alias.target}' ({size} elements)")
+            resolved[name] = (slice(s.start + alias.offset, s.start + alias.offset + numel),)
+            return resolved[name]
+
+        for name in self.aliases:
+            region(name, frozenset())
+        self.alias_slices = resolved
+
+    def _displace(self, name: str):
+        old = self.slices.pop(name, None)
+        if old is not None:
+            self.displaced[name] = old
+
+    def _static(self) -> Dict[str, Tuple[slice, ...]]:
+        # regions placed by an earlier compile are requests again, not static obstacles
+        if isinstance(self.slices, SliceColumns):
+            return {k: v for k, v in self.slices.explicit.items() if k not in self.requests}
+        return {k: v for k, v in self.slices.items() if k not in self.requests}
+
     def compile(self, packer: Callable):
-        allocs, shape = packer(self.requests, self.slices)
+        static = self._static()
+        if getattr(packer, "array_native", False):
+            self._compile_columns(packer, static)
+            return
+        allocs, shape = packer(self.requests, static)
+        self.displaced = {}
+        if isinstance(self.slices, SliceColumns):
+            self.slices = dict(static)
         self.slices.update(allocs)
         self.shape = shape
+        self._resolve_aliases()
+        self._compiled = True
+
+    def _compile_columns(self, packer: Callable, static: Dict[str, Tuple[slice, ...]]):
+        if self.dim != 1:
+            raise NotImplementedError("Array-native packers currently support dim=1 only.")
+        names = list(self.requests)
+        # 1d shapes are 1-tuples, so chaining them yields the sizes without a Python-level loop
+        sizes = np.fromiter(itertools.chain.from_iterable(self.requests.values()), dtype=np.int64, count=len(names))
+        s_starts = np.array([v[0].start for v in static.values()], dtype=np.int64)
+        s_stops = np.array([v[0].stop for v in static.values()], dtype=np.int64)
+        starts, size = packer(sizes, s_starts, s_stops)
+        self.displaced = {}
+        self.slices = SliceColumns(static, names, starts, starts + sizes)
+        self.shape = (size,)
+        self._resolve_aliases()
         self._compiled = True
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+from .slicemanager import SliceColumns
+
+class LayoutStats:
+    """
+    Occupancy summary of a compiled layout.
+    requested counts the elements of every region (overlaps counted twice, strided regions
+    by their elements); free space is the part of the bin covered by no region's extent.
+    Holes are maximal free runs of a 1d bin; for 2d and up only wasted area is reported.
+    """
+    def __init__(self, shape: Tuple[int, ...], regions: int, requested: int, occupied: int,
+                 hole_sizes: np.ndarray = None, slices: Dict[str, Tuple[slice, ...]] = None):
+        self.slices = slices  # kept so the stats can be plotted directly
+        self.shape = tuple(shape)
+        self.regions = regions
+        self.requested = requested
+        self.occupied = occupied
+        self.hole_sizes = hole_sizes
+
+    @property
+    def bin_size(self) -> int:
+        return int(np.prod(self.shape, dtype=np.int64)) if self.shape else 0
+
+    @property
+    def utilization(self) -> float:
+        """requested / bin_size; 1.0 for an empty bin."""
+        return self.requested / self.bin_size if self.bin_size else 1.0
+
+    @property
+    def wasted(self) -> int:
+        """Bin elements (area, for 2d) not covered by any region."""
+        return self.bin_size - self.occupied
+
+    @property
+    def holes(self) -> int:
+        return len(self.hole_sizes) if self.hole_sizes is not None else 0
+
+    @property
+    def largest_free(self) -> int:
+        if self.hole_sizes is None or not len(self.hole_sizes):
+            return 0
+        return int(self.hole_sizes.max())
+
+    @property
+    def fragmentation(self) -> float:
+        """1 - largest free block / total free space: 0 when all free space is one block."""
+        if self.hole_sizes is None or not self.wasted:
+            return 0.0
+        return 1.0 - self.largest_free / self.wasted
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = {
+            "shape": self.shape, "regions": self.regions, "requested": self.requested, "bin_size": self.bin_size,
+            "utilization": self.utilization, "wasted": self.wasted,
+        }
+        if self.hole_sizes is not None:
+            sizes = self.hole_sizes
+            d.update(holes=self.holes, largest_free=self.largest_free, fragmentation=self.fragmentation,
+                     hole_min=int(sizes.min()) if len(sizes) else 0,
+                     hole_median=float(np.median(sizes)) if len(sizes) else 0.0,
+                     hole_mean=float(sizes.mean()) if len(sizes) else 0.0)
+        return d
+
+    def __repr__(self):
+        extra = f", holes={self.holes}, largest_free={self.largest_free}" if self.hole_sizes is not None else ""
+        return (f"LayoutStats(shape={self.shape}, requested={self.requested}, "
+                f"utilization={self.utilization:.3f}, wasted={self.wasted}{extra})")
+
+
+def _columns_1d(slices) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # (starts, stops, element counts) without building slice objects where possible
+    if isinstance(slices, SliceColumns) and all((v[0].step or 1) == 1 for v in slices.explicit.values()):
+        _, starts, stops = slices.columns()
+        return starts, stops, stops - starts
+    regions = [v[0] for v in slices.values()]
+    starts = np.array([s.start for s in regions], dtype=np.int64)
+    stops = np.array([s.stop for s in regions], dtype=np.int64)
+    counts = np.array([len(range(s.start, s.stop, s.step or 1)) for s in regions], dtype=np.int64)
+    return starts, stops, counts
+
+
+def _stats_1d(slices, shape) -> LayoutStats:
+    starts, stops, counts = _columns_1d(slices)
+    size = int(shape[0])
+    if not len(starts):
+        holes = np.array([size], dtype=np.int64) if size else np.zeros(0, dtype=np.int64)
+        return LayoutStats(shape, 0, 0, 0, holes)
+    order = np.argsort(starts, kind="stable")
+    starts, stops = np.clip(starts[order], 0, size), np.clip(stops[order], 0, size)
+    # running end of everything to the left; a region starting past it opens a hole
+    reach = np.maximum.accumulate(stops)
+    prev = np.concatenate([[0], reach])
+    gaps = np.concatenate([starts, [size]]) - prev
+    holes = gaps[gaps > 0]
+    return LayoutStats(shape, len(order), int(counts.sum()), size - int(holes.sum()), holes)
+
+
+def _union_1d(lo: np.ndarray, hi: np.ndarray) -> int:
+    order = np.argsort(lo, kind="stable")
+    lo, hi = lo[order], hi[order]
+    reach = np.maximum.accumulate(hi)
+    # each interval adds what reaches past everything before it
+    prev = np.concatenate([[lo[0]], reach[:-1]])
+    return int(np.maximum(hi - np.maximum(lo, prev), 0).sum()) if len(lo) else 0
+
+
+def _union_2d(lo: np.ndarray, hi: np.ndarray) -> int:
+    """
+    Area of a union of boxes: sweeps axis 0 over box edges while a segment tree over the
+    compressed axis-1 edges keeps the length covered by the boxes currently crossed.
+    O(n log n) time, O(n) memory.
+    """
+    ys = np.unique(np.concatenate([lo[:, 1], hi[:, 1]]))
+    a = np.searchsorted(ys, lo[:, 1]).tolist()
+    b = np.searchsorted(ys, hi[:, 1]).tolist()
+    pre = [0] + np.cumsum(np.diff(ys)).tolist()  # covered length of cells [l, r) is pre[r] - pre[l]
+    m = len(ys) - 1
+    count = [0] * (4 * m)    # boxes covering a node's whole range (and not counted higher up)
+    covered = [0] * (4 * m)  # axis-1 length covered within a node's range
+
+    def update(node, l, r, qa, qb, delta):
+        if qb <= l or r <= qa:
+            return
+        if qa <= l and r <= qb:
+            count[node] += delta
+        else:
+            mid = (l + r) // 2
+            update(2 * node, l, mid, qa, qb, delta)
+            update(2 * node + 1, mid, r, qa, qb, delta)
+        if count[node]:
+            covered[node] = pre[r] - pre[l]
+        elif r - l == 1:
+            covered[node] = 0
+        else:
+            covered[node] = covered[2 * node] + covered[2 * node + 1]
+
+    xs = np.concatenate([lo[:, 0], hi[:, 0]])
+    order = np.argsort(xs, kind="stable").tolist()
+    xs = xs.tolist()
+    n = len(lo)
+    area, prev = 0, xs[order[0]]
+    for e in order:
+        area += covered[1] * (xs[e] - prev)
+        prev = xs[e]
+        k = e % n
+        update(1, 0, m, a[k], b[k], 1 if e < n else -1)
+    return area
+
+
+def _union_volume(lo: np.ndarray, hi: np.ndarray) -> int:
+    # boxes are non-empty; 3d and up sum (d-1)-dimensional unions over the slabs between axis-0 edges
+    if lo.shape[1] == 1:
+        return _union_1d(lo[:, 0], hi[:, 0])
+    if lo.shape[1] == 2:
+        return _union_2d(lo, hi)
+    xs = np.unique(np.concatenate([lo[:, 0], hi[:, 0]]))
+    total = 0
+    for x0, x1 in zip(xs[:-1].tolist(), xs[1:].tolist()):
+        crossed = (lo[:, 0] <= x0) & (hi[:, 0] >= x1)
+        if crossed.any():
+            total += (x1 - x0) * _union_volume(lo[crossed, 1:], hi[crossed, 1:])
+    return total
+
+
+def _stats_nd(slices, shape) -> LayoutStats:
+    regions = list(slices.values())
+    requested = sum(int(np.prod([len(range(s.start, s.stop, s.step or 1)) for s in r])) for r in regions)
+    if not regions:
+        return LayoutStats(shape, 0, 0, 0)
+    bounds = np.array([[(s.start, s.stop) for s in r] for r in regions], dtype=np.int64)  # (n, ndim, 2)
+    bounds = np.clip(bounds, 0, np.array(shape, dtype=np.int64)[None, :, None])
+    lo, hi = bounds[:, :, 0], bounds[:, :, 1]
+    live = np.all(hi > lo, axis=1)
+    occupied = _union_volume(lo[live], hi[live]) if live.any() else 0
+    return LayoutStats(shape, len(regions), requested, occupied)
+
+
+def layout_stats(slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...]) -> LayoutStats:
+    """Utilization and fragmentation of a compiled layout, from one sorted sweep over its regions."""
+    stats = _stats_1d(slices, shape) if len(shape) == 1 else _stats_nd(slices, shape)
+    stats.slices = slices
+    return stats
+
+
+# smallest index dtype each backend picks (Backend.index_dtype); jax needs jax_enable_x64 for int64
+_NARROWEST_INDEX = {"numpy": "int8", "torch": "int32", "jax": "int8"}
+
+
+def _itemsize(dtype) -> int:
+    name = str(dtype).rsplit(".", 1)[-1]
+    if name == "bfloat16":
+        return 2
+    return np.dtype(name).itemsize
+
+
+class MemoryPlan:
+    """
+    Byte footprint of a compiled layout on one backend, computed from the regions alone.
+    bin_bytes is what bin_tensor() allocates; index_bytes what the index cache holds once
+    every region has been looked up.
+    """
+    def __init__(self, names, counts: np.ndarray, shape: Tuple[int, ...], backend: str = "torch", dtype=None,
+                 index_numel: Optional[int] = None):
+        from .backend import _int_dtype_name
+        self.names = list(names)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.shape = tuple(shape)
+        self.backend = backend
+        self.dtype = str(dtype).rsplit(".", 1)[-1] if dtype is not None else "float32"
+        self.itemsize = _itemsize(self.dtype)
+        self.index_dtype = _int_dtype_name(max(self.shape, default=1), _NARROWEST_INDEX.get(backend, "int8"))
+        self.bin_bytes = int(np.prod(self.shape, dtype=np.int64)) * self.itemsize if self.shape else 0
+        # dense indices are (numel, ndim) per region; nested mosaics also index their dotted names
+        index_numel = int(self.counts.sum()) if index_numel is None else index_numel
+        self.index_bytes = index_numel * len(self.shape) * _itemsize(self.index_dtype)
+
+    @property
+    def requested_bytes(self) -> int:
+        return int(self.counts.sum()) * self.itemsize
+
+    @property
+    def region_bytes(self) -> Dict[str, int]:
+        return dict(zip(self.names, (self.counts * self.itemsize).tolist()))
+
+    @property
+    def total_bytes(self) -> int:
+        return self.bin_bytes + self.index_bytes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"backend": self.backend, "dtype": self.dtype, "shape": self.shape, "regions": len(self.names),
+                "bin_bytes": self.bin_bytes, "requested_bytes": self.requested_bytes,
+                "index_dtype": self.index_dtype, "index_bytes": self.index_bytes, "total_bytes": self.total_bytes}
+
+    def __repr__(self):
+        return (f"MemoryPlan(backend={self.backend!r}, dtype={self.dtype}, shape={self.shape}, "
+                f"bin_bytes={self.bin_bytes}, index_bytes={self.index_bytes} ({self.index_dtype}))")
+
+
+def memory_plan(slices: Dict[str, Tuple[slice, ...]], shape: Tuple[int, ...], backend: str = "torch",
+                dtype=None, index_numel: Optional[int] = None) -> MemoryPlan:
+    """MemoryPlan of a compiled layout; nothing backend-side is imported or allocated."""
+    if len(shape) == 1:
+        if isinstance(slices, SliceColumns) and all((v[0].step or 1) == 1 for v in slices.explicit.values()):
+            names = slices.columns()[0]
+        else:
+            names = list(slices)
+        counts = _columns_1d(slices)[2]
+    else:
+        names = list(slices)
+        counts = np.array([np.prod([len(range(s.start, s.stop, s.step or 1)) for s in slices[k]], dtype=np.int64)
+                           for k in names], dtype=np.int64)
+    return MemoryPlan(names, counts, shape, backend=backend, dtype=dtype, index_numel=index_numel)
@@ -0,0 +1,192 @@
+import bisect
+import heapq
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from .slicemanager import SliceColumns
+
+class OverlapError(ValueError):
+    """Raised by check_layout; .conflicts lists the overlapping name pairs, .out_of_bounds the bad regions."""
+    def __init__(self, conflicts: List[Tuple[str, str]], out_of_bounds: List[str], hint: Optional[str] = None):
+        self.conflicts = conflicts
+        self.out_of_bounds = out_of_bounds
+        parts = []
+        if conflicts:
+            shown = ", ".join(f"{a}/{b}" for a, b in conflicts[:10])
+            parts.append(f"{len(conflicts)} overlapping region pair(s): {shown}{' ...' if len(conflicts) > 10 else ''}")
+        if out_of_bounds:
+            shown = ", ".join(out_of_bounds[:10])
+            parts.append(f"{len(out_of_bounds)} region(s) out of bounds: {shown}{' ...' if len(out_of_bounds) > 10 else ''}")
+        if hint:
+            parts.append(hint)
+        super().__init__("; ".join(parts))
+
+
+def _bounds(slices) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """(names, starts, stops, steps) as (n, ndim) arrays."""
+    if isinstance(slices, SliceColumns) and all((v[0].step or 1) == 1 for v in slices.explicit.values()):
+        names, starts, stops = slices.columns()
+        return names, starts[:, None], stops[:, None], np.ones((len(names), 1), dtype=np.int64)
+    names = list(slices)
+    ndim = len(next(iter(slices.values()))) if names else 1
+    if ndim == 1:
+        # one fromiter per field is several times faster than a nested-list array for 1e5 regions
+        regions = [v[0] for v in slices.values()]
+        starts = np.fromiter((r.start for r in regions), dtype=np.int64, count=len(regions))
+        stops = np.fromiter((r.stop for r in regions), dtype=np.int64, count=len(regions))
+        steps = np.fromiter((r.step or 1 for r in regions), dtype=np.int64, count=len(regions))
+        return names, starts[:, None], stops[:, None], steps[:, None]
+    b = np.array([[(s.start, s.stop, s.step or 1) for s in slices[k]] for k in names], dtype=np.int64)
+    b = b.reshape(len(names), ndim, 3)
+    return names, b[:, :, 0], b[:, :, 1], b[:, :, 2]
+
+
+def _strided_disjoint(a: Tuple[int, int, int], b: Tuple[int, int, int]) -> bool:
+    # exact test for extents that overlap but may interleave
+    lo, hi = max(a[0], b[0]), min(a[1], b[1])
+    first = np.arange(a[0] + -(-(lo - a[0]) // a[2]) * a[2], hi, a[2])
+    second = np.arange(b[0] + -(-(lo - b[0]) // b[2]) * b[2], hi, b[2])
+    return not len(np.intersect1d(first, second, assume_unique=True))
+
+
+def find_overlaps(slices: Dict[str, Tuple[slice, ...]]) -> List[Tuple[str, str]]:
+    """
+    All pairs of regions sharing an element, found by a sort-and-sweep over the first axis.
+    A region overlaps an earlier one (by start) exactly when it starts before the running
+    maximum of earlier stops, so a layout without conflicts costs one argsort. For 2d and up
+    the sweep keeps the regions open on axis 0 ordered by axis-1 start and tests each region
+    only against those it meets on axis 1 (see _disjoint_sweep and _sweep).
+    Empty regions never conflict; strided regions are compared element-exactly.
+    """
+    return _overlaps(*_bounds(slices))
+
+
+def _overlaps(names, starts, stops, steps) -> List[Tuple[str, str]]:
+    if not names:
+        return []
+    live = np.all(stops > starts, axis=1)
+    order = np.flatnonzero(live)[np.argsort(starts[live, 0], kind="stable")]
+    s0, e0 = starts[order, 0], stops[order, 0]
+    reach = np.maximum.accumulate(e0)
+    suspects = np.flatnonzero(s0[1:] < reach[:-1]) + 1
+    if not len(suspects):
+        return []
+    if starts.shape[1] == 1:
+        # earlier regions (by start) still open at each suspect's start
+        found = [(jj, i) for i in suspects.tolist() for jj in np.flatnonzero(e0[:i] > s0[i]).tolist()]
+    elif _disjoint_sweep(order, starts, stops):
+        return []
+    else:
+        found = _sweep(order, starts, stops)
+    pairs = []
+    for jj, i in found:
+        p, q = order[jj], order[i]
+        if starts.shape[1] > 2 and not np.all((starts[p, 2:] < stops[q, 2:]) & (starts[q, 2:] < stops[p, 2:])):
+            continue
+        if (steps[p] != 1).any() or (steps[q] != 1).any():
+            ranges = zip(zip(starts[p], stops[p], steps[p]), zip(starts[q], stops[q], steps[q]))
+            if any(_strided_disjoint(a, b) for a, b in ranges):
+                continue
+        pairs.append((names[p], names[q]))
+    return pairs
+
+
+def _disjoint_sweep(order, starts, stops) -> bool:
+    """
+    True if no two regions meet on both axes 0 and 1, which proves the layout conflict-free.
+    While that holds, the regions open on axis 0 are disjoint on axis 1, so sorted by axis-1
+    start they are sorted by stop too and a new region only has to be compared with its two
+    neighbours. Stops at the first region that meets one (then _sweep lists the pairs).
+    """
+    s0, e0 = starts[order, 0].tolist(), stops[order, 0].tolist()
+    s1, e1 = starts[order, 1].tolist(), stops[order, 1].tolist()
+    by_start: List[Tuple[int, int]] = []
+    closing: List[Tuple[int, int]] = []
+    for i in range(len(s0)):
+        while closing and closing[0][0] <= s0[i]:
+            j = heapq.heappop(closing)[1]
+            del by_start[bisect.bisect_left(by_start, (s1[j], j))]
+        pos = bisect.bisect_left(by_start, (s1[i], i))
+        if (pos and e1[by_start[pos - 1][1]] > s1[i]) or (pos < len(by_start) and by_start[pos][0] < e1[i]):
+            return False
+        by_start.insert(pos, (s1[i], i))
+        heapq.heappush(closing, (e0[i], i))
+    return True
+
+
+def _sweep(order, starts, stops) -> List[Tuple[int, int]]:
+    """
+    Positions (j, i) in order, j < i, of regions overlapping on axes 0 and 1.
+    Sweeps axis 0, keeping the regions open there in a segment tree over the compressed
+    axis-1 edges (to find those containing a point) and in a list sorted by axis-1 start (to
+    find those starting inside a range). Each region is then tested only against the open
+    regions it meets on axis 1: O((n + pairs) log n).
+    """
+    s0, e0 = starts[order, 0].tolist(), stops[order, 0].tolist()
+    edges = np.unique(np.concatenate([starts[order, 1], stops[order, 1]]))
+    s1, e1 = starts[order, 1].tolist(), stops[order, 1].tolist()
+    lo = np.searchsorted(edges, starts[order, 1]).tolist()
+    hi = np.searchsorted(edges, stops[order, 1]).tolist()
+    size = 1 << len(edges).bit_length()
+    tree: List[Optional[set]] = [None] * (2 * size)  # node -> open regions covering all its axis-1 cells
+    by_start: List[Tuple[int, int]] = []             # open regions as (axis-1 start, position), sorted
+    closing: List[Tuple[int, int]] = []              # heap of (axis-0 stop, position)
+
+    def nodes(a, b):
+        # canonical nodes covering leaves [a, b)
+        a, b = a + size, b + size
+        while a < b:
+            if a & 1:
+                yield a
+                a += 1
+            if b & 1:
+                b -= 1
+                yield b
+            a, b = a >> 1, b >> 1
+
+    found = []
+    for i in range(len(s0)):
+        while closing and closing[0][0] <= s0[i]:
+            _, j = heapq.heappop(closing)
+            for node in nodes(lo[j], hi[j]):
+                tree[node].discard(j)
+            del by_start[bisect.bisect_left(by_start, (s1[j], j))]
+        # open regions containing this one's axis-1 start ...
+        node = lo[i] + size
+        while node:
+            if tree[node]:
+                found.extend((j, i) for j in tree[node])
+            node >>= 1
+        # ... and those starting strictly inside its axis-1 range
+        a = bisect.bisect_right(by_start, (s1[i], len(s0)))
+        b = bisect.bisect_left(by_start, (e1[i], -1))
+        found.extend((j, i) for _, j in by_start[a:b])
+        for node in nodes(lo[i], hi[i]):
+            if tree[node] is None:
+                tree[node] = set()
+            tree[node].add(i)
+        bisect.insort(by_start, (s1[i], i))
+        heapq.heappush(closing, (e0[i], i))
+    return sorted(found, key=lambda ji: (ji[1], ji[0]))
+
+
+def out_of_bounds(slices: Dict[str, Tuple[slice, ...]], shape: Optional[Tuple[int, ...]] = None) -> List[str]:
+    """Names of regions with a negative start, stop < start or (given shape) a stop past the bin."""
+    return _out_of_bounds(*_bounds(slices), shape)
+
+
+def _out_of_bounds(names, starts, stops, steps, shape) -> List[str]:
+    if not names:
+        return []
+    bad = np.any((starts < 0) | (stops < starts), axis=1)
+    if shape is not None:
+        bad |= np.any(stops > np.asarray(shape, dtype=np.int64)[None, :stops.shape[1]], axis=1)
+    return [names[i] for i in np.flatnonzero(bad).tolist()]
+
+
+def check_layout(slices: Dict[str, Tuple[slice, ...]], shape: Optional[Tuple[int, ...]] = None):
+    """Raises OverlapError listing every overlapping pair and out-of-bounds region."""
+    bounds = _bounds(slices)
+    conflicts = _overlaps(*bounds)
+    bad = _out_of_bounds(*bounds, shape)
+    if conflicts or bad:
+        raise OverlapError(conflicts, bad)
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+import torch
+from tensor_mosaic import Mosaic
+
+
+def make(backend="numpy", **kwargs):
+    m = Mosaic(dim=1, backend=backend, autocompile=False, **kwargs)
+    m.embed = 12
+    m.other = 5
+    m.alias("lm_head", "embed")
+    m.alias("embed_t", "embed", shape=(3, 4), perm=(1, 0))
+    m.alias("row1", "embed", shape=(4,), offset=4)
+    m.compile()
+    return m
+
+
+def test_aliases_share_storage_and_take_no_space():
+    m = make()
+    assert m.shape == (17,)
+    assert m["lm_head"] == m["embed"]
+    x = m.bin_tensor()
+    m.slice_view(x, "embed")[:] = np.arange(12)
+    assert np.array_equal(m.slice_view(x, "embed_t"), np.arange(12).reshape(3, 4).T)
+    assert np.array_equal(m.slice_view(x, "row1"), [4, 5, 6, 7])
+    m.slice_view(x, "row1")[0] = -1  # writes go through to the shared storage
+    assert m.slice_view(x, "lm_head")[4] == -1
+    assert set(m.unpack(x)) == {"embed", "other", "lm_head", "embed_t", "row1"}
+
+
+def test_alias_indices_follow_view_order():
+    m = make("torch")
+    x = m.bin_tensor()
+    x[m["embed"]] = torch.arange(12.0)
+    for name in ("embed_t", "row1", "lm_head"):
+        assert torch.equal(x[m.indices[name]], m.slice_view(x, name).reshape(-1))
+    assert m.plan().index_bytes == sum(m.indices[k].nbytes for k in ("embed", "other", "lm_head", "embed_t", "row1"))
+
+
+def test_alias_errors_and_serialization(tmp_path):
+    m = make()
+    path = str(tmp_path / "recipe.json")
+    m.save_allocations(path)
+    again = Mosaic.load_allocations(path, dim=1, backend="numpy")
+    assert again["embed_t"] == m["embed_t"] and again.bin_manager.aliases["embed_t"].perm == (1, 0)
+
+    bad = Mosaic(dim=1, backend="numpy", autocompile=False)
+    bad.a = 4
+    bad.alias("b", "a", shape=(5,))
+    with pytest.raises(ValueError):
+        bad.compile()
+    bad.alias("b", "missing")
+    with pytest.raises(KeyError):
+        bad.compile()
+    with pytest.raises(ValueError):
+        bad.alias("c", "a", shape=(2, 2), perm=(0, 0))
+
+
+def test_aliases_inside_children_keep_their_view():
+    child = Mosaic(dim=1, backend="torch", autocompile=False)
+    child.w = 6
+    child.alias("wt", "w", shape=(2, 3), perm=(1, 0))
+    parent = Mosaic(dim=1, backend="torch", autocompile=False)
+    parent.head = 4
+    parent.c = child
+    parent.compile()
+    x = parent.bin_tensor()
+    x[parent["c.w"]] = torch.arange(6.0)
+    assert parent["c.wt"] == parent["c.w"]
+    assert torch.equal(parent.slice_view(x, "c.wt"), torch.arange(6.0).reshape(2, 3).T)
+    assert torch.equal(x[parent.indices["c.wt"]], parent.slice_view(x, "c.wt").reshape(-1))
+
+
+def test_layout_pack_and_nn_modules_understand_aliases():
+    from tensor_mosaic.nn import Unpack
+    m = Mosaic(dim=1, backend="torch", autocompile=False)
+    m.w = 6
+    m.b = 2
+    m.alias("wt", "w", shape=(2, 3), perm=(1, 0))
+    m.compile()
+    layout = m.layout()
+    assert layout["wt"] == m["wt"] and "wt" in layout and layout.names == ("w", "b")
+    wt = torch.arange(6.0).reshape(2, 3).T
+    x = m.pack({"wt": wt, "b": torch.ones(2)})
+    assert torch.equal(x[m["w"]], torch.arange(6.0))
+    assert torch.equal(layout.unpack(x)["wt"], wt)
+    out = Unpack(m)(torch.stack([x, 2 * x]))  # leading batch dim
+    assert torch.equal(out["wt"][1], 2 * wt) and set(out) == {"w", "b", "wt"}
+
+
+def test_autocompile_rejects_unknown_target_without_side_effects():
+    m = Mosaic(dim=1, backend="numpy")
+    m.a = 4
+    with pytest.raises(KeyError):
+        m.alias("b", "later")
+    assert "b" not in m.bin_manager.aliases and len(m._allocation_recipe) == 1
+    assert m.bin_manager._compiled and m["a"] == (slice(0, 4),)
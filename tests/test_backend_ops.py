@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from tensor_mosaic import Mosaic
+from tensor_mosaic.backend import get_backend
+
+@pytest.fixture(params=["numpy", "torch", "jax"])
+def backend(request):
+    pytest.importorskip(request.param)
+    return get_backend(request.param)
+
+def as_list(x):
+    return np.asarray(x).tolist()
+
+def test_empty_and_concatenate(backend):
+    x = backend.empty((3,))
+    assert tuple(x.shape) == (3,)
+    y = backend.concatenate([backend.asarray([1, 2]), backend.asarray([3])])
+    assert as_list(y) == [1, 2, 3]
+
+def test_take_and_scatter(backend):
+    x = backend.asarray([[0, 1], [2, 3], [4, 5]])
+    idx = backend.asarray([2, 0])
+    assert as_list(backend.take(x, idx)) == [[4, 5], [0, 1]]
+    z = backend.full((2, 3), 0, dtype=x.dtype)
+    z = backend.scatter(z, idx[1:], backend.asarray([[7], [8]]), axis=1)
+    assert as_list(z) == [[7, 0, 0], [8, 0, 0]]
+
+@pytest.mark.parametrize("name", ["numpy", "torch", "jax"])
+def test_scatter_with_cached_indices(name):
+    pytest.importorskip(name)
+    m = Mosaic(dim=1, backend=name)
+    m.A = 2
+    m.B = 3
+    x = m.bin_tensor(fill_value=0)
+    x = m.backend.scatter(x, m.indices["B"], m.backend.full((3,), 1, dtype=x.dtype))
+    assert as_list(x) == [0, 0, 1, 1, 1]
+
+def test_index_put_accumulates_duplicates(backend):
+    x = backend.full((4,), 0, dtype=backend.asarray([1]).dtype)
+    x = backend.index_put(x, backend.asarray([1, 1, 3]), backend.asarray([1, 2, 5]), accumulate=True)
+    assert as_list(x) == [0, 3, 0, 5]
+    x = backend.index_put(x, slice(0, 2), backend.asarray([9, 9]))
+    assert as_list(x) == [9, 9, 0, 5]
+
+def test_reshape_view(backend):
+    x = backend.asarray([0, 1, 2, 3, 4, 5])
+    assert as_list(backend.reshape_view(x, (2, 3))) == [[0, 1, 2], [3, 4, 5]]
+
+def test_reshape_view_refuses_copy():
+    be = get_backend("numpy")
+    x = np.arange(12).reshape(3, 4)[:, :2]
+    with pytest.raises((ValueError, AttributeError)):
+        be.reshape_view(x, (6,))
+
+def test_segment_sum(backend):
+    data = backend.asarray([1.0, 2.0, 3.0, 4.0])
+    out = backend.segment_sum(data, backend.asarray([0, 2, 0, 2]), 3)
+    assert as_list(out) == [4.0, 0.0, 6.0]
+
+@pytest.mark.parametrize("name", ["numpy", "torch", "jax"])
+def test_mosaic_pack_unpack(name):
+    pytest.importorskip(name)
+    m = Mosaic(dim=1, backend=name)
+    m.A = 2
+    m.B = 3
+    values = {"A": np.array([1.0, 2.0], dtype=np.float32), "B": np.array([3.0, 4.0, 5.0], dtype=np.float32)}
+    x = m.pack(values)
+    assert as_list(x) == [1.0, 2.0, 3.0, 4.0, 5.0]
+    parts = m.unpack(x)
+    assert as_list(parts["B"]) == [3.0, 4.0, 5.0]
+    # partial pack leaves the rest at fill_value
+    y = m.pack({"B": values["B"]}, fill_value=-1)
+    assert as_list(y) == [-1.0, -1.0, 3.0, 4.0, 5.0]
+
+def test_bin_tensor_uninitialized():
+    m = Mosaic(dim=1, backend="numpy")
+    m.A = 4
+    assert m.bin_tensor(fill_value=None).shape == (4,)
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_benchmark_suite_smoke(tmp_path):
+    out = tmp_path / "rows.json"
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "benchmarks", "suite.py"),
+         "--sizes", "10", "--repeat", "1", "--backends", "numpy", "--json", str(out)],
+        capture_output=True, text=True, env=env, timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr
+    import json
+    rows = json.loads(out.read_text())
+    assert {r["case"] for r in rows} == {"packer", "compile", "access"}
+    assert all(r["best_s"] >= 0 and r["peak_bytes"] >= 0 for r in rows)
+    assert all(0 < r["utilization"] <= 1.0 for r in rows if "utilization" in r)
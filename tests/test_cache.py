@@ -0,0 +1,165 @@
+import os
+import pytest
+import torch
+from tensor_mosaic.cache import SpaceCache
+
+
+def test_budget_evicts_least_recently_used():
+    sc = SpaceCache(max_bytes=3 * 400)
+    for name in "abc":
+        sc[name] = torch.zeros(100)
+    sc.a  # a becomes most recent
+    sc.d = torch.zeros(100)
+    assert "b" not in sc and {"a", "c", "d"} <= set(sc.keys())
+    assert sc.nbytes <= 1200
+    with pytest.raises(AttributeError):
+        sc.b
+    assert sc.stats()["evictions"] == 1 and sc.stats()["misses"] == 1 and sc.stats()["hits"] == 1
+
+
+def test_spill_and_memmapped_reload(tmp_path):
+    sc = SpaceCache(max_bytes=400, spill_dir=str(tmp_path))
+    sc.a = torch.arange(100, dtype=torch.float32)
+    sc.b = torch.ones(100)
+    assert "a" in sc and len(os.listdir(tmp_path)) == 1
+    assert torch.equal(sc.a, torch.arange(100, dtype=torch.float32))
+    st = sc.stats()
+    assert st["spills"] == 2 and st["reloads"] == 1 and st["resident"] == 1 and st["spilled"] == 2
+    # b is evicted again without rewriting its file
+    sc.b
+    assert sc.stats()["spills"] == 2
+    sc.a = torch.zeros(3)  # replacing an entry drops its stale spill file
+    assert sc.stats()["spilled"] == 1
+    del sc["b"]
+    assert os.listdir(tmp_path) == []
+
+
+def test_modified_reload_is_spilled_again(tmp_path):
+    sc = SpaceCache(max_bytes=400, spill_dir=str(tmp_path))
+    sc.a = torch.zeros(100)
+    sc.b = torch.zeros(100)  # spills a
+    sc.a.add_(5)             # reloads a (spilling b), then writes in place
+    sc.b                     # evicts a again
+    assert torch.equal(sc.a, torch.full((100,), 5.0))
+    assert sc.stats()["spills"] == 3 and len(os.listdir(tmp_path)) == 2
+
+
+def test_unbounded_cache_keeps_everything():
+    sc = SpaceCache()
+    for i in range(10):
+        sc[f"x{i}"] = [i] * 10
+    assert len(sc) == 10 and sc.stats()["evictions"] == 0
+    assert dict(sc.items())["x3"].tolist() == [3] * 10
+
+
+def test_dedup_shares_storage_until_last_name_goes():
+    sc = SpaceCache(dedup=True)
+    sc.grid_a = torch.arange(1000)
+    sc.grid_b = torch.arange(1000)
+    sc.other = torch.arange(1000, dtype=torch.int32)  # same values, different dtype
+    assert sc.grid_a is sc.grid_b and sc.other is not sc.grid_a
+    assert sc.nbytes == 8000 + 4000
+    report = sc.dedup_report()
+    assert report["names"] == 3 and report["unique"] == 2 and report["saved_bytes"] == 8000
+    del sc["grid_a"]
+    assert sc.nbytes == 12000 and torch.equal(sc.grid_b, torch.arange(1000))
+    del sc["grid_b"]
+    assert sc.nbytes == 4000 and sc.dedup_report()["saved_bytes"] == 0
+
+
+def test_dedup_with_budget_spills_shared_content_once(tmp_path):
+    sc = SpaceCache(max_bytes=800, spill_dir=str(tmp_path), dedup=True)
+    sc.a = torch.ones(100)
+    sc.b = torch.ones(100)
+    sc.c = torch.zeros(200)  # evicts a and b; their shared tensor is written once
+    assert len(os.listdir(tmp_path)) == 1 and sc.stats()["spills"] == 1
+    assert torch.equal(sc.a, torch.ones(100)) and torch.equal(sc.b, torch.ones(100))
+    sc.a = torch.zeros(200)  # a now shares c's content
+    assert sc.dedup_report()["unique"] == 2
+
+
+def test_dedup_does_not_share_content_modified_in_place(tmp_path):
+    sc = SpaceCache(dedup=True)
+    sc.a = torch.ones(4)
+    sc.a.add_(1)
+    sc.b = torch.ones(4)
+    assert torch.equal(sc.b, torch.ones(4)) and torch.equal(sc.a, torch.full((4,), 2.0))
+    sc.c = torch.ones(4)  # the new tensor took over the content key
+    assert sc.c is sc.b and sc.dedup_report()["unique"] == 2
+
+    sc = SpaceCache(max_bytes=400, spill_dir=str(tmp_path), dedup=True)
+    sc.a = torch.ones(100)
+    sc.a.add_(1)
+    sc.z = torch.zeros(100)  # a is spilled with its modified content
+    sc.b = torch.ones(100)
+    assert torch.equal(sc.b, torch.ones(100)) and torch.equal(sc.a, torch.full((100,), 2.0))
+
+
+def test_arena_views_share_one_buffer_per_dtype():
+    sc = SpaceCache(arena=True)
+    sc.a = torch.arange(6).reshape(2, 3)
+    sc.b = torch.ones(4)
+    sc.c = torch.arange(3)
+    index = sc.index()
+    assert index["a"] == ("torch.int64", 0, 6, (2, 3)) and index["c"][1:3] == (6, 9)
+    assert sc.a.untyped_storage().data_ptr() == sc.c.untyped_storage().data_ptr()
+    sc.a[0, 0] = 7  # views write through to the arena
+    assert sc.a[0, 0] == 7
+    del sc["a"]
+    sc.compact()
+    assert sc.index()["c"] == ("torch.int64", 0, 3, (3,)) and torch.equal(sc.c, torch.arange(3))
+
+
+def test_arena_bulk_ops_issue_one_call_per_dtype(monkeypatch, tmp_path):
+    dict_cache, arena_cache = SpaceCache(), SpaceCache(arena=True)
+    for i in range(2000):
+        dict_cache[f"x{i}"] = arena_cache[f"x{i}"] = torch.full((4,), float(i))
+    calls = []
+    to = torch.Tensor.to
+    monkeypatch.setattr(torch.Tensor, "to", lambda self, *a, **k: calls.append(1) or to(self, *a, **k))
+    arena_cache.to("cpu")
+    assert len(calls) == 1
+    calls.clear()
+    dict_cache.to("cpu")
+    assert len(calls) == 2000
+    monkeypatch.undo()
+
+    path = str(tmp_path / "arena.pt")
+    arena_cache.save(path)
+    loaded = SpaceCache.load(path)
+    assert loaded.arena and torch.equal(loaded.x1234, torch.full((4,), 1234.0))
+    copy = arena_cache.clone()
+    copy.x0[:] = -1
+    assert torch.equal(arena_cache.x0, torch.zeros(4))
+
+
+def test_load_and_clone_keep_options(tmp_path):
+    sc = SpaceCache(arena=True)
+    sc.a = torch.arange(3)
+    path = str(tmp_path / "arena.pt")
+    sc.save(path)
+    assert SpaceCache.load(path, arena=False).arena  # the file decides the mode
+
+    spill = tmp_path / "spill"
+    sc = SpaceCache(max_bytes=400, spill_dir=str(spill))
+    sc.a = torch.zeros(100)
+    sc.b = torch.ones(100)
+    copy = sc.clone()
+    assert copy.spill_dir == str(spill) and copy.stats()["spills"] == 1
+    del copy["a"], copy["b"]  # the clone's files are its own
+    assert torch.equal(sc.a, torch.zeros(100)) and torch.equal(sc.b, torch.ones(100))
+
+
+def test_arena_compacts_after_many_removals():
+    sc = SpaceCache(arena=True)
+    for i in range(600):
+        sc[f"x{i}"] = torch.full((4,), float(i))
+    for i in range(0, 600, 3):
+        sc[f"x{i}"] = torch.zeros(8)  # resized: moved to the end, leaving a hole
+    for i in range(0, 600, 3):
+        del sc[f"x{i}"]
+    arena = sc._arenas[torch.float32]
+    assert arena.end < 600 * 4 + 200 * 8  # compacted on its own once half the buffer was dead
+    sc.compact()
+    assert arena.end == 400 * 4 and arena.live == 400 * 4
+    assert torch.equal(sc.x599, torch.full((4,), 599.0)) and sc.index()["x1"][1:3] == (0, 4)
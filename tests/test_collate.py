@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from tensor_mosaic.packers import multi_bin_packer
+from tensor_mosaic import pack_sequences
+
+@pytest.mark.parametrize("strategy", ["ffd", "bfd"])
+def test_multi_bin_packer_no_overlap(strategy):
+    reqs = {"a": (6,), "b": (5,), "c": (4,), "d": (3,), "e": (2,)}
+    alloc, shape = multi_bin_packer(reqs, capacity=10, strategy=strategy)
+    assert list(alloc) == list(reqs)
+    assert shape == (2, 10)
+    used = np.zeros(shape, dtype=int)
+    for k, (bin_id, (s,)) in alloc.items():
+        assert s.stop - s.start == reqs[k][0]
+        used[bin_id, s] += 1
+    assert used.max() == 1
+    assert used.sum() == 20
+
+def test_multi_bin_packer_best_fit_picks_tightest_bin():
+    reqs = {"a": (7,), "b": (5,), "c": (3,)}
+    alloc, shape = multi_bin_packer(reqs, capacity=10, strategy="bfd")
+    # "c" fits both bins; best-fit puts it in the fuller one
+    assert alloc["c"][0] == alloc["a"][0]
+    assert shape == (2, 10)
+
+def test_multi_bin_packer_rejects_oversized():
+    with pytest.raises(ValueError):
+        multi_bin_packer({"a": (11,)}, capacity=10)
+
+def test_pack_sequences_numpy():
+    arrays = [np.arange(1, 4), np.arange(1, 6), np.arange(1, 3)]
+    batch, seg, pos, placements = pack_sequences(arrays, capacity=6, backend="numpy", pad_value=-1)
+    assert batch.shape == (2, 6)
+    assert seg.shape == pos.shape == (2, 6)
+    for i, x in enumerate(arrays):
+        bin_id, (s,) = placements[i]
+        assert np.array_equal(batch[bin_id, s], x)
+        assert np.array_equal(pos[bin_id, s], np.arange(len(x)))
+        assert len(set(seg[bin_id, s].tolist())) == 1
+    assert np.all(batch[seg == 0] == -1)
+    assert np.all(pos[seg == 0] == 0)
+
+def test_pack_sequences_feature_dims():
+    arrays = [np.ones((2, 3)), np.ones((3, 3))]
+    batch, seg, _, _ = pack_sequences(arrays, capacity=5, backend="numpy")
+    assert batch.shape == (1, 5, 3)
+    assert seg.tolist() == [[1, 1, 1, 2, 2]]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import torch
+
+from tensor_mosaic import Mosaic
+
+def make_mosaic(backend):
+    m = Mosaic(dim=1, backend=backend)
+    m.A = 4
+    m.B = 3
+    return m
+
+def test_numpy_to_torch_is_zero_copy():
+    m = make_mosaic("numpy")
+    x = m.bin_tensor()
+    t = m.convert(x, to="torch")
+    assert isinstance(t, torch.Tensor)
+    t[m.A] = 5
+    assert np.all(x[m.A] == 5)
+
+def test_torch_to_numpy_is_zero_copy():
+    m = make_mosaic("torch")
+    x = m.bin_tensor()
+    a = m.convert(x, to="numpy")
+    a[m.B] = 7
+    assert torch.all(x[m.B] == 7)
+
+def test_convert_falls_back_to_copy():
+    m = make_mosaic("torch")
+    x = m.bin_tensor().requires_grad_()
+    a = m.convert(x, to="numpy")
+    assert isinstance(a, np.ndarray) and a.shape == m.shape
+    b = m.convert(m.bin_tensor(dtype=torch.bfloat16, fill_value=2), to="numpy")
+    assert np.all(b == 2)
+
+def test_to_backend_reuses_layout():
+    m = make_mosaic("numpy")
+    t = m.to_backend("torch")
+    assert t.backend_name == "torch"
+    assert t.slices == m.slices and t.shape == m.shape
+    assert isinstance(t.indices["A"], torch.Tensor)
+    assert t.indices["A"].tolist() == m.indices["A"].tolist()
+    x = t.bin_tensor()
+    assert t.slice_view(x, "B").shape == (3,)
+    ids, offsets = t.locate([0, 5])
+    assert [t.region_names[i] for i in ids.tolist()] == ["A", "B"] and offsets.tolist() == [0, 1]
+
+def test_convert_to_jax():
+    pytest.importorskip("jax")
+    m = make_mosaic("numpy")
+    y = m.convert(m.bin_tensor(fill_value=3), to="jax")
+    assert y.shape == m.shape
+    assert float(y[m.A].sum()) == 12.0
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+
+HEAVY = ("torch", "jax", "matplotlib")
+
+def imported_modules(statement):
+    """Runs statement under `python -X importtime` and returns {module: cumulative_us}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+def test_import_skips_heavy_dependencies():
+    modules = imported_modules("import tensor_mosaic; from tensor_mosaic import Mosaic")
+    assert "tensor_mosaic" in modules
+    heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY)
+    assert not heavy, f"import tensor_mosaic pulled in {heavy[:5]}"
+
+def test_numpy_mosaic_skips_heavy_dependencies():
+    modules = imported_modules(
+        "from tensor_mosaic import Mosaic; m = Mosaic(dim=1, backend='numpy'); m.A = 3; m.bin_tensor()"
+    )
+    assert not [m for m in modules if m.split(".")[0] in HEAVY]
+
+def test_lazy_attributes_resolve():
+    import tensor_mosaic
+    assert "SpaceCache" in dir(tensor_mosaic)
+    assert tensor_mosaic.SpaceCache.__name__ == "SpaceCache"
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+import torch
+
+from tensor_mosaic import Mosaic
+from tensor_mosaic.indices import IndexDescriptor
+
+def test_index_dtype_is_narrowest():
+    m = Mosaic(dim=1, backend="numpy")
+    m.A = 100
+    assert m.indices["A"].dtype == np.int8
+    m.B = 1000
+    assert m.indices["A"].dtype == np.int16
+    assert m.indices["B"].tolist() == list(range(100, 1100))
+
+def test_torch_index_dtype_can_index():
+    m = Mosaic(dim=1, backend="torch")
+    m.A = 10
+    m.B = 5
+    assert m.indices["B"].dtype == torch.int32
+    x = torch.arange(15)
+    assert torch.equal(x[m.indices["B"]], x[m.B])
+
+def test_indices_are_built_lazily():
+    m = Mosaic(dim=1, backend="numpy")
+    m.A = 10
+    m.B = 10
+    assert not m.indices._dense
+    assert set(m.indices) == {"A", "B"}
+    m.indices["A"]
+    assert list(m.indices._dense) == ["A"]
+
+def test_descriptor_for_strided_region():
+    m = Mosaic(dim=1, backend="numpy")
+    m.S = slice(4, 10, 2)
+    desc = m.indices.descriptor("S")
+    assert desc == IndexDescriptor((4,), (3,), (2,))
+    assert desc.numel == 3
+    assert m.indices["S"].tolist() == [4, 6, 8]
+
+def test_descriptor_2d_materializes_grid():
+    desc = IndexDescriptor.from_region((slice(1, 3), slice(0, 2)))
+    m = Mosaic(dim=2, backend="numpy")
+    idx = desc.materialize(m.backend)
+    assert idx.tolist() == [[1, 0], [1, 1], [2, 0], [2, 1]]
+
+def test_cache_disabled_leaves_indices_empty():
+    m = Mosaic(dim=1, backend="numpy", cache=False)
+    m.A = 4
+    assert len(m.indices) == 0
+    with pytest.raises(KeyError):
+        m.indices["A"]
@@ -0,0 +1,49 @@
+import json
+
+from tensor_mosaic import Mosaic, instrument
+from tensor_mosaic.instrument import Collector
+
+def test_disabled_by_default():
+    assert not instrument.ENABLED
+    assert instrument.span("x") is instrument.span("y")
+
+def test_collector_records_compile_pipeline(tmp_path):
+    m = Mosaic(dim=1, backend="numpy", autocompile=False)
+    with Collector() as c:
+        m.A = 4
+        m.B = 6
+        m.compile()
+        m.indices["A"]
+        m.indices["A"]
+        m.bin_tensor()
+    assert not instrument.ENABLED
+    table = c.aggregate()
+    assert table["add"]["count"] == 2
+    assert table["compile"]["count"] == 1
+    assert table["pack"]["count"] == 1
+    assert table["cache_miss"]["count"] == 1
+    assert table["cache_hit"]["count"] == 1
+    assert table["index_build"]["bytes"] == 4      # four int8 positions
+    assert table["alloc"]["bytes"] == 10 * 4       # float32 bin
+    # pack runs inside compile
+    compile_ev = next(e for e in c.events if e.name == "compile")
+    pack_ev = next(e for e in c.events if e.name == "pack")
+    assert compile_ev.ts <= pack_ev.ts and pack_ev.dur <= compile_ev.dur
+    assert "compile" in c.summary()
+
+    path = tmp_path / "trace.json"
+    c.to_chrome_trace(str(path))
+    trace = json.loads(path.read_text())["traceEvents"]
+    phases = {e["name"]: e["ph"] for e in trace}
+    assert phases["compile"] == "X" and phases["add"] == "i"
+
+def test_custom_callback():
+    seen = []
+    cb = instrument.subscribe(seen.append)
+    try:
+        m = Mosaic(dim=1, backend="numpy")
+        m.A = 3
+    finally:
+        instrument.unsubscribe(cb)
+    assert [e.name for e in seen][:1] == ["add"]
+    assert "compile" in [e.name for e in seen]
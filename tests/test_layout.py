@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from tensor_mosaic import Mosaic
+
+def make_mosaic(backend="numpy"):
+    m = Mosaic(dim=1, backend=backend, autocompile=False)
+    m.A = 3
+    m.B = 2
+    m.compile()
+    return m
+
+def test_layout_is_hashable_and_value_equal():
+    a, b = make_mosaic().layout(), make_mosaic().layout()
+    assert a is not b
+    assert a == b and hash(a) == hash(b)
+    assert a.A == (slice(0, 3),) and a["B"] == (slice(3, 5),)
+    with pytest.raises(AttributeError):
+        a.shape = (1,)
+
+def test_layout_changes_with_recompile():
+    m = make_mosaic()
+    before = m.layout()
+    m.C = 4
+    assert m.layout() != before
+    assert m.layout().shape == (9,)
+
+def test_layout_pack_unpack_numpy():
+    lay = make_mosaic().layout()
+    assert lay.tiled
+    x = lay.pack({"A": np.ones(3), "B": np.zeros(2)})
+    assert x.tolist() == [1, 1, 1, 0, 0]
+    parts = lay.bind(x).unpack()
+    assert parts["A"].tolist() == [1, 1, 1]
+    assert lay.bind(x).B.tolist() == [0, 0]
+
+def test_jit_does_not_retrace_for_equal_layouts():
+    jax = pytest.importorskip("jax")
+    import jax.numpy as jnp
+    traces = []
+
+    @jax.jit
+    def step(b):
+        traces.append(1)
+        parts = b.unpack()
+        return b.layout.pack({"A": parts["A"] * 2, "B": parts["B"] + 1})
+
+    for i in range(5):
+        lay = make_mosaic("jax").layout()   # fresh object every step
+        out = step(lay.bind(jnp.full(lay.shape, float(i))))
+    assert len(traces) == 1
+    assert out.tolist() == [8.0, 8.0, 8.0, 5.0, 5.0]
+
+def test_layout_as_static_argument():
+    jax = pytest.importorskip("jax")
+    import jax.numpy as jnp
+    view = jax.jit(lambda lay, x: lay.slice_view(x, "B"), static_argnums=0)
+    lay = make_mosaic("jax").layout()
+    assert view(lay, jnp.arange(5.0)).tolist() == [3.0, 4.0]
+
+def test_layout_partial_pack_under_jit():
+    jax = pytest.importorskip("jax")
+    import jax.numpy as jnp
+    lay = make_mosaic("jax").layout()
+    out = jax.jit(lambda lay, b: lay.pack({"B": b}, fill_value=-1))(lay, jnp.ones(2))
+    assert out.tolist() == [-1.0, -1.0, -1.0, 1.0, 1.0]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import torch
+
+from tensor_mosaic import Mosaic
+
+@pytest.fixture
+def mosaic():
+    m = Mosaic(dim=1, backend="numpy", autocompile=False)
+    m.A = 4
+    m.B = 3
+    m.S = slice(10, 16, 2)
+    m.compile()
+    return m
+
+def test_locate_positions(mosaic):
+    ids, offsets = mosaic.locate(np.arange(16))
+    names = [mosaic.region_names[i] if i >= 0 else None for i in ids]
+    assert names[:7] == ["A"] * 4 + ["B"] * 3
+    assert offsets[:7].tolist() == [0, 1, 2, 3, 0, 1, 2]
+    # hole between B and S, then every other slot of the strided region
+    assert names[7:] == [None, None, None, "S", None, "S", None, "S", None]
+    assert offsets[10:16].tolist() == [0, -1, 1, -1, 2, -1]
+
+def test_locate_out_of_bounds(mosaic):
+    ids, offsets = mosaic.locate([-1, 100])
+    assert ids.tolist() == [-1, -1]
+    assert offsets.tolist() == [-1, -1]
+
+def test_locate_torch_positions():
+    m = Mosaic(dim=1, backend="torch")
+    m.A = 5
+    m.B = 5
+    ids, offsets = m.locate(torch.tensor([[0, 9], [5, 4]]))
+    assert isinstance(ids, torch.Tensor)
+    assert ids.tolist() == [[0, 1], [1, 0]]
+    assert offsets.tolist() == [[0, 4], [0, 4]]
+
+def test_regions_in_range(mosaic):
+    assert mosaic.regions_in_range(3, 5) == ["A", "B"]
+    assert mosaic.regions_in_range(7, 10) == []
+    assert mosaic.regions_in_range(0, 100) == ["A", "B", "S"]
+    assert mosaic.regions_in_range(4, 5) == ["B"]
+
+def test_locate_requires_1d():
+    m = Mosaic(dim=2, backend="numpy")
+    m.add("R", region=((0, 2), (0, 2)))
+    with pytest.raises(NotImplementedError):
+        m.locate([0])
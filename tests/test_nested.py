@@ -0,0 +1,66 @@
+import numpy as np
+from tensor_mosaic import Mosaic
+
+
+def make_model():
+    attn = Mosaic(dim=1, backend="numpy", autocompile=False)
+    attn.q = 4
+    attn.k = 4
+    layer = Mosaic(dim=1, backend="numpy", autocompile=False)
+    layer.norm = 2
+    layer.attn = attn
+    model = Mosaic(dim=1, backend="numpy", autocompile=False)
+    model.embed = 10
+    model.layer3 = layer
+    model.compile()
+    return model, layer, attn
+
+
+def test_dotted_names_resolve_to_absolute_slices():
+    model, layer, attn = make_model()
+    base = model["layer3"][0].start
+    assert model.shape == (10 + 2 + 8,)
+    assert model["layer3"][0].stop - base == layer.shape[0]
+    inner = layer["attn"][0].start
+    q = model["layer3.attn.q"][0]
+    assert (q.start, q.stop) == (base + inner + attn["q"][0].start, base + inner + attn["q"][0].stop)
+    # a subtree is one contiguous slice of the parent
+    sub = model["layer3.attn"][0]
+    assert (sub.start, sub.stop) == (base + inner, base + inner + 8)
+
+
+def test_views_and_indices_through_the_tree():
+    model, _, attn = make_model()
+    x = np.arange(model.shape[0])
+    view = model.slice_view(x, "layer3.attn.k")
+    assert np.array_equal(view, x[model["layer3.attn.k"]])
+    assert np.array_equal(model.indices["layer3.attn.k"], view)
+    assert model.children["layer3"].children["attn"] is attn
+
+
+def test_parent_recompile_reaches_changed_grandchildren():
+    model, layer, attn = make_model()
+    attn.v = 6
+    model.compile()  # layer was not recompiled by hand
+    assert model.shape == (10 + 2 + 14,) and layer.shape == (2 + 14,)
+    assert model["layer3.attn.v"][0].stop - model["layer3.attn.v"][0].start == 6
+    attn.compile()   # compiled, but newer than what layer and model were packed with
+    attn.w = 1
+    attn.compile()
+    model.compile()
+    w = model["layer3.attn.w"][0]
+    assert model.shape == (10 + 2 + 15,) and w.stop - w.start == 1
+
+
+def test_parent_recompile_picks_up_child_growth(tmp_path):
+    model, layer, attn = make_model()
+    attn.v = 6
+    attn.compile()
+    layer.compile()
+    model.compile()
+    assert model.shape == (10 + 2 + 14,)
+    assert model["layer3.attn.v"][0].stop - model["layer3.attn.v"][0].start == 6
+    path = str(tmp_path / "recipe.json")
+    model.save_allocations(path)
+    again = Mosaic.load_allocations(path, dim=1, backend="numpy")
+    assert again["layer3.attn.v"] == model["layer3.attn.v"]
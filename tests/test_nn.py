@@ -0,0 +1,53 @@
+import pytest
+import torch
+
+from tensor_mosaic import Mosaic
+from tensor_mosaic.nn import Pack, Unpack
+
+def make_mosaic():
+    m = Mosaic(dim=1, backend="torch", autocompile=False)
+    m.STATE = 4
+    m.ACTION = 2
+    m.REWARD = 1
+    m.compile()
+    return m
+
+class Model(torch.nn.Module):
+    def __init__(self, mosaic):
+        super().__init__()
+        self.unpack = Unpack(mosaic)
+        self.pack = Pack(mosaic)
+        self.lin = torch.nn.Linear(4, 4)
+
+    def forward(self, x):
+        parts = self.unpack(x)
+        parts["STATE"] = self.lin(parts["STATE"])
+        parts["REWARD"] = parts["REWARD"] * 2
+        return self.pack(parts)
+
+def test_unpack_views_with_batch_dims():
+    m = make_mosaic()
+    x = torch.arange(14.0).reshape(2, 7)
+    parts = Unpack(m)(x)
+    assert parts["ACTION"].tolist() == [[4.0, 5.0], [11.0, 12.0]]
+    assert parts["STATE"].data_ptr() == x.data_ptr()
+
+def test_pack_requires_tiled_layout():
+    m = make_mosaic()
+    m.HOLE = slice(20, 22)
+    with pytest.raises(ValueError):
+        Pack(m)
+
+def test_no_graph_breaks():
+    model = Model(make_mosaic())
+    x = torch.randn(3, 7)
+    explanation = torch._dynamo.explain(model)(x)
+    assert explanation.graph_break_count == 0
+    assert explanation.graph_count == 1
+
+def test_compiles_fullgraph_on_cpu_inductor():
+    torch._dynamo.reset()
+    model = Model(make_mosaic())
+    x = torch.randn(3, 7)
+    compiled = torch.compile(model, fullgraph=True, backend="inductor")
+    torch.testing.assert_close(compiled(x), model(x))
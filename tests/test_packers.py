@@ -0,0 +1,205 @@
+import random
+
+import pytest
+
+from tensor_mosaic import Mosaic
+from tensor_mosaic.packers import (best_of_packer, count_holes, fit_gap_packer, greedy_gap_packer)
+
+STATIC = {"S1": (slice(4, 6),), "S2": (slice(9, 10),), "S3": (slice(15, 20),)}
+
+def assert_disjoint(allocs, static):
+    seen = set()
+    for region in list(allocs.values()) + list(static.values()):
+        cells = set(range(region[0].start, region[0].stop))
+        assert not cells & seen
+        seen |= cells
+
+@pytest.mark.parametrize("fit", ["first", "best", "worst"])
+def test_fit_gap_packer_no_overlap(fit):
+    reqs = {"a": (3,), "b": (2,), "c": (4,), "d": (1,)}
+    allocs, shape = fit_gap_packer(reqs, STATIC, fit=fit)
+    assert list(allocs) == list(reqs)
+    assert_disjoint(allocs, STATIC)
+    assert shape[0] >= 20
+
+def test_fit_choice():
+    reqs = {"a": (3,)}
+    # gaps: [0,4) size 4, [6,9) size 3, [10,15) size 5
+    assert fit_gap_packer(reqs, STATIC, fit="first")[0]["a"] == (slice(0, 3),)
+    assert fit_gap_packer(reqs, STATIC, fit="best")[0]["a"] == (slice(6, 9),)
+    assert fit_gap_packer(reqs, STATIC, fit="worst")[0]["a"] == (slice(10, 13),)
+
+def test_first_fit_matches_greedy_gap_packer():
+    rng = random.Random(1)
+    reqs = {f"r{i}": (rng.randint(1, 6),) for i in range(30)}
+    assert fit_gap_packer(reqs, STATIC) == greedy_gap_packer(reqs, STATIC)
+
+def test_count_holes():
+    assert count_holes({}, STATIC) == 3
+    assert count_holes({"a": (slice(0, 4),)}, STATIC) == 2
+
+@pytest.mark.parametrize("n", [10, 200])
+def test_best_of_never_worse_than_insertion_order(n):
+    rng = random.Random(n)
+    static = {f"s{i}": (slice(i * 50, i * 50 + 7),) for i in range(1, n // 10 + 1)}
+    reqs = {f"r{i}": (rng.randint(1, 40),) for i in range(n)}
+    allocs, shape = best_of_packer(reqs, static, time_budget=20.0, restarts=2)
+    assert set(allocs) == set(reqs)
+    assert_disjoint(allocs, static)
+    assert shape[0] <= greedy_gap_packer(reqs, static)[1][0]
+
+def test_best_of_respects_zero_budget():
+    reqs = {"a": (3,), "b": (5,)}
+    allocs, shape = best_of_packer(reqs, STATIC, time_budget=0.0)
+    assert_disjoint(allocs, STATIC)
+
+def test_best_of_registered_strategy():
+    m = Mosaic(dim=1, backend="numpy", strategy="best_of")
+    m.S = slice(2, 4)
+    m.A = 2
+    m.B = 3
+    assert m.A == (slice(0, 2),)
+    assert m.shape == (7,)
+
+def test_best_of_autocompile_stays_in_process(monkeypatch):
+    import multiprocessing
+    monkeypatch.setattr(multiprocessing, "get_context", None)  # any pool would fail
+    m = Mosaic(dim=1, backend="numpy", strategy="best_of")
+    for i in range(80):
+        m.add(f"r{i}", shape=i % 7 + 1)
+    assert m.shape == (sum(i % 7 + 1 for i in range(80)),)
+
+def test_best_of_terminates_workers_past_budget():
+    import multiprocessing
+    rng = random.Random(0)
+    reqs = {f"r{i}": (rng.randint(1, 40),) for i in range(500)}
+    static = {f"s{i}": (slice(i * 500, i * 500 + 7),) for i in range(1, 40)}
+    best_of_packer(reqs, static, time_budget=0.0)
+    assert multiprocessing.active_children() == []
+
+def test_recompile_does_not_treat_packed_regions_as_static():
+    m = Mosaic(dim=1, backend="numpy", strategy="gap")
+    m.A = 3
+    m.B = 3
+    m.compile()
+    assert m.shape == (6,)
+
+def brute_force_bin(reqs, static):
+    # try every assignment of requests to gaps or the tail
+    import itertools
+    end, gaps = 0, []
+    for start, stop in sorted((s[0].start, s[0].stop) for s in static.values()):
+        if start > end:
+            gaps.append(start - end)
+        end = max(end, stop)
+    sizes = [v[0] for v in reqs.values()]
+    best = end + sum(sizes)
+    for assign in itertools.product(range(-1, len(gaps)), repeat=len(sizes)):
+        used = [0] * len(gaps)
+        for size, g in zip(sizes, assign):
+            if g >= 0:
+                used[g] += size
+        if all(u <= c for u, c in zip(used, gaps)):
+            best = min(best, end + sum(s for s, g in zip(sizes, assign) if g < 0))
+    return best
+
+@pytest.mark.parametrize("seed", range(5))
+def test_branch_and_bound_is_optimal(seed):
+    from tensor_mosaic.packers import branch_and_bound_packer
+    rng = random.Random(seed)
+    static, pos = {}, 0
+    for i in range(3):
+        pos += rng.randint(2, 9)
+        static[f"s{i}"] = (slice(pos, pos + 2),)
+        pos += 2
+    reqs = {f"r{i}": (rng.randint(1, 6),) for i in range(6)}
+    allocs, shape, stats = branch_and_bound_packer(reqs, static, return_stats=True)
+    assert_disjoint(allocs, static)
+    assert stats["optimal"] and stats["gap"] == 0.0
+    assert shape[0] == brute_force_bin(reqs, static)
+    assert shape[0] <= greedy_gap_packer(reqs, static)[1][0]
+
+def test_branch_and_bound_beats_first_fit():
+    from tensor_mosaic.packers import branch_and_bound_packer
+    static = {"s": (slice(10, 11),)}
+    reqs = {"a": (3,), "b": (4,), "c": (6,)}
+    # first fit puts a and b in the gap and c after it; b + c fill the gap exactly
+    assert greedy_gap_packer(reqs, static)[1] == (17,)
+    allocs, shape = branch_and_bound_packer(reqs, static)
+    assert shape == (14,)
+    assert allocs["a"] == (slice(11, 14),)
+
+def test_branch_and_bound_limit_reports_gap():
+    from tensor_mosaic.packers import branch_and_bound_packer
+    rng = random.Random(3)
+    static = {f"s{i}": (slice(i * 37, i * 37 + 1),) for i in range(1, 12)}
+    reqs = {f"r{i}": (rng.randint(5, 17),) for i in range(40)}
+    allocs, shape, stats = branch_and_bound_packer(reqs, static, node_limit=50, return_stats=True)
+    assert_disjoint(allocs, static)
+    assert stats["nodes"] <= 51
+    assert stats["lower_bound"] <= shape[0]
+    assert 0.0 <= stats["gap"] < 1.0
+
+def test_branch_and_bound_deep_search_does_not_recurse():
+    from tensor_mosaic.packers import branch_and_bound_packer
+    rng = random.Random(0)
+    static = {f"s{i}": (slice(i * 1000, i * 1000 + 5),) for i in range(1, 41)}
+    reqs = {f"r{i}": (rng.randint(20, 400),) for i in range(2000)}  # deeper than the recursion limit
+    allocs, shape, stats = branch_and_bound_packer(reqs, static, node_limit=5000, return_stats=True)
+    assert_disjoint(allocs, static)
+    assert not stats["optimal"] and stats["lower_bound"] <= shape[0]
+
+def test_branch_and_bound_without_static():
+    from tensor_mosaic.packers import branch_and_bound_packer
+    allocs, shape = branch_and_bound_packer({"a": (2,), "b": (3,)}, {})
+    assert shape == (5,)
+    m = Mosaic(dim=1, backend="numpy", strategy="exact")
+    m.S = slice(3, 4)
+    m.A = 3
+    assert m.A == (slice(0, 3),)
+
+# ---- Array-native packers ----
+
+def test_array_gap_packer_matches_dict_packer():
+    import numpy as np
+    from tensor_mosaic.packers import array_gap_packer
+    for seed in range(20):
+        rng = random.Random(seed)
+        starts = sorted(rng.sample(range(0, 400, 6), 8))
+        static = {f"s{i}": (slice(a, a + rng.randint(1, 5)),) for i, a in enumerate(starts)}
+        reqs = {f"r{i}": (rng.randint(1, 30),) for i in range(40)}
+        allocs, shape = greedy_gap_packer(reqs, static)
+        starts, size = array_gap_packer(np.array([v[0] for v in reqs.values()]),
+                                        np.array([v[0].start for v in static.values()]),
+                                        np.array([v[0].stop for v in static.values()]))
+        assert starts.tolist() == [v[0].start for v in allocs.values()]
+        assert size == shape[0]
+
+def test_array_greedy_packer_is_prefix_sum():
+    import numpy as np
+    from tensor_mosaic.packers import array_greedy_packer
+    starts, size = array_greedy_packer(np.array([3, 4, 2]), np.array([]), np.array([]))
+    assert starts.tolist() == [0, 3, 7]
+    assert size == 9
+
+def test_columnar_layout_in_mosaic():
+    import numpy as np
+    from tensor_mosaic.slicemanager import SliceColumns
+    m = Mosaic(dim=1, backend="numpy", strategy="gap_array", autocompile=False)
+    m.S = slice(2, 4)
+    m.add_many([f"r{i}" for i in range(1000)], np.full(1000, 2))
+    m.compile()
+    assert isinstance(m.bin_manager.slices, SliceColumns)
+    assert m.r0 == (slice(0, 2),)
+    assert m.r1 == (slice(4, 6),)
+    assert m.S == (slice(2, 4),)
+    assert m.shape == (2002,)
+    assert len(m.slices) == 1001
+    ids, offsets = m.locate([3, 5])
+    assert [m.region_names[i] for i in ids] == ["S", "r1"]
+    assert m.indices["r1"].tolist() == [4, 5]
+    # switching back to a dict packer restores plain slices
+    m.strategy = "gap"
+    m.compile()
+    assert isinstance(m.bin_manager.slices, dict)
+    assert m.r1 == (slice(4, 6),)
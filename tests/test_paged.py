@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+import torch
+from tensor_mosaic import Mosaic
+from tensor_mosaic.paged import PagedBin
+
+
+def make_sparse(backend="numpy"):
+    m = Mosaic(dim=1, backend=backend, autocompile=False, strategy="gap")
+    m.add("small", shape=10)
+    m.add("BIG", region=(10**9, 10**9 + 100))
+    m.add("edge", region=(5000, 9000))
+    m.compile()
+    return m
+
+
+def test_paged_bin_scales_with_occupied_pages():
+    m = make_sparse()
+    x = m.paged_bin(page_size=1024)
+    assert x.num_pages == 1 + 5 + 1  # [0, 1024), pages 4..8 and the page holding BIG
+    assert x.nbytes <= 8 * 7 * 1024
+    x["BIG"] = np.arange(100)
+    view = m.slice_view(x, "BIG")
+    assert np.array_equal(view, np.arange(100))
+    view[0] = -1  # a view into page storage, not a copy
+    assert x["BIG"][0] == -1
+
+
+def test_paged_pack_unpack_and_densify():
+    m = make_sparse("torch")
+    x = m.paged_bin(page_size=256, fill_value=None, dtype=torch.float64)
+    x.pack({"small": torch.ones(10), "BIG": torch.full((100,), 2.0), "edge": torch.arange(4000.0)})
+    parts = x.unpack()
+    assert torch.equal(parts["edge"], torch.arange(4000.0, dtype=torch.float64))
+    layout, data = x.densify()
+    assert data.shape == (x.num_pages * 256,)
+    assert torch.equal(layout.slice_view(data, "BIG"), parts["BIG"])
+
+
+def test_paged_bin_strided_and_unallocated_regions():
+    x = PagedBin({"s": (slice(3000, 3100, 3),)}, (4000,), page_size=64)
+    x["s"] = np.arange(34)
+    assert np.array_equal(x["s"], np.arange(34))
+    with pytest.raises(KeyError):
+        x[(slice(0, 10),)]
+
+
+def test_paged_bin_resolves_aliases_and_child_paths():
+    child = Mosaic(dim=1, backend="numpy", autocompile=False)
+    child.q = 4
+    child.k = 4
+    m = Mosaic(dim=1, backend="numpy", autocompile=False, strategy="gap")
+    m.add("w", shape=6)
+    m.add("far", region=(10**8, 10**8 + 8))
+    m.attn = child
+    m.alias("wt", "w", shape=(2, 3), perm=(1, 0))
+    m.compile()
+    x = m.paged_bin(page_size=64)
+    x["wt"] = np.arange(6).reshape(3, 2)
+    assert x.slice_view("wt").shape == (3, 2)
+    assert np.array_equal(x.slice_view("wt"), np.arange(6).reshape(3, 2))
+    assert np.array_equal(x["w"], np.arange(6).reshape(3, 2).T.reshape(-1))
+    x["attn.k"] = np.full(4, 7)
+    parts = x.unpack()
+    assert {"wt", "attn.q", "attn.k"} <= set(parts)
+    assert np.array_equal(parts["attn.k"], np.full(4, 7))
+    layout, data = x.densify()
+    assert np.array_equal(layout.slice_view(data, "wt"), parts["wt"])
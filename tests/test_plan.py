@@ -0,0 +1,42 @@
+import time
+import numpy as np
+import pytest
+import torch
+from tensor_mosaic import Mosaic
+from tensor_mosaic.instrument import Collector
+
+
+@pytest.mark.parametrize("backend,dtype", [("numpy", None), ("numpy", "float64"), ("torch", torch.int16)])
+def test_plan_matches_real_allocations(backend, dtype):
+    m = Mosaic(dim=1, backend=backend, autocompile=False, strategy="gap")
+    m.add("S", region=(100, 140))
+    for i, n in enumerate([7, 30, 64, 1]):
+        m.add(f"r{i}", shape=n)
+    with Collector() as c:
+        plan = m.plan(dtype=dtype)
+    assert not [e for e in c.events if e.name in ("alloc", "index_build")]
+    assert plan.shape == m.shape
+    assert plan.region_bytes["S"] == 40 * plan.itemsize
+    x = m.bin_tensor(dtype=np.dtype(dtype) if backend == "numpy" and dtype else dtype)
+    assert plan.bin_bytes == x.nbytes
+    built = sum(m.indices[k].nbytes for k in m.bin_manager.slices)
+    assert plan.index_bytes == built
+
+
+def test_plan_for_other_backend_and_2d():
+    m = Mosaic(dim=2, backend="numpy", autocompile=False)
+    m.add("A", region=((0, 4), (0, 5)))
+    m.add("B", region=((4, 6), (0, 5)))
+    plan = m.plan(backend="torch", dtype="bfloat16")
+    assert plan.bin_bytes == 6 * 5 * 2
+    assert plan.index_dtype == "int32" and plan.index_bytes == (20 + 10) * 2 * 4
+
+
+def test_plan_is_fast_for_large_layouts():
+    n = 100_000
+    m = Mosaic(dim=1, backend="torch", autocompile=False, strategy="gap_array")
+    m.add_many([f"r{i}" for i in range(n)], np.full(n, 5))
+    t0 = time.perf_counter()
+    plan = m.plan()
+    assert time.perf_counter() - t0 < 2.0
+    assert plan.requested_bytes == n * 5 * 4 and plan.as_dict()["regions"] == n
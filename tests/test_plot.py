@@ -0,0 +1,28 @@
+import os
+import numpy as np
+from tensor_mosaic import Mosaic
+from tensor_mosaic.plot import plot_slices
+
+
+def test_plot_to_file_headless(tmp_path):
+    slices = {"A": (slice(0, 4), slice(0, 4)), "B": (slice(6, 10), slice(2, 8))}
+    path = os.path.join(tmp_path, "layout.png")
+    fig = plot_slices(slices, bin_shape=(10, 10), path=path)
+    assert os.path.getsize(path) > 0
+    assert [t.get_text() for t in fig.axes[0].texts] == ["A", "B"]
+
+
+def test_plot_mosaic_and_stats_culls_labels(tmp_path):
+    m = Mosaic(dim=1, backend="numpy", strategy="greedy_array", autocompile=False)
+    m.add_many([f"r{i}" for i in range(500)], np.r_[[400], np.ones(499, dtype=int)])
+    fig = plot_slices(m, path=os.path.join(tmp_path, "m.svg"), max_labels=10)
+    assert [t.get_text() for t in fig.axes[0].texts] == ["r0"]
+    fig = plot_slices(m.stats(), path=os.path.join(tmp_path, "s.png"))
+    assert "utilization" in fig.axes[0].get_title()
+
+
+def test_plot_rasterizes_large_layouts(tmp_path):
+    m = Mosaic(dim=1, backend="numpy", strategy="greedy_array", autocompile=False)
+    m.add_many([f"r{i}" for i in range(5000)], np.full(5000, 3))
+    fig = plot_slices(m, path=os.path.join(tmp_path, "big.png"), raster_threshold=1000, pixels=512)
+    assert len(fig.axes[0].images) == 1 and not fig.axes[0].collections
@@ -0,0 +1,58 @@
+import numpy as np
+import torch
+from tensor_mosaic import Mosaic
+from tensor_mosaic.packers import make_stable_packer
+from tensor_mosaic.relayout import RelayoutPlan
+
+
+def old_new():
+    old = {"a": (slice(0, 4),), "b": (slice(4, 8),), "c": (slice(8, 10),), "gone": (slice(10, 12),)}
+    # a and b move together, c grows, d is new
+    new = {"d": (slice(0, 3),), "a": (slice(3, 7),), "b": (slice(7, 11),), "c": (slice(11, 15),)}
+    return (old, (12,)), (new, (15,))
+
+
+def test_plan_merges_adjacent_moves_and_fills():
+    old, new = old_new()
+    plan = RelayoutPlan(old, new)
+    assert plan.copies == [(0, 3, 10)]  # a, b and c's kept part are one block
+    assert plan.added == ["d"] and plan.removed == ["gone"] and plan.resized == {"c": (2, 4)}
+    x = np.arange(12, dtype=np.float32)
+    y = plan.apply(x, fill_value=-1)
+    assert y.tolist() == [-1, -1, -1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, -1, -1]
+
+
+def test_apply_into_memmap_streams_in_chunks(tmp_path):
+    old, new = old_new()
+    plan = Mosaic.relayout_plan(old, new)
+    out = np.memmap(tmp_path / "new.bin", dtype=np.int64, mode="w+", shape=(15,))
+    out[:] = 99
+    plan.apply(np.arange(12), out=out, chunk=3)
+    assert out.tolist() == [0, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 0]
+
+
+def test_mosaic_stable_compile_minimizes_movement():
+    m = Mosaic(dim=1, backend="torch", autocompile=False, strategy="gap")
+    for name, size in [("a", 4), ("b", 6), ("c", 3)]:
+        m.add(name, shape=size)
+    m.compile()
+    before = {k: m[k] for k in "abc"}
+    x = m.bin_tensor()
+    x[m["b"]] = torch.arange(6.0)
+    m.add("b", shape=5)
+    m.add("z", shape=2)
+    assert m.bin_manager.displaced == {"b": before["b"]}
+    m.compile(stable=True)
+    assert m.bin_manager.displaced == {}
+    assert m["a"] == before["a"] and m["c"] == before["c"]
+    assert m["b"][0].start == before["b"][0].start
+    plan = Mosaic.relayout_plan(((before), (13,)), m)
+    assert plan.moved_elements == 0
+    y = plan.apply(x)
+    assert torch.equal(m.slice_view(y, "b"), torch.arange(5.0))
+
+
+def test_stable_packer_moves_regions_that_now_collide():
+    packer = make_stable_packer({"a": (slice(0, 4),)})
+    allocs, shape = packer({"a": (4,)}, {"S": (slice(2, 3),)})
+    assert allocs["a"][0].start >= 3 and shape[0] == allocs["a"][0].stop
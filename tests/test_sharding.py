@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from tensor_mosaic import Mosaic
+
+@pytest.fixture
+def mosaic():
+    m = Mosaic(dim=1, backend="numpy", autocompile=False)
+    m.A = 40
+    m.B = 10
+    m.C = 25
+    m.D = 25
+    m.compile()
+    return m
+
+def test_split_shards_are_exact(mosaic):
+    shards, imbalance = mosaic.shard(4)
+    assert [s.load for s in shards] == [25, 25, 25, 25]
+    assert imbalance == 0.0
+    # shards tile the bin contiguously
+    assert shards[0].start == 0 and shards[-1].stop == mosaic.shape[0]
+    for a, b in zip(shards, shards[1:]):
+        assert a.stop == b.start
+    # A is split across the first two ranks
+    assert shards[0].global_slices["A"] == (slice(0, 25),)
+    assert shards[1].global_slices["A"] == (slice(25, 40),)
+    assert shards[1].slices["A"] == (slice(0, 15),)
+
+def test_split_shards_round_trip_data(mosaic):
+    x = np.arange(mosaic.shape[0])
+    shards, _ = mosaic.shard(3)
+    for shard in shards:
+        local = x[shard.region]
+        for name, (g,) in shard.global_slices.items():
+            assert np.array_equal(local[shard.slices[name]], x[g])
+
+def test_whole_shards_keep_regions_intact(mosaic):
+    shards, imbalance = mosaic.shard(2, split=False)
+    owners = {}
+    for s in shards:
+        for name in s.slices:
+            assert name not in owners
+            owners[name] = s.rank
+            assert s.global_slices[name] == mosaic[name]
+    assert set(owners) == {"A", "B", "C", "D"}
+    assert [s.load for s in shards] == [50, 50]
+    assert imbalance == 0.0
+
+def test_byte_weighted_shards(mosaic):
+    shards, _ = mosaic.shard(2, itemsize={"A": 4, "B": 4, "C": 2, "D": 2})
+    # total bytes 300 -> cut inside A at 150 / 4 elements
+    assert shards[0].stop == 38
+    assert shards[0].load == 152
+
+def test_more_shards_than_regions():
+    m = Mosaic(dim=1, backend="numpy")
+    m.A = 3
+    shards, _ = m.shard(2, split=False)
+    assert sum(len(s.slices) for s in shards) == 1
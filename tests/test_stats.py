@@ -0,0 +1,67 @@
+import time
+import numpy as np
+from tensor_mosaic import Mosaic
+from tensor_mosaic.stats import layout_stats
+
+
+def test_stats_1d_holes():
+    m = Mosaic(dim=1, backend="numpy", autocompile=False, strategy="gap_array")
+    m.add("S1", region=(2, 5))
+    m.add("S2", region=(10, 12))
+    m.add_many(["a", "b"], [2, 3])
+    m.compile()
+    st = m.stats()
+    assert st.requested == 3 + 2 + 5
+    assert st.bin_size == m.shape[0]
+    assert st.wasted == st.bin_size - st.requested
+    assert st.holes == len(st.hole_sizes) and st.hole_sizes.sum() == st.wasted
+    assert st.largest_free == st.hole_sizes.max()
+    assert 0.0 <= st.fragmentation < 1.0
+
+
+def test_stats_1d_matches_python_sweep():
+    rng = np.random.default_rng(0)
+    starts = np.sort(rng.choice(1000, 50, replace=False))
+    slices = {f"r{i}": (slice(int(s), int(s + w)),) for i, (s, w) in enumerate(zip(starts, rng.integers(1, 30, 50)))}
+    st = layout_stats(slices, (1100,))
+    free = np.ones(1100, dtype=bool)
+    for (s,) in slices.values():
+        free[s] = False
+    runs = np.diff(np.flatnonzero(np.diff(np.concatenate([[0], free.astype(int), [0]]))))[::2]
+    assert st.wasted == free.sum()
+    assert list(st.hole_sizes) == list(runs)
+
+
+def test_stats_2d_wasted_area():
+    slices = {"A": (slice(0, 4), slice(0, 4)), "B": (slice(2, 6), slice(2, 6)), "C": (slice(8, 10), slice(0, 1))}
+    st = layout_stats(slices, (10, 10))
+    assert st.requested == 16 + 16 + 2
+    assert st.wasted == 100 - (16 + 16 - 4 + 2)
+    assert st.hole_sizes is None and "holes" not in st.as_dict()
+
+
+def test_stats_empty():
+    st = layout_stats({}, (0,))
+    assert st.utilization == 1.0 and st.holes == 0
+
+
+def test_stats_nd_matches_painted_grid():
+    rng = np.random.default_rng(1)
+    for shape in ((17, 23), (9, 7, 11)):
+        lo = rng.integers(-2, max(shape), (40, len(shape)))
+        hi = lo + rng.integers(0, 8, lo.shape)
+        slices = {f"r{i}": tuple(slice(int(a), int(b)) for a, b in zip(l, h)) for i, (l, h) in enumerate(zip(lo, hi))}
+        painted = np.zeros(shape, dtype=bool)
+        for r in slices.values():
+            painted[tuple(slice(max(s.start, 0), max(s.stop, 0)) for s in r)] = True
+        assert layout_stats(slices, shape).occupied == painted.sum()
+
+
+def test_stats_2d_is_cheap_for_sparse_regions():
+    # a diagonal of 1x1 regions: the bin is huge, the sweep only touches region edges
+    n = 20_000
+    slices = {f"r{i}": (slice(i, i + 1), slice(i, i + 1)) for i in range(n)}
+    t0 = time.perf_counter()
+    st = layout_stats(slices, (n, n))
+    assert time.perf_counter() - t0 < 2.0
+    assert st.wasted == n * n - n
@@ -0,0 +1,76 @@
+import time
+import numpy as np
+import pytest
+from tensor_mosaic import Mosaic
+from tensor_mosaic.packers import greedy_packer, array_greedy_packer
+from tensor_mosaic.validate import OverlapError, check_layout, find_overlaps, out_of_bounds
+
+
+def test_find_overlaps_reports_every_pair():
+    slices = {"a": (slice(0, 10),), "b": (slice(5, 7),), "c": (slice(6, 12),), "d": (slice(12, 14),),
+              "empty": (slice(3, 3),)}
+    assert sorted(find_overlaps(slices)) == [("a", "b"), ("a", "c"), ("b", "c")]
+
+
+def test_strided_and_2d_overlaps():
+    even = {"even": (slice(0, 10, 2),), "odd": (slice(1, 10, 2),)}
+    assert find_overlaps(even) == []
+    assert find_overlaps({**even, "x": (slice(4, 5),)}) == [("even", "x")]
+    boxes = {"A": (slice(0, 4), slice(0, 4)), "B": (slice(2, 6), slice(5, 8)), "C": (slice(3, 5), slice(3, 6))}
+    assert sorted(find_overlaps(boxes)) == [("A", "C"), ("B", "C")]
+
+
+def test_bounds_and_error_message():
+    slices = {"neg": (slice(-1, 2),), "far": (slice(5, 20),), "ok": (slice(2, 5),)}
+    assert out_of_bounds(slices, (10,)) == ["neg", "far"]
+    with pytest.raises(OverlapError) as err:
+        check_layout({"a": (slice(0, 4),), "b": (slice(2, 3),)}, (4,))
+    assert err.value.conflicts == [("a", "b")] and "a/b" in str(err.value)
+
+
+def test_mosaic_compile_rejects_overlapping_explicit_regions():
+    m = Mosaic(dim=1, backend="numpy", autocompile=False)
+    m.add("A", region=(0, 10))
+    m.add("B", region=(5, 15))
+    with pytest.raises(OverlapError, match="alias"):
+        m.compile()
+    assert not m.bin_manager._compiled
+    m.validate = False
+    m.compile()
+
+
+@pytest.mark.parametrize("strategy", ["greedy", "greedy_array"])
+def test_greedy_packers_step_over_static(strategy):
+    m = Mosaic(dim=1, backend="numpy", autocompile=False, strategy=strategy)
+    m.add("S", region=(2, 5))
+    m.add("a", shape=3)
+    m.add("b", shape=2)
+    m.compile()
+    # a does not fit before S, so both go after it (greedy never backfills)
+    assert m["a"] == (slice(5, 8),) and m["b"] == (slice(8, 10),)
+    assert m.shape == (10,)
+    assert greedy_packer({"x": (2,)}) == ({"x": (slice(0, 2),)}, (2,))
+    starts, size = array_greedy_packer(np.array([2, 2]), np.array([1]), np.array([2]))
+    assert starts.tolist() == [2, 4] and size == 6
+
+
+def test_validation_is_cheap_for_1e5_regions():
+    n = 100_000
+    m = Mosaic(dim=1, backend="numpy", autocompile=False, strategy="greedy_array", cache=False)
+    m.add_many([f"r{i}" for i in range(n)], np.full(n, 3))
+    m.compile()
+    t0 = time.perf_counter()
+    check_layout(m.bin_manager.slices, m.shape)
+    assert time.perf_counter() - t0 < 0.5
+
+
+def test_2d_validation_is_cheap_for_1e5_regions():
+    band = {f"t{i}": (slice(0, 4), slice(4 * i, 4 * i + 4)) for i in range(40_000)}  # one row of tiles
+    grid = {f"g{i}_{j}": (slice(3 * i, 3 * i + 3), slice(3 * j, 3 * j + 3)) for i in range(316) for j in range(316)}
+    for slices in (band, grid):
+        t0 = time.perf_counter()
+        check_layout(slices)
+        assert time.perf_counter() - t0 < 1.0
+    grid["bad"] = (slice(4, 5), slice(500, 502))
+    assert sorted(find_overlaps(grid)) == [("g1_166", "bad"), ("g1_167", "bad")]
+